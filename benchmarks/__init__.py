@@ -0,0 +1,4 @@
+"""
+DeFAI Oracle Benchmarks
+Run a benchmark with: python -m benchmarks.<name>
+"""
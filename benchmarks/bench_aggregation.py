@@ -0,0 +1,109 @@
+"""
+Aggregation Benchmark
+Compares the per-token aggregation that used to run inside
+SentimentPipeline.analyze_token (one pass per statistic) against the
+fused aggregate_posts pass
+
+Usage:
+    python -m benchmarks.bench_aggregation [--posts 100 10000] [--repeat 200]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from src.backend.sentiment_analyzer import SentimentResult
+from src.backend.sentiment_pipeline import aggregate_posts
+from src.backend.twitter_scraper_v2 import ScrapedTweet
+
+
+LABELS = ["bullish", "neutral", "bearish"]
+
+
+def build_posts(posts: int, seed: int = 7):
+    """Synthetic inference results and engagement for one token"""
+    rng = random.Random(seed)
+    sentiments = []
+    tweets = []
+    for i in range(posts):
+        label = rng.choice(LABELS)
+        sentiments.append(SentimentResult(label, rng.random(), {}, "moderate", 1.0))
+        tweets.append(ScrapedTweet(
+            text=f"post {i}",
+            author="bench",
+            created_at=datetime.now(),
+            likes=rng.randint(0, 500),
+            retweets=rng.randint(0, 100),
+            replies=rng.randint(0, 50),
+        ))
+    return sentiments, tweets
+
+
+def multi_pass(sentiments: List[SentimentResult], tweets: List[ScrapedTweet]) -> Dict[str, Any]:
+    """Baseline: the previous analyze_token aggregation, one pass per statistic"""
+    engagement_metrics = {"likes": [], "retweets": [], "replies": []}
+    for tweet in tweets:
+        engagement_metrics["likes"].append(tweet.likes)
+        engagement_metrics["retweets"].append(tweet.retweets)
+        engagement_metrics["replies"].append(tweet.replies)
+    
+    bullish_count = sum(1 for s in sentiments if s.sentiment == "bullish")
+    neutral_count = sum(1 for s in sentiments if s.sentiment == "neutral")
+    bearish_count = sum(1 for s in sentiments if s.sentiment == "bearish")
+    
+    sentiment_scores = []
+    for s in sentiments:
+        if s.sentiment == "bullish":
+            score = 67 + (s.confidence * 33)
+        elif s.sentiment == "bearish":
+            score = s.confidence * 33
+        else:
+            score = 34 + (s.confidence * 33)
+        sentiment_scores.append(score)
+    
+    return {
+        "sentiment_score": sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 50.0,
+        "confidence": sum(s.confidence for s in sentiments) / len(sentiments) if sentiments else 0.0,
+        "bullish_count": bullish_count,
+        "neutral_count": neutral_count,
+        "bearish_count": bearish_count,
+        "avg_likes": sum(engagement_metrics["likes"]) / len(tweets) if tweets else 0,
+        "avg_retweets": sum(engagement_metrics["retweets"]) / len(tweets) if tweets else 0,
+        "avg_replies": sum(engagement_metrics["replies"]) / len(tweets) if tweets else 0,
+    }
+
+
+def time_per_call(fn: Callable, sentiments, tweets, repeat: int) -> float:
+    """Best-of-three mean seconds per call"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(sentiments, tweets)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    
+    for posts in args.posts:
+        sentiments, tweets = build_posts(posts)
+        repeat = max(1, args.repeat * 100 // posts)
+        
+        baseline = time_per_call(multi_pass, sentiments, tweets, repeat)
+        fused = time_per_call(aggregate_posts, sentiments, tweets, repeat)
+        
+        print(
+            f"{posts:>6} posts  multi-pass {baseline * 1e6:10.1f} us  "
+            f"fused {fused * 1e6:10.1f} us  speedup {baseline / fused:4.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+HTML Parsing Benchmark
+Compares the previous BeautifulSoup("html.parser") scraping path against
+TweetPageParser (lxml with precompiled XPath when installed) on the saved
+search pages in tests/fixtures
+
+Usage:
+    python -m benchmarks.bench_html_parsing [--repeat 20]
+"""
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, List
+
+from bs4 import BeautifulSoup
+
+from src.backend.tweet_parser import TweetPageParser, parse_count
+
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def soup_nitter(html: str) -> List[dict]:
+    """Baseline: pure-Python parse and sequential find_all strategies"""
+    soup = BeautifulSoup(html, "html.parser")
+    
+    tweet_elements = soup.find_all("div", {"class": "tweet"})
+    if not tweet_elements:
+        tweet_elements = soup.find_all("div", {"class": "timeline-item"})
+    if not tweet_elements:
+        tweet_elements = soup.find_all("article")
+    if not tweet_elements:
+        tweet_elements = soup.find_all("div", {"data-tweet-id": True})
+    
+    tweets = []
+    for element in tweet_elements:
+        link = element.find("a", {"class": "tweet-link"})
+        text_elem = element.find("div", {"class": "tweet-content"})
+        author_elem = element.find("a", {"class": "username"})
+        stats = element.find_all("span", {"class": "tweet-stat"})
+        tweets.append({
+            "tweet_id": link.get("href", "").split("/")[-1] if link else "",
+            "text": text_elem.get_text() if text_elem else "",
+            "author": author_elem.get_text() if author_elem else "",
+            "stats": [parse_count(stat.get_text().split()[0]) for stat in stats if stat.get_text().split()],
+        })
+    return tweets
+
+
+def soup_x(html: str) -> List[dict]:
+    """Baseline: pure-Python parse of an X.com page"""
+    soup = BeautifulSoup(html, "html.parser")
+    
+    tweets = []
+    for element in soup.find_all("article", {"data-testid": "tweet"}):
+        text_elem = element.find("div", {"data-testid": "tweetText"})
+        author_elem = element.find("a", {"data-testid": "User-Name"})
+        tweets.append({
+            "tweet_id": element.get("data-tweet-id"),
+            "text": text_elem.get_text() if text_elem else "",
+            "author": author_elem.get_text() if author_elem else "",
+            "metrics": [
+                parse_count(metric.get_text())
+                for key in ("like", "retweet", "reply")
+                for metric in element.find_all("div", {"data-testid": f"{key}-count"})
+            ],
+        })
+    return tweets
+
+
+def time_per_page(fn: Callable, html: str, repeat: int) -> float:
+    """Best-of-three mean seconds per page"""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(html)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    
+    page_parser = TweetPageParser()
+    print(f"TweetPageParser backend: {page_parser.backend}")
+    
+    cases = [
+        ("nitter_search.html", soup_nitter, page_parser.parse_nitter),
+        ("x_search.html", soup_x, page_parser.parse_x),
+    ]
+    for name, baseline_fn, parser_fn in cases:
+        html = (FIXTURES / name).read_text()
+        
+        baseline = time_per_page(baseline_fn, html, args.repeat)
+        fast = time_per_page(parser_fn, html, args.repeat)
+        
+        print(
+            f"{name:<20} {len(parser_fn(html)):>3} tweets  "
+            f"html.parser {baseline * 1e3:8.2f} ms  "
+            f"{page_parser.backend} {fast * 1e3:8.2f} ms  speedup {baseline / fast:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Tokenization Benchmark
+Compares arrival-order batching at max_length=512 against length-bucketed
+batching at the tweet-sized settings.sentiment_max_length
+
+Usage:
+    python -m benchmarks.bench_tokenization [--posts 5000] [--with-model]
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+
+from transformers import AutoTokenizer
+
+from src.backend.config import settings
+from src.backend.sentiment_analyzer import SentimentAnalyzer, bucket_by_length
+
+
+TOKENS = ["DOGE", "SHIB", "PEPE", "WIF", "BONK", "BRETT", "TOSHI", "DEGEN"]
+
+TEMPLATES = [
+    "{token} 🚀",
+    "gm {token} fam",
+    "Just bought more ${token}. This is going to moon 🌙",
+    "Bearish on {token}. Too much hype, no substance 📉",
+    "{token} is consolidating. Waiting for breakout 📊 #{token} #Base",
+    "Not sure about {token}. Need to do more research before aping in, "
+    "the chart looks heavy and the dev wallet moved tokens yesterday 🤔",
+    "Thread 🧵 on why ${token} is the most undervalued memecoin on Base: "
+    "1) liquidity is locked 2) the community keeps growing 3) volume is up "
+    "400% this week 4) no VC unlocks 5) the meme is strong. NFA, DYOR. "
+    "#{token} #memecoins #Base #crypto",
+]
+
+
+def build_corpus(posts: int, seed: int = 7) -> List[str]:
+    """Synthetic tweet corpus with a realistic mix of short and long posts"""
+    rng = random.Random(seed)
+    weights = [20, 15, 20, 15, 12, 10, 8]
+    return [
+        rng.choices(TEMPLATES, weights)[0].format(token=rng.choice(TOKENS))
+        for _ in range(posts)
+    ]
+
+
+def arrival_order(lengths: List[int], batch_size: int) -> List[List[int]]:
+    """Baseline: batches in the order posts arrived"""
+    return [
+        list(range(start, min(start + batch_size, len(lengths))))
+        for start in range(0, len(lengths), batch_size)
+    ]
+
+
+def run_strategy(
+    tokenizer,
+    corpus: List[str],
+    max_length: int,
+    batch_size: int,
+    batcher: Callable[[List[int], int], List[List[int]]],
+    model=None,
+) -> Dict[str, float]:
+    """Tokenize, batch and pad the corpus, optionally running the model"""
+    start = time.perf_counter()
+    
+    encodings = tokenizer(corpus, truncation=True, max_length=max_length)
+    lengths = [len(ids) for ids in encodings["input_ids"]]
+    
+    real = 0
+    padded = 0
+    for batch in batcher(lengths, batch_size):
+        inputs = tokenizer.pad(
+            {
+                "input_ids": [encodings["input_ids"][i] for i in batch],
+                "attention_mask": [encodings["attention_mask"][i] for i in batch],
+            },
+            return_tensors="pt",
+        )
+        width = max(lengths[i] for i in batch)
+        real += sum(lengths[i] for i in batch)
+        padded += width * len(batch) - sum(lengths[i] for i in batch)
+        
+        if model is not None:
+            model._predict_probabilities(inputs)
+    
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": elapsed,
+        "real_tokens": real,
+        "padded_tokens": padded,
+        "padding_waste": padded / (real + padded) if real + padded else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=settings.batch_size)
+    parser.add_argument("--with-model", action="store_true", help="Include model forward passes")
+    args = parser.parse_args()
+    
+    corpus = build_corpus(args.posts)
+    tokenizer = AutoTokenizer.from_pretrained(settings.sentiment_model_name)
+    model = SentimentAnalyzer(batch_size=args.batch_size) if args.with_model else None
+    
+    strategies = [
+        ("arrival order, max_length=512", 512, arrival_order),
+        (f"length bucketed, max_length={settings.sentiment_max_length}",
+         settings.sentiment_max_length, bucket_by_length),
+    ]
+    
+    print(f"{args.posts} posts, batch size {args.batch_size}, model: {bool(model)}")
+    for name, max_length, batcher in strategies:
+        stats = run_strategy(tokenizer, corpus, max_length, args.batch_size, batcher, model)
+        print(
+            f"{name:<40} {stats['seconds'] * 1000:9.1f} ms  "
+            f"real={stats['real_tokens']:<8} padded={stats['padded_tokens']:<8} "
+            f"waste={stats['padding_waste']:.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
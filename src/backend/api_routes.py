@@ -3,14 +3,21 @@ FastAPI Routes for DeFAI Oracle
 Exposes sentiment analysis endpoints
 """
 
+import asyncio
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 from loguru import logger
 
 from src.backend.sentiment_pipeline import SentimentPipeline, TokenSentiment
 from src.backend.sniper_bot import SniperBot
 from src.backend.config import settings
+from src.backend.sentiment_analyzer import is_model_ready
+from src.backend.snapshot_refresher import SnapshotRefresher
+from src.backend.single_flight import SingleFlight
+from src.backend.monitoring import get_metrics_collector
+from src.backend.cache import SentimentCache, get_sentiment_cache
+from src.backend.http_client import get_http_client
 
 
 # Create router
@@ -20,10 +27,11 @@ router = APIRouter(prefix="/api/v1", tags=["sentiment"])
 sentiment_pipeline: Optional[SentimentPipeline] = None
 sniper_bot: Optional[SniperBot] = None
 
-# Cache for sentiment results
-sentiment_cache: Dict[str, Any] = {}
-cache_timestamp: Optional[datetime] = None
-CACHE_TTL_SECONDS = 5  # Update cache every 5 seconds
+# Background all-token sentiment snapshots
+snapshot_refresher: Optional[SnapshotRefresher] = None
+
+# Coalesces per-token analyses across concurrent requests
+token_flight = SingleFlight()
 
 # Cache for sniper signals
 sniper_cache: List[Dict[str, Any]] = []
@@ -35,7 +43,7 @@ SNIPER_CACHE_TTL_SECONDS = 60  # Update sniper signals every 60 seconds
 # Initialization
 # ============================================
 
-async def initialize_pipeline(token_manager=None):
+async def initialize_pipeline(token_manager=None, cache_manager=None):
     """Initialize sentiment pipeline"""
     global sentiment_pipeline
     
@@ -48,7 +56,8 @@ async def initialize_pipeline(token_manager=None):
             tokens = settings.token_list
             logger.info(f"Using static tokens from config: {tokens}")
         
-        sentiment_pipeline = SentimentPipeline(tokens)
+        sentiment_pipeline = SentimentPipeline(tokens, cache_manager=cache_manager)
+        await sentiment_pipeline.restore_history()
         logger.info(f"Initialized sentiment pipeline for {len(tokens)} tokens")
     elif token_manager:
         # Update tokens if pipeline already exists
@@ -58,17 +67,115 @@ async def initialize_pipeline(token_manager=None):
             logger.info(f"Updated sentiment pipeline with new tokens from TokenManager")
 
 
+async def analyze_all_snapshot() -> Dict[str, TokenSentiment]:
+    """Full scan behind each snapshot, joining per-token analyses already in flight"""
+    await initialize_pipeline()
+    return await sentiment_pipeline.analyze_all_tokens(analyze=analyze_token_shared)
+
+
+async def analyze_token_shared(token: str) -> TokenSentiment:
+    """analyze_token for one token, shared with concurrent and recent requests for it"""
+    return await token_flight.do(token, lambda: sentiment_pipeline.analyze_token(token))
+
+
+def _retrieve_exception(task: asyncio.Task):
+    """Fan-out tasks may finish after their request gave up on them"""
+    if not task.cancelled():
+        task.exception()
+
+
+async def gather_token_sentiments(tokens: List[str], budget_seconds: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Sentiment for several tokens within one request budget
+    
+    Tokens with a recent snapshot entry are served from it; the rest are
+    analysed concurrently, at most `source_max_concurrency` at a time.
+    Analyses still running at the deadline fall back to an older snapshot
+    entry or are reported as pending, and keep running so a later request
+    finds their result fresh. Only tracked tokens are accepted.
+    """
+    budget = budget_seconds or settings.fanout_budget_seconds
+    requested = list(dict.fromkeys(token.upper() for token in tokens))
+    untracked = [token for token in requested if token not in sentiment_pipeline.token_list]
+    if untracked:
+        raise HTTPException(status_code=400, detail=f"Untracked tokens: {', '.join(untracked)}")
+    
+    snapshot = get_snapshot_refresher().snapshot
+    snapshot_age = snapshot.age_seconds() if snapshot else None
+    
+    results: Dict[str, Dict[str, Any]] = {}
+    freshness: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+    tasks: Dict[asyncio.Task, str] = {}
+    slots = asyncio.Semaphore(settings.source_max_concurrency)
+    
+    async def analyze(token: str) -> TokenSentiment:
+        async with slots:
+            return await analyze_token_shared(token)
+    
+    for token in requested:
+        if snapshot and token in snapshot.data and snapshot_age <= settings.fanout_snapshot_max_age_seconds:
+            results[token] = snapshot.data[token]
+            freshness[token] = {"source": "snapshot", "age_seconds": round(snapshot_age, 1)}
+        else:
+            task = asyncio.create_task(analyze(token))
+            task.add_done_callback(_retrieve_exception)
+            tasks[task] = token
+    
+    pending = []
+    if tasks:
+        done, _ = await asyncio.wait(tasks, timeout=budget)
+        now = datetime.now()
+        for task, token in tasks.items():
+            if task in done and task.exception() is None:
+                sentiment = task.result()
+                results[token] = sentiment.to_dict()
+                freshness[token] = {
+                    "source": "live",
+                    "age_seconds": round(max((now - sentiment.timestamp).total_seconds(), 0.0), 1),
+                }
+                continue
+            
+            if task in done:
+                errors[token] = str(task.exception())
+            else:
+                pending.append(token)
+            
+            if snapshot and token in snapshot.data:
+                results[token] = snapshot.data[token]
+                freshness[token] = {"source": "stale_snapshot", "age_seconds": round(snapshot_age, 1)}
+            else:
+                freshness[token] = {"source": "pending" if task not in done else "error", "age_seconds": None}
+    
+    return {
+        "data": {token: results[token] for token in requested if token in results},
+        "freshness": freshness,
+        "pending": pending,
+        "errors": errors,
+        "partial": bool(pending or errors),
+    }
+
+
+def get_snapshot_refresher() -> SnapshotRefresher:
+    """Get the snapshot refresher (started with the app lifespan)"""
+    global snapshot_refresher
+    if snapshot_refresher is None:
+        snapshot_refresher = SnapshotRefresher(analyze_all_snapshot)
+    return snapshot_refresher
+
+
 # ============================================
 # Sentiment Endpoints
 # ============================================
 
 @router.get("/health")
-async def health_check() -> Dict[str, str]:
+async def health_check() -> Dict[str, Any]:
     """Health check endpoint"""
     return {
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "service": "DeFAI Oracle API",
+        "model_ready": is_model_ready(),
     }
 
 
@@ -87,7 +194,7 @@ async def get_token_sentiment(token: str) -> Dict[str, Any]:
     
     try:
         # Analyze token
-        sentiment = await sentiment_pipeline.analyze_token(token.upper())
+        sentiment = await analyze_token_shared(token.upper())
         
         return {
             "success": True,
@@ -103,53 +210,29 @@ async def get_token_sentiment(token: str) -> Dict[str, Any]:
 async def get_all_sentiments() -> Dict[str, Any]:
     """
     Get current sentiment for all tokens
-    Uses cached results for fast response
+    Serves the latest background snapshot; never starts a scan of its own
     
     Returns:
-        Sentiment data for all configured tokens
+        Sentiment data for all configured tokens, with the snapshot's age
     """
-    global sentiment_cache, cache_timestamp
-    
     await initialize_pipeline()
     
     try:
-        # Check if cache is still valid
+        # Only waits before the first snapshot, joining the scan in flight
+        snapshot = await get_snapshot_refresher().latest()
         now = datetime.now()
-        if cache_timestamp and (now - cache_timestamp).total_seconds() < CACHE_TTL_SECONDS:
-            # Return cached results
-            return {
-                "success": True,
-                "timestamp": now.isoformat(),
-                "data": sentiment_cache,
-            }
-        
-        # Update cache in background (don't wait for it)
-        # Return empty cache first, then update
-        if not sentiment_cache:
-            # First request - analyze all tokens
-            results = await sentiment_pipeline.analyze_all_tokens()
-            sentiment_cache = {token: sentiment.to_dict() for token, sentiment in results.items()}
-            cache_timestamp = now
-        else:
-            # Schedule background update
-            import asyncio
-            asyncio.create_task(sentiment_pipeline.analyze_all_tokens())
         
         return {
             "success": True,
             "timestamp": now.isoformat(),
-            "data": sentiment_cache,
+            "snapshot_at": snapshot.created_at.isoformat(),
+            "age_seconds": round(snapshot.age_seconds(now), 1),
+            "generation": snapshot.generation,
+            "data": dict(snapshot.data),
         }
     
     except Exception as e:
         logger.error(f"Error getting all sentiments: {e}")
-        # Return cached data even if analysis fails
-        if sentiment_cache:
-            return {
-                "success": True,
-                "timestamp": datetime.now().isoformat(),
-                "data": sentiment_cache,
-            }
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -178,15 +261,11 @@ async def get_sentiment_history(
         
         history = sentiment_pipeline.sentiment_history[token]
         
-        # Filter by time range
-        cutoff = datetime.now() - timedelta(hours=hours)
-        filtered_history = [s for s in history.history if s.timestamp > cutoff]
-        
         return {
             "success": True,
             "token": token,
             "hours": hours,
-            "data": [s.to_dict() for s in filtered_history],
+            "data": history.get_records(hours),
         }
     
     except HTTPException:
@@ -261,31 +340,34 @@ async def get_sentiment_summary() -> Dict[str, Any]:
 
 
 @router.post("/analyze")
-async def analyze_tokens(tokens: List[str]) -> Dict[str, Any]:
+async def analyze_tokens(
+    tokens: List[str],
+    budget_seconds: Optional[float] = Query(None, gt=0, le=60),
+) -> Dict[str, Any]:
     """
     Analyze sentiment for specified tokens
     
     Args:
         tokens: List of token symbols
+        budget_seconds: Deadline for the whole request
     
     Returns:
-        Sentiment analysis for requested tokens
+        Sentiment analysis for requested tokens with per-token freshness;
+        partial when some tokens missed the deadline
     """
     await initialize_pipeline()
     
     try:
-        results = {}
-        
-        for token in tokens:
-            sentiment = await sentiment_pipeline.analyze_token(token.upper())
-            results[token.upper()] = sentiment.to_dict()
+        fanned = await gather_token_sentiments(tokens, budget_seconds)
         
         return {
             "success": True,
             "timestamp": datetime.now().isoformat(),
-            "data": results,
+            **fanned,
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error analyzing tokens: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -296,24 +378,28 @@ async def analyze_tokens(tokens: List[str]) -> Dict[str, Any]:
 # ============================================
 
 @router.get("/compare")
-async def compare_tokens(tokens: List[str] = Query(...)) -> Dict[str, Any]:
+async def compare_tokens(
+    tokens: List[str] = Query(...),
+    budget_seconds: Optional[float] = Query(None, gt=0, le=60),
+) -> Dict[str, Any]:
     """
     Compare sentiment across multiple tokens
     
     Args:
         tokens: List of token symbols to compare
+        budget_seconds: Deadline for the whole request
     
     Returns:
-        Comparison of sentiment across tokens
+        Comparison of sentiment across the tokens that were available in time
     """
     await initialize_pipeline()
     
     try:
-        # Analyze all tokens
-        results = {}
-        for token in tokens:
-            sentiment = await sentiment_pipeline.analyze_token(token.upper())
-            results[token.upper()] = sentiment.to_dict()
+        # Analyze all tokens concurrently
+        fanned = await gather_token_sentiments(tokens, budget_seconds)
+        results = fanned["data"]
+        if not results:
+            raise HTTPException(status_code=504, detail="No token sentiment available within the request budget")
         
         # Find best and worst
         scores = {token: data["sentiment_score"] for token, data in results.items()}
@@ -332,8 +418,14 @@ async def compare_tokens(tokens: List[str] = Query(...)) -> Dict[str, Any]:
                 "token": worst_token,
                 "score": scores[worst_token],
             },
+            "freshness": fanned["freshness"],
+            "pending": fanned["pending"],
+            "errors": fanned["errors"],
+            "partial": fanned["partial"],
         }
     
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error comparing tokens: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -357,7 +449,7 @@ async def export_sentiment_history(filepath: str = "sentiment_history.json") ->
     await initialize_pipeline()
     
     try:
-        sentiment_pipeline.export_history(filepath)
+        await sentiment_pipeline.export_history(filepath)
         
         return {
             "success": True,
@@ -395,15 +487,75 @@ async def get_pipeline_stats() -> Dict[str, Any]:
         len(history.history)
         for history in sentiment_pipeline.sentiment_history.values()
     )
+    history_bytes = sum(
+        history.history.get_stats()["bytes"]
+        for history in sentiment_pipeline.sentiment_history.values()
+    )
+    metrics = get_metrics_collector()
+    sentiment_cache = await get_sentiment_cache()
     
     return {
         "success": True,
         "tokens": len(sentiment_pipeline.token_list),
         "total_samples": total_samples,
+        "history_bytes": history_bytes,
+        "snapshots": get_snapshot_refresher().get_stats(),
+        "single_flight": token_flight.get_stats(),
+        "inference": sentiment_pipeline.inference.get_stats(),
+        "counters": metrics.get_counters() if metrics else {},
+        "http": get_http_client().get_stats(),
+        "cache": await sentiment_cache.get_cache_stats() if sentiment_cache else {},
         "timestamp": datetime.now().isoformat(),
     }
 
 
+# ============================================
+# Cache Endpoints
+# ============================================
+
+async def require_sentiment_cache() -> SentimentCache:
+    """The process-wide sentiment cache, or 503 when Redis is not set up"""
+    sentiment_cache = await get_sentiment_cache()
+    if sentiment_cache is None:
+        raise HTTPException(status_code=503, detail="Cache not initialized")
+    return sentiment_cache
+
+
+@router.get("/cache/stats")
+async def get_cache_stats() -> Dict[str, Any]:
+    """Get cache statistics"""
+    sentiment_cache = await require_sentiment_cache()
+    
+    return {
+        "success": True,
+        "data": await sentiment_cache.get_cache_stats(),
+    }
+
+
+@router.post("/cache/invalidate/{token}")
+async def invalidate_token_cache(token: str) -> Dict[str, Any]:
+    """Invalidate cache for a token"""
+    sentiment_cache = await require_sentiment_cache()
+    await sentiment_cache.invalidate_token(token.upper())
+    
+    return {
+        "success": True,
+        "message": f"Cache invalidated for {token.upper()}",
+    }
+
+
+@router.post("/cache/clear")
+async def clear_all_cache() -> Dict[str, Any]:
+    """Clear all sentiment cache"""
+    sentiment_cache = await require_sentiment_cache()
+    await sentiment_cache.invalidate_all()
+    
+    return {
+        "success": True,
+        "message": "All cache cleared",
+    }
+
+
 # ============================================
 # Sniper Bot Endpoints
 # ============================================
@@ -518,14 +670,17 @@ async def get_top_sniper_signals(limit: int = Query(10, ge=1, le=50)) -> Dict[st
 # Startup/Shutdown
 # ============================================
 
-async def startup(token_manager=None):
+async def startup(token_manager=None, cache_manager=None):
     """Startup event"""
     logger.info("Starting DeFAI Oracle API...")
-    await initialize_pipeline(token_manager)
+    await initialize_pipeline(token_manager, cache_manager)
+    get_snapshot_refresher().start()
 
 
 async def shutdown():
     """Shutdown event"""
     logger.info("Shutting down DeFAI Oracle API...")
+    if snapshot_refresher:
+        await snapshot_refresher.stop()
     if sentiment_pipeline:
         await sentiment_pipeline.close()
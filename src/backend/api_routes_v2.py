@@ -13,6 +13,7 @@ from src.backend.websocket_handler import SentimentStreamManager
 from src.backend.cache import SentimentCache
 from src.backend.rate_limit import RateLimiter, APIKeyManager
 from src.backend.monitoring import HealthChecker, PerformanceMonitor, AlertSystem, MetricsCollector
+from src.backend.http_client import get_http_client
 
 
 # Create router
@@ -130,6 +131,9 @@ async def get_metrics(request: Request) -> Dict[str, Any]:
         "endpoints": performance_monitor.get_all_stats(),
         "system": health_checker.get_system_health(),
         "cache": await sentiment_cache.get_cache_stats() if sentiment_cache else {},
+        "counters": metrics_collector.get_counters(),
+        "inference": sentiment_pipeline.inference.get_stats() if sentiment_pipeline else {},
+        "http": get_http_client().get_stats(),
     }
     
     duration_ms = (time.time() - start_time) * 1000
@@ -5,20 +5,143 @@ Uses Redis for high-performance caching
 
 import json
 import asyncio
-from typing import Any, Optional, Dict
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+from typing import Any, Optional, Dict, List, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 import redis.asyncio as redis
 
+from src.backend.config import settings
+
+
+class TTLCache:
+    """Bounded in-process LRU cache with per-entry expiry"""
+    
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        # Stats
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get value, or None if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return None
+            
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Set value, evicting the least recently used entries when full"""
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.ttl_seconds)
+        
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+    
+    def __contains__(self, key: str) -> bool:
+        """Whether a live entry exists; not counted as a hit or miss"""
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[0] >= time.monotonic()
+    
+    def delete(self, key: str):
+        """Remove a key if present"""
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def delete_matching(self, pattern: str) -> int:
+        """Remove keys matching a glob-style pattern; returns how many"""
+        with self._lock:
+            keys = [key for key in self._data if fnmatchcase(key, pattern)]
+            for key in keys:
+                del self._data[key]
+        return len(keys)
+    
+    def clear(self):
+        """Remove all entries"""
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
 
 class CacheManager:
-    """Manages caching with Redis"""
+    """
+    Manages caching with Redis behind an in-process L1
     
-    def __init__(self, redis_url: str = "redis://localhost:6379"):
+    Reads check a small TTLCache before Redis, so hot keys skip the round
+    trip and json.loads. L1 is filled on reads only; values returned from it
+    are shared, so treat them as read-only. Writes and deletes drop the local
+    copy and are announced on a pub/sub channel so other workers drop theirs;
+    the short L1 TTL bounds staleness if a message is missed.
+    """
+    
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        l1_max_size: Optional[int] = None,
+        l1_ttl_seconds: Optional[float] = None,
+    ):
         self.redis_url = redis_url
         self.redis_client: Optional[redis.Redis] = None
         self.logger = logger.bind(component="CacheManager")
         self.default_ttl = 300  # 5 minutes
+        
+        # L1
+        self.l1 = TTLCache(
+            max_size=l1_max_size or settings.cache_l1_max_size,
+            ttl_seconds=l1_ttl_seconds if l1_ttl_seconds is not None else settings.cache_l1_ttl_seconds,
+        )
+        self.channel = settings.cache_invalidation_channel
+        self.scan_batch = settings.cache_scan_batch
+        self.origin = uuid.uuid4().hex  # Skips our own invalidation messages
+        self._listener: Optional[asyncio.Task] = None
+        
+        # L2 stats: lookups that missed L1, and bulk reads that bypass it
+        self.l2_hits = 0
+        self.l2_misses = 0
+        self.bulk_hits = 0
+        self.bulk_misses = 0
+        self.invalidations_received = 0
     
     async def connect(self):
         """Connect to Redis"""
@@ -29,75 +152,301 @@ class CacheManager:
         except Exception as e:
             self.logger.error(f"Failed to connect to Redis: {e}")
             self.redis_client = None
+            return
+        
+        pubsub = self.redis_client.pubsub()
+        await pubsub.subscribe(self.channel)
+        self._listener = asyncio.create_task(self._listen(pubsub))
     
     async def disconnect(self):
         """Disconnect from Redis"""
+        if self._listener:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+        
         if self.redis_client:
             await self.redis_client.close()
             self.logger.info("Disconnected from Redis")
+        self.l1.clear()
+    
+    # ============================================
+    # L1 Invalidation
+    # ============================================
+    
+    async def _listen(self, pubsub):
+        """Apply other workers' invalidations to our L1"""
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    self._apply_invalidation(json.loads(message["data"]))
+                except Exception as e:
+                    self.logger.debug(f"Bad invalidation message: {e}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Without invalidations L1 could serve stale values for up to its TTL
+            self.logger.error(f"Cache invalidation listener stopped: {e}; clearing L1")
+            self.l1.clear()
+        finally:
+            await pubsub.aclose()
+    
+    def _apply_invalidation(self, message: Dict[str, Any]):
+        if message.get("origin") == self.origin:
+            return
+        self.invalidations_received += 1
+        for key in message.get("keys", []):
+            self.l1.delete(key)
+        for pattern in message.get("patterns", []):
+            self.l1.delete_matching(pattern)
+    
+    async def _publish_invalidation(self, keys: Optional[List[str]] = None, patterns: Optional[List[str]] = None):
+        """Tell other workers to drop these keys from their L1"""
+        try:
+            await self.redis_client.publish(
+                self.channel,
+                json.dumps({"origin": self.origin, "keys": keys or [], "patterns": patterns or []}),
+            )
+        except Exception as e:
+            self.logger.error(f"Error publishing cache invalidation: {e}")
+    
+    # ============================================
+    # Operations
+    # ============================================
     
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
         if not self.redis_client:
             return None
         
+        value = self.l1.get(key)
+        if value is not None:
+            return value
+        
         try:
             value = await self.redis_client.get(key)
             
             if value:
                 self.logger.debug(f"Cache hit: {key}")
-                return json.loads(value)
+                self.l2_hits += 1
+                value = json.loads(value)
+                self.l1.set(key, value)
+                return value
             else:
                 self.logger.debug(f"Cache miss: {key}")
+                self.l2_misses += 1
                 return None
         
         except Exception as e:
             self.logger.error(f"Error getting from cache: {e}")
             return None
     
-    async def set(self, key: str, value: Any, ttl: Optional[int] = None):
-        """Set value in cache"""
+    def _tag(self, pipe, keys: List[str], tags: List[str]):
+        """Queue adding keys to their tag sets"""
+        for tag in tags:
+            tag_key = f"tag:{tag}"
+            pipe.sadd(tag_key, *keys)
+            pipe.expire(tag_key, settings.cache_tag_ttl_seconds)
+    
+    async def set(self, key: str, value: Any, ttl: Optional[int] = None, tags: Optional[List[str]] = None):
+        """Set value in cache, indexed under `tags` for invalidate_tags"""
         if not self.redis_client:
             return
         
         try:
             ttl = ttl or self.default_ttl
-            await self.redis_client.setex(
-                key,
-                ttl,
-                json.dumps(value)
-            )
+            if tags:
+                async with self.redis_client.pipeline(transaction=False) as pipe:
+                    pipe.setex(key, ttl, json.dumps(value))
+                    self._tag(pipe, [key], tags)
+                    await pipe.execute()
+            else:
+                await self.redis_client.setex(
+                    key,
+                    ttl,
+                    json.dumps(value)
+                )
+            self.l1.delete(key)
+            await self._publish_invalidation(keys=[key])
             self.logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
         
         except Exception as e:
             self.logger.error(f"Error setting cache: {e}")
     
+    async def get_many(self, keys: List[str], populate_l1: bool = True) -> List[Optional[Any]]:
+        """
+        Get several values in one round trip
+        
+        With populate_l1=False the read goes straight to Redis and leaves L1
+        alone, for bulk reads of values the caller caches itself (such as
+        the inference memo) that would otherwise evict hot keys.
+        """
+        if not self.redis_client or not keys:
+            return [None] * len(keys)
+        
+        results = [self.l1.get(key) if populate_l1 else None for key in keys]
+        missing = [i for i, value in enumerate(results) if value is None]
+        if not missing:
+            return results
+        
+        try:
+            values = await self.redis_client.mget([keys[i] for i in missing])
+        except Exception as e:
+            self.logger.error(f"Error getting many from cache: {e}")
+            return results
+        
+        hits = 0
+        for i, value in zip(missing, values):
+            if value:
+                hits += 1
+                results[i] = json.loads(value)
+                if populate_l1:
+                    self.l1.set(keys[i], results[i])
+        
+        if populate_l1:
+            self.l2_hits += hits
+            self.l2_misses += len(missing) - hits
+        else:
+            self.bulk_hits += hits
+            self.bulk_misses += len(missing) - hits
+        return results
+    
+    async def set_many(self, items: Dict[str, Any], ttl: Optional[int] = None, tags: Optional[List[str]] = None):
+        """Set several values in one round trip"""
+        if not self.redis_client or not items:
+            return
+        
+        try:
+            ttl = ttl or self.default_ttl
+            async with self.redis_client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.setex(key, ttl, json.dumps(value))
+                if tags:
+                    self._tag(pipe, list(items), tags)
+                await pipe.execute()
+            for key in items:
+                self.l1.delete(key)
+            await self._publish_invalidation(keys=list(items))
+            self.logger.debug(f"Cache set {len(items)} keys (TTL: {ttl}s)")
+        
+        except Exception as e:
+            self.logger.error(f"Error setting many in cache: {e}")
+    
     async def delete(self, key: str):
         """Delete value from cache"""
         if not self.redis_client:
             return
         
+        self.l1.delete(key)
         try:
             await self.redis_client.delete(key)
+            await self._publish_invalidation(keys=[key])
             self.logger.debug(f"Cache deleted: {key}")
         
         except Exception as e:
             self.logger.error(f"Error deleting from cache: {e}")
     
+    async def _unlink_batches(self, keys) -> List[str]:
+        """UNLINK keys from an async iterator a batch at a time; returns them"""
+        deleted: List[str] = []
+        batch: List[str] = []
+        async for key in keys:
+            batch.append(key)
+            if len(batch) >= self.scan_batch:
+                await self.redis_client.unlink(*batch)
+                deleted.extend(batch)
+                batch = []
+        if batch:
+            await self.redis_client.unlink(*batch)
+            deleted.extend(batch)
+        return deleted
+    
+    async def invalidate_tags(self, tags: List[str]) -> int:
+        """
+        Delete every key indexed under any of `tags`
+        
+        Cost is proportional to the tagged keys, walked with SSCAN and freed
+        with UNLINK in batches, so Redis is never blocked for the keyspace.
+        Each tag set is first RENAMEd to a private key, so keys tagged while
+        the scan runs land in a fresh set instead of being dropped with it.
+        
+        Entries written before keys were tagged have no tag set; they are
+        not found here and expire through their TTL.
+        """
+        if not self.redis_client:
+            return 0
+        
+        deleted: List[str] = []
+        try:
+            for tag in tags:
+                claimed = f"tag:{tag}:invalidating:{uuid.uuid4().hex}"
+                try:
+                    await self.redis_client.rename(f"tag:{tag}", claimed)
+                except redis.ResponseError:
+                    continue  # Nothing tagged
+                
+                deleted.extend(await self._unlink_batches(
+                    self.redis_client.sscan_iter(claimed, count=self.scan_batch)
+                ))
+                await self.redis_client.unlink(claimed)
+        
+        except Exception as e:
+            self.logger.error(f"Error invalidating cache tags {tags}: {e}")
+        
+        for key in deleted:
+            self.l1.delete(key)
+        if deleted:
+            await self._publish_invalidation(keys=deleted)
+        self.logger.info(f"Invalidated {len(deleted)} cache entries tagged {tags}")
+        return len(deleted)
+    
     async def clear_pattern(self, pattern: str):
-        """Clear all keys matching pattern"""
+        """Clear all keys matching pattern (incrementally with SCAN; prefer invalidate_tags)"""
         if not self.redis_client:
             return
         
+        self.l1.delete_matching(pattern)
         try:
-            keys = await self.redis_client.keys(pattern)
-            if keys:
-                await self.redis_client.delete(*keys)
-                self.logger.info(f"Cleared {len(keys)} cache entries matching {pattern}")
+            deleted = await self._unlink_batches(
+                self.redis_client.scan_iter(match=pattern, count=self.scan_batch)
+            )
+            if deleted:
+                self.logger.info(f"Cleared {len(deleted)} cache entries matching {pattern}")
+            await self._publish_invalidation(patterns=[pattern])
         
         except Exception as e:
             self.logger.error(f"Error clearing cache pattern: {e}")
     
+    def get_tier_stats(self) -> Dict[str, Any]:
+        """
+        L1, L2 and bulk-read hit ratios
+        
+        L2 counts only lookups that missed L1, so the overall ratio is hits
+        over lookups made through L1 or as bulk reads that bypass it.
+        """
+        l1 = self.l1.get_stats()
+        l2_lookups = self.l2_hits + self.l2_misses
+        bulk_lookups = self.bulk_hits + self.bulk_misses
+        lookups = l1["hits"] + l1["misses"] + bulk_lookups
+        hits = l1["hits"] + self.l2_hits + self.bulk_hits
+        return {
+            "l1": l1,
+            "l2": {
+                "hits": self.l2_hits,
+                "misses": self.l2_misses,
+                "hit_ratio": self.l2_hits / l2_lookups if l2_lookups else 0.0,
+            },
+            "bulk": {
+                "hits": self.bulk_hits,
+                "misses": self.bulk_misses,
+                "hit_ratio": self.bulk_hits / bulk_lookups if bulk_lookups else 0.0,
+            },
+            "overall_hit_ratio": hits / lookups if lookups else 0.0,
+            "invalidations_received": self.invalidations_received,
+        }
+    
     async def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
         if not self.redis_client:
@@ -110,15 +459,21 @@ class CacheManager:
                 "used_memory": info.get("used_memory_human"),
                 "connected_clients": info.get("connected_clients"),
                 "total_commands": info.get("total_commands_processed"),
+                **self.get_tier_stats(),
             }
         
         except Exception as e:
             self.logger.error(f"Error getting cache stats: {e}")
-            return {"status": "error", "error": str(e)}
+            return {"status": "error", "error": str(e), **self.get_tier_stats()}
 
 
 class SentimentCache:
-    """Specialized cache for sentiment data"""
+    """
+    Specialized cache for sentiment data
+    
+    Keys are tagged per token ("token:PEPE") and per kind ("sentiment",
+    "history") so invalidation deletes exactly the tagged keys.
+    """
     
     def __init__(self, cache_manager: CacheManager):
         self.cache = cache_manager
@@ -132,7 +487,7 @@ class SentimentCache:
     async def set_token_sentiment(self, token: str, sentiment: Dict[str, Any], ttl: int = 300):
         """Cache sentiment for token"""
         key = f"sentiment:{token.upper()}"
-        await self.cache.set(key, sentiment, ttl)
+        await self.cache.set(key, sentiment, ttl, tags=[f"token:{token.upper()}", "sentiment"])
     
     async def get_all_sentiments(self) -> Optional[Dict[str, Any]]:
         """Get cached sentiments for all tokens"""
@@ -142,7 +497,7 @@ class SentimentCache:
     async def set_all_sentiments(self, sentiments: Dict[str, Any], ttl: int = 300):
         """Cache sentiments for all tokens"""
         key = "sentiment:all"
-        await self.cache.set(key, sentiments, ttl)
+        await self.cache.set(key, sentiments, ttl, tags=["sentiment"])
     
     async def get_token_history(self, token: str, hours: int = 24) -> Optional[list]:
         """Get cached history for token"""
@@ -152,18 +507,16 @@ class SentimentCache:
     async def set_token_history(self, token: str, history: list, hours: int = 24, ttl: int = 3600):
         """Cache history for token"""
         key = f"history:{token.upper()}:{hours}h"
-        await self.cache.set(key, history, ttl)
+        await self.cache.set(key, history, ttl, tags=[f"token:{token.upper()}", "history"])
     
     async def invalidate_token(self, token: str):
         """Invalidate all cache for a token"""
-        await self.cache.delete(f"sentiment:{token.upper()}")
-        await self.cache.clear_pattern(f"history:{token.upper()}:*")
+        await self.cache.invalidate_tags([f"token:{token.upper()}"])
         self.logger.info(f"Invalidated cache for {token}")
     
     async def invalidate_all(self):
         """Invalidate all sentiment cache"""
-        await self.cache.clear_pattern("sentiment:*")
-        await self.cache.clear_pattern("history:*")
+        await self.cache.invalidate_tags(["sentiment", "history"])
         self.logger.info("Invalidated all sentiment cache")
     
     async def get_cache_stats(self) -> Dict[str, Any]:
@@ -46,6 +46,11 @@ class Settings(BaseSettings):
     # ============================================
     redis_url: str = "redis://localhost:6379"
     redis_db: int = 0
+    cache_l1_max_size: int = 2000  # In-process entries in front of Redis
+    cache_l1_ttl_seconds: float = 5.0  # Upper bound on L1 staleness
+    cache_invalidation_channel: str = "defai:cache:invalidate"
+    cache_tag_ttl_seconds: int = 86400  # Tag sets outlive every key they index
+    cache_scan_batch: int = 500  # Keys per SCAN/SSCAN step and UNLINK call
     
     # ============================================
     # Blockchain
@@ -63,7 +68,13 @@ class Settings(BaseSettings):
     sentiment_model_name: str = "distilbert-base-uncased"
     sentiment_model_path: str = "./data/sentiment_model"
     device: str = "cpu"
+    sentiment_backend: str = "torch"  # "torch", "quantized" or "onnx"
     batch_size: int = 32
+    sentiment_max_length: int = 96  # Wordpieces; tweets rarely exceed 64-96
+    inference_workers: int = 1
+    inference_max_pending: int = 16
+    sentiment_memo_size: int = 10000
+    sentiment_memo_ttl_seconds: int = 3600
     
     # ============================================
     # Data Pipeline
@@ -73,6 +84,34 @@ class Settings(BaseSettings):
     kafka_topic_tiktoks: str = "raw-tiktoks"
     kafka_topic_sentiment: str = "processed-sentiment"
     update_frequency_minutes: int = 5
+    source_max_concurrency: int = 8
+    scrape_requests_per_second: float = 10.0
+    scrape_burst: int = 20
+    scrape_max_retries: int = 2  # Retries of a single request after a 429
+    scrape_retry_after_seconds: float = 15.0  # When the 429 has no Retry-After
+    dedup_similarity_threshold: float = 0.8  # Estimated Jaccard for near-duplicates
+    dedup_window_seconds: int = 3600
+    dedup_num_perm: int = 64
+    dedup_bands: int = 16
+    dedup_max_entries: int = 50000
+    nitter_instances: list = [
+        "https://nitter.net",
+        "https://nitter.1d4.us",
+        "https://nitter.kavin.rocks",
+    ]
+    nitter_hedge_delay_seconds: float = 2.0  # Race a second mirror after this long
+    nitter_timeout_seconds: float = 15.0
+    nitter_failure_threshold: int = 3  # Consecutive failures that open the circuit
+    nitter_cooldown_seconds: float = 60.0  # Before a broken mirror is probed again
+    
+    # ============================================
+    # HTTP Client
+    # ============================================
+    http_pool_limit: int = 100  # Open connections across all hosts
+    http_pool_limit_per_host: int = 10
+    http_dns_ttl_seconds: int = 300
+    http_keepalive_seconds: float = 30.0
+    http_timeout_seconds: float = 15.0  # Default for requests without their own
     
     # ============================================
     # Sentiment Analysis
@@ -80,6 +119,23 @@ class Settings(BaseSettings):
     sentiment_confidence_threshold: float = 0.6
     sentiment_intensity_threshold: float = 0.5
     token_list: list = ["DOGE", "SHIB", "PEPE"]
+    sentiment_window_posts: int = 100  # Most recent posts in each token's aggregate
+    seen_posts_per_token: int = 5000  # Post IDs remembered to skip re-scoring
+    stream_queue_size: int = 1000  # Items buffered between streaming stages
+    stream_batch_size: int = 32  # Posts per inference micro-batch
+    stream_batch_wait_seconds: float = 0.05  # Longest wait to fill a micro-batch
+    stream_poll_seconds: float = 60.0  # Between polls of one collector
+    stream_seen_posts: int = 50000  # Post IDs remembered across polls
+    sentiment_history_max_samples: int = 20000  # Full-resolution samples per token
+    sentiment_history_raw_hours: int = 24  # Older samples are downsampled
+    sentiment_history_retention_hours: int = 720
+    sentiment_history_bucket_seconds: int = 300
+    sentiment_history_dir: str = "./data/history"
+    sentiment_history_restore_hours: int = 24  # Reloaded from disk on startup
+    snapshot_refresh_interval_seconds: float = 30.0  # Background all-token rescan
+    single_flight_fresh_seconds: float = 10.0  # Per-token result reused by later requests
+    fanout_budget_seconds: float = 8.0  # Deadline for multi-token requests
+    fanout_snapshot_max_age_seconds: float = 60.0  # Snapshot entries served without reanalysis
     
     # ============================================
     # DexScreener Integration
@@ -102,6 +158,7 @@ class Settings(BaseSettings):
     enable_twitter_scraping: bool = True
     enable_tiktok_scraping: bool = True
     enable_sentiment_analysis: bool = True
+    enable_history_log: bool = True
     enable_oracle_submission: bool = False
     enable_mainnet: bool = False
     
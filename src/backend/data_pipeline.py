@@ -4,14 +4,20 @@ Handles real-time data collection from Twitter and TikTok
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
 from loguru import logger
 from abc import ABC, abstractmethod
 import aiohttp
 import re
-from urllib.parse import urlencode
+from urllib.parse import urlencode, urlparse
+
+from src.backend.http_client import get_http_session
+from src.backend.token_matcher import get_matcher
+from src.backend.dedup import NearDuplicateDetector
+from src.backend.rate_limit import get_host_budget, retry_after_seconds
+from src.backend.config import settings
 
 
 # ============================================
@@ -83,6 +89,16 @@ class RawPost:
         }
 
 
+# Spam thresholds shared by the batch filters and the streaming extract stage
+MIN_POST_LENGTH = 10
+MAX_POST_RETWEETS = 10000
+
+
+def is_spam(post: "RawPost") -> bool:
+    """Too short to score, or retweeted like a bot network"""
+    return len(post.text) < MIN_POST_LENGTH or post.metrics.get("retweets", 0) > MAX_POST_RETWEETS
+
+
 # ============================================
 # Data Collectors (Abstract)
 # ============================================
@@ -93,22 +109,96 @@ class DataCollector(ABC):
     def __init__(self, token_list: List[str]):
         self.token_list = token_list
         self.logger = logger.bind(collector=self.__class__.__name__)
+        self.unauthorized = False  # Set on 401 to skip the rest of the cycle
     
     @abstractmethod
     async def collect(self) -> List[RawPost]:
         """Collect data from source"""
         pass
     
-    def extract_tokens(self, text: str) -> List[str]:
-        """Extract token mentions from text"""
-        mentioned_tokens = []
-        text_lower = text.lower()
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Process-wide pooled session"""
+        return await get_http_session()
+    
+    async def _collect_tokens(self, collect_token) -> List[RawPost]:
+        """Run `collect_token(token)` for every token concurrently, bounded per source"""
+        slots = asyncio.Semaphore(settings.source_max_concurrency)
+        results = await asyncio.gather(*(
+            self._collect_bounded(collect_token, token, slots) for token in self.token_list
+        ))
+        return [post for token_posts in results for post in token_posts]
+    
+    async def stream(self) -> AsyncIterator[List[RawPost]]:
+        """Yield each token's posts as soon as its request completes"""
+        if not self.configured():
+            return
         
-        for token in self.token_list:
-            if token.lower() in text_lower or f"${token.lower()}" in text_lower:
-                mentioned_tokens.append(token)
+        self.unauthorized = False
+        slots = asyncio.Semaphore(settings.source_max_concurrency)
+        tasks = [
+            asyncio.create_task(self._collect_bounded(self._collect_token, token, slots))
+            for token in self.token_list
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _collect_bounded(self, collect_token, token: str, slots: asyncio.Semaphore) -> List[RawPost]:
+        """One token's posts within the source's concurrency limit; errors yield none"""
+        async with slots:
+            try:
+                return await collect_token(token)
+            except Exception as e:
+                self.logger.error(f"Error collecting {token}: {e}")
+                return []
+    
+    def configured(self) -> bool:
+        """Whether the source has the credentials it needs"""
+        return True
+    
+    @abstractmethod
+    async def _collect_token(self, token: str) -> List[RawPost]:
+        """Collect posts for one token"""
+        pass
+    
+    async def _request(self, method: str, url: str, **kwargs) -> Tuple[int, Any]:
+        """
+        Send a request within the host's token budget
+        
+        The budget follows the API's rate-limit headers. A 429 defers and
+        retries only this request; other tokens keep drawing from the budget.
+        """
+        host = urlparse(url).hostname
+        budget = get_host_budget(host)
+        session = await self._get_session()
         
-        return mentioned_tokens
+        for attempt in range(settings.scrape_max_retries + 1):
+            await budget.acquire()
+            
+            async with session.request(method, url, **kwargs) as response:
+                budget.update_from_headers(response.headers)
+                
+                if response.status != 429 or attempt == settings.scrape_max_retries:
+                    data = await response.json() if response.status == 200 else None
+                    return response.status, data
+                
+                delay = retry_after_seconds(response.headers, settings.scrape_retry_after_seconds)
+            
+            # Wait outside the block so the pooled connection is free for other tokens
+            self.logger.warning(f"Rate limited by {host}, retrying in {delay:.0f}s")
+            await asyncio.sleep(delay)
+    
+    async def close(self):
+        """Release collector resources (the shared session is closed at shutdown)"""
+        pass
+    
+    def extract_tokens(self, text: str) -> List[str]:
+        """Extract token mentions ($TICKER, #TICKER or the bare word) from text"""
+        return get_matcher(self.token_list).extract(text)
 
 
 # ============================================
@@ -173,6 +263,9 @@ class TwitterDataCollector(DataCollector):
             self.logger.debug(f"Error validating tweet: {e}")
             return False
     
+    def configured(self) -> bool:
+        return bool(self.bearer_token)
+    
     async def collect(self) -> List[RawPost]:
         """
         Collect tweets for target tokens using Twitter API v2
@@ -183,84 +276,71 @@ class TwitterDataCollector(DataCollector):
             self.logger.warning("No Twitter bearer token provided, returning empty results")
             return []
         
-        posts = []
+        self.unauthorized = False
+        posts = await self._collect_tokens(self._collect_token)
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                for token in self.token_list:
-                    try:
-                        # Build query
-                        query = self._build_search_query(token)
-                        
-                        # API parameters
-                        params = {
-                            "query": query,
-                            "max_results": self.max_results,
-                            "tweet.fields": "public_metrics,created_at,author_id",
-                            "expansions": "author_id",
-                            "user.fields": "username,public_metrics",
-                        }
-                        
-                        # Make request
-                        headers = {
-                            "Authorization": f"Bearer {self.bearer_token}",
-                            "User-Agent": "DeFAI-Oracle/1.0"
-                        }
-                        
-                        async with session.get(
-                            self.api_url,
-                            params=params,
-                            headers=headers,
-                            timeout=aiohttp.ClientTimeout(total=10)
-                        ) as response:
-                            if response.status == 200:
-                                data = await response.json()
-                                tweets = data.get("data", [])
-                                
-                                # Process tweets
-                                for tweet in tweets:
-                                    if self._validate_tweet(tweet):
-                                        post = RawPost(
-                                            source="twitter",
-                                            post_id=tweet.get("id"),
-                                            text=tweet.get("text"),
-                                            author_id=tweet.get("author_id"),
-                                            created_at=datetime.fromisoformat(
-                                                tweet.get("created_at", "").replace("Z", "+00:00")
-                                            ),
-                                            metrics={
-                                                "likes": tweet.get("public_metrics", {}).get("like_count", 0),
-                                                "retweets": tweet.get("public_metrics", {}).get("retweet_count", 0),
-                                                "replies": tweet.get("public_metrics", {}).get("reply_count", 0),
-                                            },
-                                            tokens_mentioned=self.extract_tokens(tweet.get("text", ""))
-                                        )
-                                        posts.append(post)
-                                
-                                self.logger.info(f"Collected {len(tweets)} tweets for {token}")
-                            
-                            elif response.status == 429:
-                                self.logger.warning("Twitter API rate limit exceeded")
-                                await asyncio.sleep(60)
-                            
-                            elif response.status == 401:
-                                self.logger.error("Invalid Twitter bearer token")
-                                break
-                            
-                            else:
-                                self.logger.error(f"Twitter API error: {response.status}")
-                        
-                        # Rate limiting between requests
-                        await asyncio.sleep(1)
-                    
-                    except Exception as e:
-                        self.logger.error(f"Error collecting tweets for {token}: {e}")
-                        continue
+        self.logger.info(f"Collected {len(posts)} valid tweets total")
+        return posts
+    
+    async def _collect_token(self, token: str) -> List[RawPost]:
+        """Collect tweets for one token"""
+        if self.unauthorized:
+            return []
         
-        except Exception as e:
-            self.logger.error(f"Error in Twitter collector: {e}")
+        # API parameters
+        params = {
+            "query": self._build_search_query(token),
+            "max_results": self.max_results,
+            "tweet.fields": "public_metrics,created_at,author_id",
+            "expansions": "author_id",
+            "user.fields": "username,public_metrics",
+        }
         
-        self.logger.info(f"Collected {len(posts)} valid tweets total")
+        # Make request
+        headers = {
+            "Authorization": f"Bearer {self.bearer_token}",
+            "User-Agent": "DeFAI-Oracle/1.0"
+        }
+        
+        status, data = await self._request("GET", self.api_url, params=params, headers=headers)
+        
+        if status == 429:
+            self.logger.warning(f"Twitter API rate limit exceeded for {token}, skipping this cycle")
+            return []
+        
+        if status == 401:
+            self.logger.error("Invalid Twitter bearer token")
+            self.unauthorized = True
+            return []
+        
+        if status != 200:
+            self.logger.error(f"Twitter API error: {status}")
+            return []
+        
+        tweets = data.get("data", [])
+        posts = []
+        
+        # Process tweets
+        for tweet in tweets:
+            if self._validate_tweet(tweet):
+                post = RawPost(
+                    source="twitter",
+                    post_id=tweet.get("id"),
+                    text=tweet.get("text"),
+                    author_id=tweet.get("author_id"),
+                    created_at=datetime.fromisoformat(
+                        tweet.get("created_at", "").replace("Z", "+00:00")
+                    ),
+                    metrics={
+                        "likes": tweet.get("public_metrics", {}).get("like_count", 0),
+                        "retweets": tweet.get("public_metrics", {}).get("retweet_count", 0),
+                        "replies": tweet.get("public_metrics", {}).get("reply_count", 0),
+                    },
+                    tokens_mentioned=self.extract_tokens(tweet.get("text", ""))
+                )
+                posts.append(post)
+        
+        self.logger.info(f"Collected {len(tweets)} tweets for {token}")
         return posts
     
     async def stream_tweets(self):
@@ -328,6 +408,9 @@ class TikTokDataCollector(DataCollector):
             self.logger.debug(f"Error validating video: {e}")
             return False
     
+    def configured(self) -> bool:
+        return bool(self.api_key)
+    
     async def collect(self) -> List[RawPost]:
         """
         Collect TikTok videos for target tokens
@@ -338,83 +421,73 @@ class TikTokDataCollector(DataCollector):
             self.logger.warning("No TikTok API key provided, returning empty results")
             return []
         
-        posts = []
+        self.unauthorized = False
+        posts = await self._collect_tokens(self._collect_token)
         
-        try:
-            async with aiohttp.ClientSession() as session:
-                for token in self.token_list:
-                    try:
-                        # Build search query
-                        search_query = self._build_search_query(token)
-                        
-                        # API parameters
-                        params = {
-                            "search_id": search_query,
-                            "query": search_query,
-                            "max_count": 30,
-                        }
-                        
-                        # Make request
-                        headers = {
-                            "Authorization": f"Bearer {self.api_key}",
-                            "User-Agent": "DeFAI-Oracle/1.0"
-                        }
-                        
-                        async with session.post(
-                            self.api_url,
-                            json=params,
-                            headers=headers,
-                            timeout=aiohttp.ClientTimeout(total=10)
-                        ) as response:
-                            if response.status == 200:
-                                data = await response.json()
-                                videos = data.get("data", {}).get("videos", [])
-                                
-                                # Process videos
-                                for video in videos:
-                                    if self._validate_video(video):
-                                        post = RawPost(
-                                            source="tiktok",
-                                            post_id=video.get("id"),
-                                            text=video.get("description", ""),
-                                            author_id=video.get("author", {}).get("id", ""),
-                                            created_at=datetime.fromtimestamp(
-                                                video.get("create_time", 0)
-                                            ),
-                                            metrics={
-                                                "views": video.get("statistics", {}).get("view_count", 0),
-                                                "likes": video.get("statistics", {}).get("like_count", 0),
-                                                "comments": video.get("statistics", {}).get("comment_count", 0),
-                                                "shares": video.get("statistics", {}).get("share_count", 0),
-                                            },
-                                            tokens_mentioned=self.extract_tokens(video.get("description", ""))
-                                        )
-                                        posts.append(post)
-                                
-                                self.logger.info(f"Collected {len(videos)} videos for {token}")
-                            
-                            elif response.status == 429:
-                                self.logger.warning("TikTok API rate limit exceeded")
-                                await asyncio.sleep(60)
-                            
-                            elif response.status == 401:
-                                self.logger.error("Invalid TikTok API credentials")
-                                break
-                            
-                            else:
-                                self.logger.error(f"TikTok API error: {response.status}")
-                        
-                        # Rate limiting between requests
-                        await asyncio.sleep(2)
-                    
-                    except Exception as e:
-                        self.logger.error(f"Error collecting videos for {token}: {e}")
-                        continue
+        self.logger.info(f"Collected {len(posts)} valid TikTok videos total")
+        return posts
+    
+    async def _collect_token(self, token: str) -> List[RawPost]:
+        """Collect videos for one token"""
+        if self.unauthorized:
+            return []
         
-        except Exception as e:
-            self.logger.error(f"Error in TikTok collector: {e}")
+        # Build search query
+        search_query = self._build_search_query(token)
         
-        self.logger.info(f"Collected {len(posts)} valid TikTok videos total")
+        # API parameters
+        params = {
+            "search_id": search_query,
+            "query": search_query,
+            "max_count": 30,
+        }
+        
+        # Make request
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "User-Agent": "DeFAI-Oracle/1.0"
+        }
+        
+        status, data = await self._request("POST", self.api_url, json=params, headers=headers)
+        
+        if status == 429:
+            self.logger.warning(f"TikTok API rate limit exceeded for {token}, skipping this cycle")
+            return []
+        
+        if status == 401:
+            self.logger.error("Invalid TikTok API credentials")
+            self.unauthorized = True
+            return []
+        
+        if status != 200:
+            self.logger.error(f"TikTok API error: {status}")
+            return []
+        
+        videos = data.get("data", {}).get("videos", [])
+        posts = []
+        
+        # Process videos
+        for video in videos:
+            if self._validate_video(video):
+                post = RawPost(
+                    source="tiktok",
+                    post_id=video.get("id"),
+                    text=video.get("description", ""),
+                    author_id=video.get("author", {}).get("id", ""),
+                    created_at=datetime.fromtimestamp(
+                        video.get("create_time", 0)
+                    ),
+                    metrics={
+                        "views": video.get("statistics", {}).get("view_count", 0),
+                        "likes": video.get("statistics", {}).get("like_count", 0),
+                        "comments": video.get("statistics", {}).get("comment_count", 0),
+                        "shares": video.get("statistics", {}).get("share_count", 0),
+                    },
+                    tokens_mentioned=self.extract_tokens(video.get("description", ""))
+                )
+                posts.append(post)
+        
+        self.logger.info(f"Collected {len(videos)} videos for {token}")
         return posts
 
 
@@ -433,6 +506,11 @@ class DataPipeline:
         self.twitter_collector = TwitterDataCollector(token_list)
         self.tiktok_collector = TikTokDataCollector(token_list)
         
+        # Spam filtering
+        self.dedup = NearDuplicateDetector()
+        
+        self.stream = None  # StreamingPipeline while run() is active
+        
         self.logger.info(f"Initialized data pipeline for {len(token_list)} tokens")
     
     async def collect_all(self) -> List[RawPost]:
@@ -469,47 +547,51 @@ class DataPipeline:
         """Filter out spam and bot activity"""
         self.logger.info(f"Filtering {len(posts)} posts...")
         
-        filtered = []
+        kept: Dict[str, RawPost] = {}
         
         for post in posts:
-            # Filter out posts with suspicious metrics
-            if post.metrics.get("retweets", 0) > 10000:
-                self.logger.debug(f"Filtered post {post.post_id}: suspicious retweets")
+            # Filter out very short posts and suspicious metrics
+            if is_spam(post):
+                self.logger.debug(f"Filtered post {post.post_id}: spam")
                 continue
             
-            # TODO: Add more sophisticated filtering
-            # - Bot detection
-            # - Duplicate detection
-            # - Spam detection
+            # Collapse near-identical posts (copy-paste shilling) into the first copy
+            original = self.dedup.check(post.post_id, post.text)
+            if original is not None:
+                if original in kept:
+                    kept[original].metrics["duplicates"] = kept[original].metrics.get("duplicates", 0) + 1
+                self.logger.debug(f"Filtered post {post.post_id}: near-duplicate of {original}")
+                continue
             
-            filtered.append(post)
+            kept.setdefault(post.post_id, post)
         
+        filtered = list(kept.values())
         self.logger.info(f"Filtered to {len(filtered)} posts")
         return filtered
     
-    async def run(self, interval_seconds: int = 300):
-        """Run the pipeline continuously"""
-        self.logger.info(f"Starting data pipeline (interval: {interval_seconds}s)")
+    async def close(self):
+        """Close collector sessions"""
+        await self.twitter_collector.close()
+        await self.tiktok_collector.close()
+    
+    async def run(self, interval_seconds: int = 300, publishers: Optional[list] = None, cycles: Optional[int] = None):
+        """
+        Run the pipeline continuously as streaming stages
         
-        while True:
-            try:
-                # Collect data
-                posts = await self.collect_all()
-                
-                # Filter spam
-                posts = await self.filter_spam(posts)
-                
-                # TODO: Send to Kafka/Redis for processing
-                # TODO: Store in database
-                
-                self.logger.info(f"Pipeline cycle complete: {len(posts)} posts processed")
-                
-                # Wait for next cycle
-                await asyncio.sleep(interval_seconds)
-            
-            except Exception as e:
-                self.logger.error(f"Pipeline error: {e}")
-                await asyncio.sleep(5)
+        Each collector is re-polled every `interval_seconds`, but posts are
+        scored and `publishers` called as soon as each token's results arrive.
+        """
+        # Imported here: the streaming pipeline depends on the sentiment models
+        from src.backend.stream_pipeline import StreamingPipeline
+        
+        self.logger.info(f"Starting data pipeline (poll interval: {interval_seconds}s)")
+        self.stream = StreamingPipeline(
+            [self.twitter_collector, self.tiktok_collector],
+            self.token_list,
+            publishers=publishers,
+            poll_interval=interval_seconds,
+        )
+        await self.stream.run(cycles)
 
 
 # ============================================
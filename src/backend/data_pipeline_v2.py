@@ -4,11 +4,15 @@ Replaces expensive Twitter API with free Nitter scraper
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator
 from dataclasses import dataclass
 from datetime import datetime
 from loguru import logger
+from src.backend.http_client import close_http_client
 from src.backend.twitter_scraper import NitterScraper, ScrapedTweet
+from src.backend.token_matcher import get_matcher
+from src.backend.dedup import NearDuplicateDetector
+from src.backend.data_pipeline import is_spam
 
 
 @dataclass
@@ -47,15 +51,8 @@ class FreeTwitterCollector:
         self.logger.info(f"Initialized free Twitter collector for {len(token_list)} tokens")
     
     def extract_tokens(self, text: str) -> List[str]:
-        """Extract token mentions from text"""
-        mentioned_tokens = []
-        text_lower = text.lower()
-        
-        for token in self.token_list:
-            if token.lower() in text_lower or f"${token.lower()}" in text_lower:
-                mentioned_tokens.append(token)
-        
-        return mentioned_tokens
+        """Extract token mentions ($TICKER, #TICKER or the bare word) from text"""
+        return get_matcher(self.token_list).extract(text)
     
     async def collect(self) -> List[RawPost]:
         """Collect tweets using free Nitter scraper"""
@@ -68,21 +65,7 @@ class FreeTwitterCollector:
             scraped_tweets = await self.scraper.scrape_all_tokens(max_tweets_per_token=100)
             
             # Convert to RawPost format
-            for tweet in scraped_tweets:
-                post = RawPost(
-                    source="twitter",
-                    post_id=tweet.tweet_id,
-                    text=tweet.text,
-                    author_id=tweet.author_handle,
-                    created_at=tweet.created_at,
-                    metrics={
-                        "likes": tweet.likes,
-                        "retweets": tweet.retweets,
-                        "replies": tweet.replies,
-                    },
-                    tokens_mentioned=self.extract_tokens(tweet.text)
-                )
-                posts.append(post)
+            posts = [self._to_post(tweet) for tweet in scraped_tweets]
             
             self.logger.info(f"Collected {len(posts)} tweets")
         
@@ -91,6 +74,33 @@ class FreeTwitterCollector:
         
         return posts
     
+    async def stream(self) -> AsyncIterator[List[RawPost]]:
+        """Yield each token's tweets as soon as its page is scraped"""
+        for i, token in enumerate(self.token_list):
+            if i:
+                await asyncio.sleep(2)  # Rate limiting between tokens
+            try:
+                tweets = await self.scraper.scrape_tweets(token, 100)
+            except Exception as e:
+                self.logger.error(f"Error scraping {token}: {e}")
+                continue
+            yield [self._to_post(tweet) for tweet in tweets]
+    
+    def _to_post(self, tweet: ScrapedTweet) -> RawPost:
+        return RawPost(
+            source="twitter",
+            post_id=tweet.tweet_id,
+            text=tweet.text,
+            author_id=tweet.author_handle,
+            created_at=tweet.created_at,
+            metrics={
+                "likes": tweet.likes,
+                "retweets": tweet.retweets,
+                "replies": tweet.replies,
+            },
+            tokens_mentioned=self.extract_tokens(tweet.text)
+        )
+    
     async def close(self):
         """Close scraper"""
         await self.scraper.close()
@@ -109,6 +119,11 @@ class UpdatedDataPipeline:
         # Initialize free collectors
         self.twitter_collector = FreeTwitterCollector(token_list)
         
+        # Spam filtering
+        self.dedup = NearDuplicateDetector()
+        
+        self.stream = None  # StreamingPipeline while run() is active
+        
         self.logger.info(f"Initialized updated data pipeline for {len(token_list)} tokens")
     
     async def collect_all(self) -> List[RawPost]:
@@ -132,47 +147,50 @@ class UpdatedDataPipeline:
         """Filter out spam and bot activity"""
         self.logger.info(f"Filtering {len(posts)} posts...")
         
-        filtered = []
+        kept: Dict[str, RawPost] = {}
         
         for post in posts:
-            # Filter out posts with suspicious metrics
-            if post.metrics.get("retweets", 0) > 10000:
-                self.logger.debug(f"Filtered post {post.post_id}: suspicious retweets")
-                continue
-            
-            # Filter out very short posts
-            if len(post.text) < 10:
+            # Filter out very short posts and suspicious metrics
+            if is_spam(post):
+                self.logger.debug(f"Filtered post {post.post_id}: spam")
                 continue
             
             # Filter out posts with no token mentions
             if not post.tokens_mentioned:
                 continue
             
-            filtered.append(post)
+            # Collapse near-identical posts (copy-paste shilling) into the first copy
+            original = self.dedup.check(post.post_id, post.text)
+            if original is not None:
+                if original in kept:
+                    kept[original].metrics["duplicates"] = kept[original].metrics.get("duplicates", 0) + 1
+                self.logger.debug(f"Filtered post {post.post_id}: near-duplicate of {original}")
+                continue
+            
+            kept.setdefault(post.post_id, post)
         
+        filtered = list(kept.values())
         self.logger.info(f"Filtered to {len(filtered)} posts")
         return filtered
     
-    async def run(self, interval_seconds: int = 300):
-        """Run the pipeline continuously"""
-        self.logger.info(f"Starting updated data pipeline (interval: {interval_seconds}s)")
-        
-        while True:
-            try:
-                # Collect data
-                posts = await self.collect_all()
-                
-                # Filter spam
-                posts = await self.filter_spam(posts)
-                
-                self.logger.info(f"Pipeline cycle complete: {len(posts)} posts processed")
-                
-                # Wait for next cycle
-                await asyncio.sleep(interval_seconds)
-            
-            except Exception as e:
-                self.logger.error(f"Pipeline error: {e}")
-                await asyncio.sleep(5)
+    async def run(self, interval_seconds: int = 300, publishers: Optional[list] = None, cycles: Optional[int] = None):
+        """
+        Run the pipeline continuously as streaming stages
+        
+        The scraper is re-polled every `interval_seconds`, but posts are
+        scored and `publishers` called as soon as each token's page arrives.
+        """
+        # Imported here: sentiment_pipeline imports this module
+        from src.backend.stream_pipeline import StreamingPipeline
+        
+        self.logger.info(f"Starting updated data pipeline (poll interval: {interval_seconds}s)")
+        self.stream = StreamingPipeline(
+            [self.twitter_collector],
+            self.token_list,
+            publishers=publishers,
+            poll_interval=interval_seconds,
+        )
+        await self.stream.run(cycles)
     
     async def close(self):
         """Close all collectors"""
@@ -202,6 +220,7 @@ async def test_updated_pipeline():
     
     finally:
         await pipeline.close()
+        await close_http_client()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,163 @@
+"""
+Near-Duplicate Detection
+MinHash signatures with an LSH index over a sliding time window
+"""
+
+import re
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from loguru import logger
+
+from src.backend.config import settings
+
+
+# Mersenne prime for the universal hash family; products stay below 2**62
+MERSENNE_PRIME = (1 << 31) - 1
+
+URL_PATTERN = re.compile(r"https?://\S+")
+WORD_PATTERN = re.compile(r"[$#@]?\w+")
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Word n-grams of normalized text (URLs dropped, case folded)"""
+    words = WORD_PATTERN.findall(URL_PATTERN.sub(" ", text.lower()))
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+class NearDuplicateDetector:
+    """
+    Streaming near-duplicate detector
+    
+    Each text gets a MinHash signature split into LSH bands. A text is a
+    near-duplicate when it shares a band with an indexed text whose
+    estimated Jaccard similarity reaches the threshold. Entries expire after
+    `window_seconds` so the index stays bounded.
+    """
+    
+    def __init__(
+        self,
+        threshold: Optional[float] = None,
+        window_seconds: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        self.threshold = threshold or settings.dedup_similarity_threshold
+        self.window_seconds = window_seconds or settings.dedup_window_seconds
+        self.num_perm = num_perm or settings.dedup_num_perm
+        self.bands = bands or settings.dedup_bands
+        self.max_entries = max_entries or settings.dedup_max_entries
+        self.shingle_size = shingle_size
+        self.logger = logger.bind(component="NearDuplicateDetector")
+        
+        if self.num_perm % self.bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.rows = self.num_perm // self.bands
+        
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, MERSENNE_PRIME, size=self.num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, MERSENNE_PRIME, size=self.num_perm, dtype=np.uint64)
+        
+        # doc id -> (inserted at, signature), oldest first
+        self.entries: "OrderedDict[str, Tuple[float, np.ndarray]]" = OrderedDict()
+        self.index: Dict[Tuple[int, bytes], Set[str]] = {}
+        
+        # Stats
+        self.checked = 0
+        self.duplicates = 0
+    
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """MinHash signature of a text, or None when it has no words"""
+        grams = shingles(text, self.shingle_size)
+        if not grams:
+            return None
+        
+        hashes = np.fromiter(
+            (zlib.crc32(gram.encode()) for gram in grams),
+            dtype=np.uint64,
+            count=len(grams),
+        ) % MERSENNE_PRIME
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % MERSENNE_PRIME
+        return permuted.min(axis=1)
+    
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows].tobytes())
+            for band in range(self.bands)
+        ]
+    
+    def check(self, doc_id: str, text: str, now: Optional[float] = None) -> Optional[str]:
+        """
+        Return the id of an earlier near-duplicate, or index the text and
+        return None. Re-checking an already indexed id is never a duplicate.
+        """
+        now = time.monotonic() if now is None else now
+        self._expire(now)
+        self.checked += 1
+        
+        if doc_id in self.entries:
+            return None
+        
+        signature = self.signature(text)
+        if signature is None:
+            return None
+        
+        keys = self._band_keys(signature)
+        candidates = set()
+        for key in keys:
+            candidates.update(self.index.get(key, ()))
+        
+        for candidate in candidates:
+            _, other = self.entries[candidate]
+            if np.count_nonzero(signature == other) >= self.threshold * self.num_perm:
+                self.duplicates += 1
+                return candidate
+        
+        self.entries[doc_id] = (now, signature)
+        for key in keys:
+            self.index.setdefault(key, set()).add(doc_id)
+        
+        if len(self.entries) > self.max_entries:
+            self._remove(next(iter(self.entries)))
+        
+        return None
+    
+    def _expire(self, now: float):
+        """Drop entries older than the window"""
+        cutoff = now - self.window_seconds
+        while self.entries:
+            doc_id, (inserted_at, _) = next(iter(self.entries.items()))
+            if inserted_at > cutoff:
+                break
+            self._remove(doc_id)
+    
+    def forget(self, doc_id: str):
+        """Drop an indexed text, e.g. one that was never scored"""
+        if doc_id in self.entries:
+            self._remove(doc_id)
+    
+    def _remove(self, doc_id: str):
+        _, signature = self.entries.pop(doc_id)
+        for key in self._band_keys(signature):
+            bucket = self.index.get(key)
+            if bucket is not None:
+                bucket.discard(doc_id)
+                if not bucket:
+                    del self.index[key]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get detector statistics"""
+        return {
+            "indexed": len(self.entries),
+            "checked": self.checked,
+            "duplicates": self.duplicates,
+            "duplicate_ratio": self.duplicates / self.checked if self.checked else 0.0,
+        }
@@ -11,6 +11,8 @@ from datetime import datetime
 from loguru import logger
 import json
 
+from src.backend.http_client import get_http_session
+
 
 @dataclass
 class DevWallet:
@@ -39,16 +41,13 @@ class DevWalletAnalyzer:
     
     def __init__(self):
         self.logger = logger.bind(component="DevWalletAnalyzer")
-        self.session = None
         self.base_rpc = "https://mainnet.base.org"
         self.basescan_api = "https://api.basescan.org/api"
         self.basescan_key = "YourBasescanAPIKey"  # TODO: Add to config
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create session"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-        return self.session
+        """Process-wide pooled session"""
+        return await get_http_session()
     
     async def analyze_token_dev_wallets(
         self, 
@@ -220,6 +219,5 @@ class DevWalletAnalyzer:
             return "✅ LOW RISK: Dev wallets appear legitimate."
     
     async def close(self):
-        """Close session"""
-        if self.session:
-            await self.session.aclose()
+        """Release resources (the shared session is closed at shutdown)"""
+        pass
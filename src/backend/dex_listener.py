@@ -11,6 +11,8 @@ from datetime import datetime
 from loguru import logger
 import json
 
+from src.backend.http_client import get_http_session
+
 
 @dataclass
 class TokenPair:
@@ -33,7 +35,6 @@ class DEXListener:
     
     def __init__(self):
         self.logger = logger.bind(component="DEXListener")
-        self.session = None
         self.base_chain_id = 8453
         self.known_pairs = set()
         
@@ -44,10 +45,8 @@ class DEXListener:
         self.logger.info("Initialized DEX Listener for Base chain")
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create session"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-        return self.session
+        """Process-wide pooled session"""
+        return await get_http_session()
     
     async def get_uniswap_pairs(self, limit: int = 50) -> List[TokenPair]:
         """Fetch recent pairs from Uniswap V3 on Base"""
@@ -222,6 +221,5 @@ class DEXListener:
             return []
     
     async def close(self):
-        """Close session"""
-        if self.session:
-            await self.session.aclose()
+        """Release resources (the shared session is closed at shutdown)"""
+        pass
@@ -3,12 +3,14 @@ DexScreener Token Fetcher
 Fetches trending tokens from DexScreener Base chain
 """
 
-import httpx
+import aiohttp
 import asyncio
 from typing import List, Dict, Any, Optional
 from loguru import logger
 from datetime import datetime, timedelta
 
+from src.backend.http_client import get_http_session
+
 
 class DexScreenerFetcher:
     """Fetches tokens from DexScreener API"""
@@ -24,19 +26,17 @@ class DexScreenerFetcher:
             max_tokens: Maximum number of tokens to fetch
         """
         self.max_tokens = max_tokens
-        self.client = None
+        self.timeout = aiohttp.ClientTimeout(total=30)
         self.cache = {}
         self.cache_ttl = 300  # 5 minutes
         
     async def initialize(self):
-        """Initialize HTTP client"""
-        self.client = httpx.AsyncClient(timeout=30.0)
+        """Initialize fetcher (requests go through the shared HTTP pool)"""
         logger.info(f"Initialized DexScreener fetcher for {self.CHAIN}")
     
     async def close(self):
-        """Close HTTP client"""
-        if self.client:
-            await self.client.aclose()
+        """Release resources (the shared session is closed at shutdown)"""
+        pass
     
     async def fetch_trending_tokens(self) -> List[Dict[str, Any]]:
         """
@@ -68,10 +68,11 @@ class DexScreenerFetcher:
             }
             
             logger.info(f"Fetching from {url} with params {params}")
+            session = await get_http_session()
             try:
-                response = await self.client.get(url, params=params)
-                response.raise_for_status()
-                data = response.json()
+                async with session.get(url, params=params, timeout=self.timeout) as response:
+                    response.raise_for_status()
+                    data = await response.json()
                 pairs = data.get("pairs", [])
                 all_pairs.extend(pairs)
                 logger.info(f"DexScreener search returned {len(pairs)} pairs")
@@ -81,9 +82,9 @@ class DexScreenerFetcher:
             # Also try fetching popular tokens
             try:
                 url2 = f"{self.BASE_URL}/dex/base/top/1h"
-                response2 = await self.client.get(url2)
-                if response2.status_code == 200:
-                    data2 = response2.json()
+                async with session.get(url2, timeout=self.timeout) as response2:
+                    data2 = await response2.json() if response2.status == 200 else None
+                if data2 is not None:
                     pairs2 = data2.get("pairs", [])
                     all_pairs.extend(pairs2)
                     logger.info(f"DexScreener top 1h returned {len(pairs2)} pairs")
@@ -172,10 +173,11 @@ class DexScreenerFetcher:
             }
             
             logger.info(f"Searching for token: {symbol}")
-            response = await self.client.get(url, params=params)
-            response.raise_for_status()
+            session = await get_http_session()
+            async with session.get(url, params=params, timeout=self.timeout) as response:
+                response.raise_for_status()
+                data = await response.json()
             
-            data = response.json()
             pairs = data.get("pairs", [])
             
             for pair in pairs:
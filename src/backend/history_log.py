@@ -0,0 +1,129 @@
+"""
+On-Disk Sentiment History Log
+Append-only JSON Lines segments, one file per day
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from loguru import logger
+
+from src.backend.config import settings
+
+
+class HistoryLog:
+    """
+    Append-only log of sentiment samples
+    
+    Each sample is one compact JSON line in the segment for its day, so
+    appends never rewrite existing data and loading recent history only
+    opens the segments that overlap the requested period.
+    """
+    
+    SEGMENT_PREFIX = "sentiment-"
+    SEGMENT_SUFFIX = ".jsonl"
+    
+    def __init__(self, directory: Optional[str] = None, retention_hours: Optional[int] = None):
+        self.directory = Path(directory or settings.sentiment_history_dir)
+        self.retention_hours = retention_hours or settings.sentiment_history_retention_hours
+        self.logger = logger.bind(component="HistoryLog")
+        self._lock = threading.Lock()
+        
+        # Stats
+        self.records_written = 0
+        self.bytes_written = 0
+        self.segments_pruned = 0
+    
+    def segment_path(self, day: str) -> Path:
+        """Path of the segment for a YYYY-MM-DD day"""
+        return self.directory / f"{self.SEGMENT_PREFIX}{day}{self.SEGMENT_SUFFIX}"
+    
+    def segments(self, since: Optional[datetime] = None) -> List[Path]:
+        """Segment files oldest first, skipping days before `since`"""
+        if not self.directory.exists():
+            return []
+        
+        first_day = since.date().isoformat() if since else ""
+        paths = []
+        for path in sorted(self.directory.glob(f"{self.SEGMENT_PREFIX}*{self.SEGMENT_SUFFIX}")):
+            day = path.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]
+            if day >= first_day:
+                paths.append(path)
+        return paths
+    
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """Append records (TokenSentiment.to_dict() shape) to their day segments"""
+        if not records:
+            return 0
+        
+        by_day: Dict[str, List[str]] = {}
+        for record in records:
+            line = json.dumps(record, separators=(",", ":"))
+            by_day.setdefault(record["timestamp"][:10], []).append(line + "\n")
+        
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            new_segment = False
+            
+            for day, lines in by_day.items():
+                path = self.segment_path(day)
+                new_segment = new_segment or not path.exists()
+                chunk = "".join(lines)
+                with open(path, "a") as f:
+                    f.write(chunk)
+                self.bytes_written += len(chunk)
+            
+            self.records_written += len(records)
+            
+            if new_segment:
+                self._prune()
+        
+        return len(records)
+    
+    async def append_async(self, records: List[Dict[str, Any]]) -> int:
+        """Append records without blocking the event loop"""
+        return await asyncio.to_thread(self.append, records)
+    
+    def load(self, since: Optional[datetime] = None) -> Iterator[Dict[str, Any]]:
+        """Yield records newer than `since`, oldest first"""
+        for i, path in enumerate(self.segments(since)):
+            # Only the first segment can straddle the cutoff
+            check_time = since is not None and i == 0
+            
+            with open(path) as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write from an unclean shutdown
+                        self.logger.warning(f"Skipping corrupt line in {path.name}")
+                        continue
+                    
+                    if check_time and datetime.fromisoformat(record["timestamp"]) <= since:
+                        continue
+                    yield record
+    
+    def _prune(self):
+        """Delete segments entirely older than the retention period"""
+        cutoff = (datetime.now() - timedelta(hours=self.retention_hours)).date().isoformat()
+        
+        for path in self.segments():
+            day = path.name[len(self.SEGMENT_PREFIX):-len(self.SEGMENT_SUFFIX)]
+            if day < cutoff:
+                path.unlink(missing_ok=True)
+                self.segments_pruned += 1
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get log statistics"""
+        return {
+            "directory": str(self.directory),
+            "segments": len(self.segments()),
+            "records_written": self.records_written,
+            "bytes_written": self.bytes_written,
+            "segments_pruned": self.segments_pruned,
+        }
@@ -0,0 +1,234 @@
+"""
+Compact Sentiment History Storage
+Columnar NumPy ring buffers with retention and downsampling
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from src.backend.config import settings
+
+
+# ============================================
+# Record Layout
+# ============================================
+
+LABELS = ("bearish", "neutral", "bullish")
+TRENDS = ("stable", "rising", "falling", "insufficient_data")
+
+HISTORY_DTYPE = np.dtype([
+    ("timestamp", "f8"),        # epoch seconds
+    ("sentiment_score", "f4"),
+    ("confidence", "f4"),
+    ("sample_size", "u4"),
+    ("bullish_count", "u4"),
+    ("neutral_count", "u4"),
+    ("bearish_count", "u4"),
+    ("avg_likes", "f4"),
+    ("avg_retweets", "f4"),
+    ("avg_replies", "f4"),
+    ("trend_strength", "f4"),
+    ("label", "u1"),
+    ("trend", "u1"),
+    ("merged", "u4"),           # raw samples folded into this row
+])
+
+# Columns averaged (weighted by `merged`) when downsampling
+MEAN_FIELDS = (
+    "sentiment_score", "confidence", "avg_likes", "avg_retweets",
+    "avg_replies", "trend_strength",
+)
+
+# Columns summed when downsampling
+SUM_FIELDS = ("sample_size", "bullish_count", "neutral_count", "bearish_count")
+
+
+def record_to_dict(token: str, row: np.void) -> Dict[str, Any]:
+    """Materialize one stored row in the TokenSentiment.to_dict() shape"""
+    return {
+        "token": token,
+        "timestamp": datetime.fromtimestamp(float(row["timestamp"])).isoformat(),
+        "sentiment_score": float(row["sentiment_score"]),
+        "sentiment_label": LABELS[row["label"]],
+        "confidence": float(row["confidence"]),
+        "sample_size": int(row["sample_size"]),
+        "bullish_count": int(row["bullish_count"]),
+        "neutral_count": int(row["neutral_count"]),
+        "bearish_count": int(row["bearish_count"]),
+        "avg_likes": float(row["avg_likes"]),
+        "avg_retweets": float(row["avg_retweets"]),
+        "avg_replies": float(row["avg_replies"]),
+        "trend": TRENDS[row["trend"]],
+        "trend_strength": float(row["trend_strength"]),
+    }
+
+
+# ============================================
+# Ring Buffer
+# ============================================
+
+class RecordRing:
+    """Fixed-capacity ring of HISTORY_DTYPE rows in arrival order"""
+    
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.rows = np.zeros(self.capacity, dtype=HISTORY_DTYPE)
+        self.start = 0
+        self.size = 0
+    
+    def __len__(self) -> int:
+        return self.size
+    
+    def _index(self, position: int) -> int:
+        """Physical index of a logical position (negative counts from the end)"""
+        if position < 0:
+            position += self.size
+        if not 0 <= position < self.size:
+            raise IndexError("ring index out of range")
+        return (self.start + position) % self.capacity
+    
+    def __getitem__(self, position: int) -> np.void:
+        return self.rows[self._index(position)]
+    
+    def append(self, row: np.void) -> Optional[np.void]:
+        """Append a row, returning the row it displaced when full"""
+        displaced = None
+        if self.size == self.capacity:
+            displaced = self.popleft()
+        
+        self.rows[(self.start + self.size) % self.capacity] = row
+        self.size += 1
+        return displaced
+    
+    def popleft(self) -> np.void:
+        """Remove and return the oldest row"""
+        if not self.size:
+            raise IndexError("pop from empty ring")
+        
+        row = self.rows[self.start].copy()
+        self.start = (self.start + 1) % self.capacity
+        self.size -= 1
+        return row
+    
+    def ordered(self) -> np.ndarray:
+        """Copy of the rows, oldest first"""
+        end = self.start + self.size
+        if end <= self.capacity:
+            return self.rows[self.start:end].copy()
+        return np.concatenate((self.rows[self.start:], self.rows[:end - self.capacity]))
+    
+    def nbytes(self) -> int:
+        return self.rows.nbytes
+
+
+# ============================================
+# Sentiment Series
+# ============================================
+
+class SentimentSeries:
+    """
+    Per-token sentiment history in two columnar tiers
+    
+    Recent samples are kept at full resolution. Once they age past
+    `raw_hours` (or the raw ring fills up) they are folded into fixed-width
+    buckets that are retained for `retention_hours`.
+    """
+    
+    def __init__(
+        self,
+        raw_capacity: Optional[int] = None,
+        raw_hours: Optional[float] = None,
+        retention_hours: Optional[float] = None,
+        bucket_seconds: Optional[int] = None,
+    ):
+        raw_capacity = raw_capacity or settings.sentiment_history_max_samples
+        self.raw_seconds = (raw_hours or settings.sentiment_history_raw_hours) * 3600
+        self.retention_seconds = (retention_hours or settings.sentiment_history_retention_hours) * 3600
+        self.bucket_seconds = bucket_seconds or settings.sentiment_history_bucket_seconds
+        
+        self.raw = RecordRing(raw_capacity)
+        self.buckets = RecordRing(int(self.retention_seconds // self.bucket_seconds) + 1)
+    
+    def __len__(self) -> int:
+        return len(self.buckets) + len(self.raw)
+    
+    def append(self, timestamp: float, **values: Any):
+        """Store one sample; values use HISTORY_DTYPE column names"""
+        row = np.zeros((), dtype=HISTORY_DTYPE)
+        row["timestamp"] = timestamp
+        row["merged"] = 1
+        for name, value in values.items():
+            row[name] = value
+        
+        displaced = self.raw.append(row)
+        if displaced is not None:
+            self._downsample(displaced)
+        self._expire(timestamp)
+    
+    def update_latest(self, **values: Any):
+        """Overwrite columns of the most recent sample"""
+        row = self.raw[-1]
+        for name, value in values.items():
+            row[name] = value
+    
+    def _expire(self, now: float):
+        """Age raw samples into buckets and drop buckets past retention"""
+        raw_cutoff = now - self.raw_seconds
+        while len(self.raw) > 1 and self.raw[0]["timestamp"] <= raw_cutoff:
+            self._downsample(self.raw.popleft())
+        
+        bucket_cutoff = now - self.retention_seconds
+        while self.buckets and self.buckets[0]["timestamp"] <= bucket_cutoff:
+            self.buckets.popleft()
+    
+    def _downsample(self, row: np.void):
+        """Fold a raw sample into its time bucket"""
+        bucket_start = row["timestamp"] - row["timestamp"] % self.bucket_seconds
+        
+        if self.buckets and self.buckets[-1]["timestamp"] == bucket_start:
+            bucket = self.buckets[-1]
+            merged = bucket["merged"] + row["merged"]
+            weight = row["merged"] / merged
+            for name in MEAN_FIELDS:
+                bucket[name] += (row[name] - bucket[name]) * weight
+            for name in SUM_FIELDS:
+                bucket[name] += row[name]
+            bucket["label"] = row["label"]
+            bucket["trend"] = row["trend"]
+            bucket["merged"] = merged
+        else:
+            row["timestamp"] = bucket_start
+            self.buckets.append(row)
+    
+    def latest(self) -> Optional[np.void]:
+        """Most recent row, or None when empty"""
+        if self.raw:
+            return self.raw[-1]
+        if self.buckets:
+            return self.buckets[-1]
+        return None
+    
+    def score_at(self, position: int) -> float:
+        """Score of a logical position across both tiers (negative from the end)"""
+        if position < 0:
+            position += len(self)
+        if position < len(self.buckets):
+            return float(self.buckets[position]["sentiment_score"])
+        return float(self.raw[position - len(self.buckets)]["sentiment_score"])
+    
+    def records(self, since: Optional[float] = None) -> np.ndarray:
+        """Rows oldest first, optionally only those newer than `since`"""
+        rows = np.concatenate((self.buckets.ordered(), self.raw.ordered()))
+        if since is not None:
+            rows = rows[rows["timestamp"] > since]
+        return rows
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get storage statistics"""
+        return {
+            "raw_samples": len(self.raw),
+            "buckets": len(self.buckets),
+            "bytes": self.raw.nbytes() + self.buckets.nbytes(),
+        }
@@ -0,0 +1,144 @@
+"""
+Shared HTTP Client
+One pooled aiohttp session for every outbound request in the process
+"""
+
+import asyncio
+from typing import Any, Dict, Optional
+
+import aiohttp
+from loguru import logger
+
+from src.backend.config import settings
+
+
+class HTTPClient:
+    """
+    Process-wide aiohttp session with a keep-alive connection pool
+    
+    Connections are reused across scrapers and analyzers, DNS answers are
+    cached, and every host gets its own connection cap. Requests that do not
+    pass a timeout use the shared default. The session is created lazily on
+    the running event loop and recreated if the loop changes.
+    """
+    
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        dns_ttl_seconds: Optional[int] = None,
+        keepalive_seconds: Optional[float] = None,
+        timeout_seconds: Optional[float] = None,
+    ):
+        self.limit = limit or settings.http_pool_limit
+        self.limit_per_host = limit_per_host or settings.http_pool_limit_per_host
+        self.dns_ttl_seconds = dns_ttl_seconds or settings.http_dns_ttl_seconds
+        self.keepalive_seconds = keepalive_seconds or settings.http_keepalive_seconds
+        self.timeout_seconds = timeout_seconds or settings.http_timeout_seconds
+        self.logger = logger.bind(component="HTTPClient")
+        
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.session_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Stats
+        self.stats = {
+            "requests": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "connections_created": 0,
+            "connections_reused": 0,
+            "connections_queued": 0,
+            "dns_cache_hits": 0,
+            "dns_cache_misses": 0,
+        }
+    
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        """Trace hooks feeding the pool statistics"""
+        trace = aiohttp.TraceConfig()
+        
+        def count(name: str, delta: int = 1):
+            async def hook(session, context, params):
+                self.stats[name] += delta
+            return hook
+        
+        trace.on_request_start.append(count("requests"))
+        trace.on_request_start.append(count("in_flight"))
+        trace.on_request_end.append(count("in_flight", -1))
+        trace.on_request_exception.append(count("in_flight", -1))
+        trace.on_request_exception.append(count("errors"))
+        trace.on_connection_create_end.append(count("connections_created"))
+        trace.on_connection_reuseconn.append(count("connections_reused"))
+        trace.on_connection_queued_start.append(count("connections_queued"))
+        trace.on_dns_cache_hit.append(count("dns_cache_hits"))
+        trace.on_dns_cache_miss.append(count("dns_cache_misses"))
+        return trace
+    
+    async def get_session(self) -> aiohttp.ClientSession:
+        """Shared session for the running event loop"""
+        loop = asyncio.get_running_loop()
+        
+        if self.session is None or self.session.closed or self.session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_ttl_seconds,
+                keepalive_timeout=self.keepalive_seconds,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds),
+                trace_configs=[self._trace_config()],
+            )
+            self.session_loop = loop
+            self.logger.info(
+                f"Opened HTTP pool (limit={self.limit}, per_host={self.limit_per_host})"
+            )
+        
+        return self.session
+    
+    async def close(self):
+        """Close the session and its pooled connections"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+            self.logger.info("Closed HTTP pool")
+        self.session = None
+        self.session_loop = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        opened = self.stats["connections_created"]
+        reused = self.stats["connections_reused"]
+        
+        return {
+            **self.stats,
+            "open": self.session is not None and not self.session.closed,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "reuse_ratio": reused / (opened + reused) if opened + reused else 0.0,
+        }
+
+
+# ============================================
+# Global Instance
+# ============================================
+
+http_client: Optional[HTTPClient] = None
+
+
+def get_http_client() -> HTTPClient:
+    """Get the process-wide HTTP client"""
+    global http_client
+    if http_client is None:
+        http_client = HTTPClient()
+    return http_client
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """Shorthand for the shared session"""
+    return await get_http_client().get_session()
+
+
+async def close_http_client():
+    """Close the shared session (application shutdown)"""
+    if http_client is not None:
+        await http_client.close()
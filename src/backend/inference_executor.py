@@ -0,0 +1,223 @@
+"""
+Inference Executor for DeFAI Oracle
+Runs CPU-bound model inference off the asyncio event loop
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from loguru import logger
+
+from src.backend.config import settings
+from src.backend.sentiment_analyzer import (
+    SentimentAnalyzer,
+    SentimentResult,
+    get_shared_analyzer,
+)
+from src.backend.cache import CacheManager
+from src.backend.monitoring import get_metrics_collector
+
+
+class InferenceExecutor:
+    """
+    Runs SentimentAnalyzer batches on a dedicated thread pool
+    
+    torch releases the GIL inside its kernels, so worker threads share one
+    loaded model while the event loop keeps serving requests. The number of
+    batches waiting for or running on a worker is capped by `max_pending`;
+    callers beyond that wait their turn instead of growing an unbounded queue.
+    
+    Without an explicit analyzer the process-wide shared analyzer is used;
+    its model is loaded on a worker thread the first time it is needed, or
+    ahead of time via `warmup()`.
+    
+    When a CacheManager is given, memoized results are also shared through
+    Redis so every API worker benefits from texts another worker has scored.
+    """
+    
+    SHARED_KEY_PREFIX = "sentiment:text:"
+    
+    def __init__(
+        self,
+        analyzer: Optional[SentimentAnalyzer] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        shared_cache: Optional[CacheManager] = None,
+    ):
+        self.logger = logger.bind(component="InferenceExecutor")
+        self.analyzer = analyzer
+        self.shared_cache = shared_cache
+        self.max_workers = max(1, max_workers or settings.inference_workers)
+        self.max_pending = max(1, max_pending or settings.inference_max_pending)
+        
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inference",
+        )
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._load_lock = asyncio.Lock()
+        
+        # Stats
+        self.pending = 0
+        self.completed = 0
+        
+        self.logger.info(
+            f"Initialized inference executor "
+            f"(workers: {self.max_workers}, max pending: {self.max_pending})"
+        )
+    
+    @property
+    def ready(self) -> bool:
+        """Whether the analyzer's model is loaded"""
+        return self.analyzer is not None
+    
+    async def get_analyzer(self) -> SentimentAnalyzer:
+        """Get the analyzer, loading the shared model on a worker thread if needed"""
+        if self.analyzer is None:
+            async with self._load_lock:
+                if self.analyzer is None:
+                    loop = asyncio.get_running_loop()
+                    self.analyzer = await loop.run_in_executor(self.executor, get_shared_analyzer)
+        
+        return self.analyzer
+    
+    async def warmup(self):
+        """Load the model ahead of the first request"""
+        try:
+            await self.get_analyzer()
+            self.logger.info("Sentiment model ready")
+        except Exception as e:
+            self.logger.error(f"Error loading sentiment model: {e}")
+    
+    async def analyze_batch(self, texts: List[str]) -> List[SentimentResult]:
+        """Score texts on a worker thread and await the results"""
+        if not texts:
+            return []
+        
+        await self.get_analyzer()
+        
+        if not self.shared_cache:
+            return await self._run(texts)
+        
+        keys = [SentimentAnalyzer.memo_key(text) for text in texts]
+        found, missing = await self._load_shared(keys)
+        
+        # Redis hits skip the analyzer, so each is counted once, as a shared hit
+        pending = [text for text, key in zip(texts, keys) if key not in found]
+        scored = iter(await self._run(pending) if pending else [])
+        results = [found[key] if key in found else next(scored) for key in keys]
+        
+        if missing:
+            await self._store_shared(missing, keys, results)
+        
+        return results
+    
+    async def _run(self, texts: List[str]) -> List[SentimentResult]:
+        """Run the analyzer on a worker thread, bounded by max_pending"""
+        async with self._slots:
+            self.pending += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(
+                    self.executor,
+                    self.analyzer.analyze_batch,
+                    texts,
+                )
+            finally:
+                self.pending -= 1
+                self.completed += 1
+    
+    async def _load_shared(self, keys: List[str]) -> Tuple[Dict[str, SentimentResult], Set[str]]:
+        """
+        Look up memo keys in Redis and seed the analyzer memo with the hits
+        
+        Returns the results found and the keys Redis did not have, so those
+        can be written back after inference. Keys already in the local memo
+        are not looked up.
+        """
+        lookup = [key for key in dict.fromkeys(keys) if key not in self.analyzer.memo]
+        if not lookup:
+            return {}, set()
+        
+        # Already memoized locally; keep them out of the cache's L1
+        values = await self.shared_cache.get_many(
+            [self.SHARED_KEY_PREFIX + key for key in lookup],
+            populate_l1=False,
+        )
+        
+        found: Dict[str, SentimentResult] = {}
+        missing: Set[str] = set()
+        for key, value in zip(lookup, values):
+            if value is None:
+                missing.add(key)
+            else:
+                found[key] = SentimentResult(**value)
+                self.analyzer.memo.set(key, found[key])
+        
+        metrics = get_metrics_collector()
+        if metrics is not None and found:
+            metrics.increment_counter("sentiment_memo_shared_hits", len(found))
+        
+        return found, missing
+    
+    async def _store_shared(
+        self,
+        missing: Set[str],
+        keys: List[str],
+        results: List[SentimentResult],
+    ):
+        """Publish freshly scored results to Redis"""
+        items = {
+            self.SHARED_KEY_PREFIX + key: asdict(result)
+            for key, result in zip(keys, results)
+            if key in missing and result.confidence > 0.0  # Skip inference fallbacks
+        }
+        await self.shared_cache.set_many(items, ttl=settings.sentiment_memo_ttl_seconds)
+    
+    async def analyze_sentiment(self, text: str) -> SentimentResult:
+        """Score a single text on a worker thread"""
+        results = await self.analyze_batch([text])
+        return results[0]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get executor statistics"""
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "completed": self.completed,
+            "model_ready": self.ready,
+            "memo": self.analyzer.memo.get_stats() if self.analyzer else {},
+            "shared_memo": self.shared_cache is not None,
+        }
+    
+    def shutdown(self):
+        """Stop worker threads"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.logger.info("Inference executor shut down")
+
+
+# Global instance
+inference_executor: Optional[InferenceExecutor] = None
+
+
+def get_inference_executor(shared_cache: Optional[CacheManager] = None) -> InferenceExecutor:
+    """Get the process-wide inference executor backed by the shared analyzer"""
+    global inference_executor
+    
+    if inference_executor is None:
+        inference_executor = InferenceExecutor(shared_cache=shared_cache)
+    elif shared_cache is not None:
+        inference_executor.shared_cache = shared_cache
+    
+    return inference_executor
+
+
+def shutdown_inference_executor():
+    """Shutdown the process-wide inference executor"""
+    global inference_executor
+    
+    if inference_executor:
+        inference_executor.shutdown()
+        inference_executor = None
@@ -5,6 +5,7 @@ Real-time sentiment oracle for Base memecoins
 
 import os
 import sys
+import asyncio
 from contextlib import asynccontextmanager
 from typing import Optional
 from fastapi import FastAPI
@@ -22,10 +23,39 @@ logger.add("logs/defai_oracle.log", level=os.getenv("LOG_LEVEL", "INFO"))
 # Import routers and token manager
 from src.backend.api_routes import router as sentiment_router, startup, shutdown
 from src.backend.token_manager import TokenManager
+from src.backend.http_client import close_http_client
+from src.backend.inference_executor import get_inference_executor, shutdown_inference_executor
+from src.backend.sentiment_analyzer import is_model_ready
+from src.backend.monitoring import initialize_monitoring
+from src.backend.cache import initialize_cache, get_cache_manager, shutdown_cache
+from src.backend.config import settings
 
 # Global token manager
 token_manager: Optional[TokenManager] = None
 
+# Background startup work (token fetch, pipeline setup, model load)
+services_task: Optional[asyncio.Task] = None
+model_task: Optional[asyncio.Task] = None
+
+
+async def initialize_services():
+    """Fetch tokens and build the sentiment pipeline without blocking startup"""
+    try:
+        await token_manager.initialize()
+        logger.info(f"Token Manager: {token_manager.get_token_count()} tokens")
+        
+        # Redis shares memoized inference results across API workers;
+        # without it each worker keeps only its local memo
+        await initialize_cache(settings.redis_url)
+        cache_manager = await get_cache_manager()
+        if cache_manager.redis_client is None:
+            cache_manager = None
+        
+        # Initialize sentiment pipeline with dynamic tokens
+        await startup(token_manager, cache_manager)
+    except Exception as e:
+        logger.error(f"Error initializing services: {e}")
+
 # ============================================
 # Lifespan Events
 # ============================================
@@ -35,26 +65,31 @@ async def lifespan(app: FastAPI):
     """
     Manage application startup and shutdown
     """
-    global token_manager
+    global token_manager, services_task, model_task
     
     # Startup
     logger.info("🚀 DeFAI Oracle starting up...")
     logger.info(f"Environment: {os.getenv('DEBUG', 'production')}")
+    initialize_monitoring()
     
-    # Initialize token manager
+    # Token fetching and model loading run in the background so the server
+    # binds and answers health checks immediately; /health reports readiness
     token_manager = TokenManager()
-    await token_manager.initialize()
-    logger.info(f"Token Manager: {token_manager.get_token_count()} tokens")
-    
-    # Initialize sentiment pipeline with dynamic tokens
-    await startup(token_manager)
+    services_task = asyncio.create_task(initialize_services())
+    model_task = asyncio.create_task(get_inference_executor().warmup())
     
     yield
     
     # Shutdown
     logger.info("🛑 DeFAI Oracle shutting down...")
+    for task in (services_task, model_task):
+        if task and not task.done():
+            task.cancel()
     await token_manager.close()
     await shutdown()
+    await shutdown_cache()
+    await close_http_client()
+    shutdown_inference_executor()
 
 
 # ============================================
@@ -88,10 +123,15 @@ app.add_middleware(
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
+    services_ready = services_task is not None and services_task.done()
+    model_ready = is_model_ready()
+    
     return {
         "status": "ok",
         "service": "DeFAI Oracle API",
         "version": os.getenv("API_VERSION", "0.1.0"),
+        "ready": services_ready and model_ready,
+        "model_ready": model_ready,
     }
 
 
@@ -70,11 +70,15 @@ class HealthChecker:
     
     def get_api_health(self) -> Dict[str, Any]:
         """Get API health status"""
+        # Imported here to avoid circular imports
+        from src.backend.sentiment_analyzer import is_model_ready
+        
         return {
             "status": "healthy",
             "timestamp": datetime.now().isoformat(),
             "version": "0.1.0",
             "uptime_seconds": int((datetime.now() - self.start_time).total_seconds()),
+            "model_ready": is_model_ready(),
         }
 
 
@@ -178,6 +182,7 @@ class MetricsCollector:
     def __init__(self):
         self.logger = logger.bind(component="MetricsCollector")
         self.metrics: Dict[str, Any] = {}
+        self.counters: Dict[str, int] = {}
         self.start_time = datetime.now()
     
     def record_metric(self, name: str, value: float, tags: Dict[str, str] = None):
@@ -195,6 +200,14 @@ class MetricsCollector:
         if len(self.metrics[name]) > 1000:
             self.metrics[name] = self.metrics[name][-1000:]
     
+    def increment_counter(self, name: str, value: int = 1):
+        """Increment a monotonic counter"""
+        self.counters[name] = self.counters.get(name, 0) + value
+    
+    def get_counters(self) -> Dict[str, int]:
+        """Get all counters"""
+        return dict(self.counters)
+    
     def get_metric_stats(self, name: str) -> Dict[str, Any]:
         """Get statistics for a metric"""
         if name not in self.metrics or not self.metrics[name]:
@@ -0,0 +1,243 @@
+"""
+Nitter Instance Pool
+Latency/error scoring, circuit breaking and hedged requests across mirrors
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import aiohttp
+from loguru import logger
+
+from src.backend.config import settings
+from src.backend.http_client import get_http_session
+
+
+class NitterInstance:
+    """
+    Health of one Nitter mirror
+    
+    Latency and error rate are exponentially weighted moving averages. After
+    `failure_threshold` consecutive failures the circuit opens and the mirror
+    is skipped until `cooldown_seconds` pass; then a single probe request
+    decides whether it closes again.
+    """
+    
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+    
+    def __init__(self, url: str, alpha: float, failure_threshold: int, cooldown_seconds: float):
+        self.url = url.rstrip("/")
+        self.alpha = alpha
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        
+        self.latency: Optional[float] = None  # seconds, None until the first success
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probing = False
+        
+        # Stats
+        self.requests = 0
+        self.failures = 0
+    
+    def state(self, now: float) -> str:
+        if self.opened_at is None:
+            return self.CLOSED
+        if now - self.opened_at >= self.cooldown_seconds:
+            return self.HALF_OPEN
+        return self.OPEN
+    
+    def available(self, now: float) -> bool:
+        """Whether a request may be routed here"""
+        state = self.state(now)
+        return state == self.CLOSED or (state == self.HALF_OPEN and not self.probing)
+    
+    def score(self) -> float:
+        """Expected cost of a request; lower is better, untried mirrors first"""
+        if self.latency is None:
+            return 0.0
+        return self.latency * (1 + 4 * self.error_rate)
+    
+    def begin(self, now: float):
+        self.requests += 1
+        if self.state(now) == self.HALF_OPEN:
+            self.probing = True
+    
+    def cancel(self):
+        """A hedged request lost the race; it says nothing about health"""
+        self.probing = False
+    
+    def record_success(self, latency: float):
+        self.latency = latency if self.latency is None else self.latency + self.alpha * (latency - self.latency)
+        self.error_rate -= self.alpha * self.error_rate
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self.probing = False
+    
+    def record_failure(self, now: float):
+        self.failures += 1
+        self.error_rate += self.alpha * (1 - self.error_rate)
+        self.consecutive_failures += 1
+        if self.probing or self.consecutive_failures >= self.failure_threshold:
+            self.opened_at = now
+        self.probing = False
+    
+    def get_stats(self, now: float) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "state": self.state(now),
+            "latency_ms": round(self.latency * 1000, 1) if self.latency is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "requests": self.requests,
+            "failures": self.failures,
+        }
+
+
+class NitterPool:
+    """
+    Routes requests to the fastest healthy Nitter mirrors
+    
+    A request goes to the best-scoring mirror. If it has not answered within
+    `hedge_delay` a second request is raced against it on the next mirror,
+    and the first good response wins. Failed requests fail over to the next
+    mirror, up to `max_attempts` mirrors per request.
+    """
+    
+    def __init__(
+        self,
+        instances: Optional[List[str]] = None,
+        hedge_delay: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_attempts: int = 3,
+        failure_threshold: Optional[int] = None,
+        cooldown_seconds: Optional[float] = None,
+        alpha: float = 0.3,
+    ):
+        self.instances = [
+            NitterInstance(
+                url,
+                alpha=alpha,
+                failure_threshold=failure_threshold or settings.nitter_failure_threshold,
+                cooldown_seconds=cooldown_seconds or settings.nitter_cooldown_seconds,
+            )
+            for url in (instances or settings.nitter_instances)
+        ]
+        self.hedge_delay = hedge_delay or settings.nitter_hedge_delay_seconds
+        self.timeout = aiohttp.ClientTimeout(total=timeout or settings.nitter_timeout_seconds)
+        self.max_attempts = max_attempts
+        self.logger = logger.bind(component="NitterPool")
+        
+        # Stats
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+        self.exhausted = 0
+    
+    def ranked(self) -> List[NitterInstance]:
+        """Available mirrors, best first"""
+        now = time.monotonic()
+        return sorted(
+            (instance for instance in self.instances if instance.available(now)),
+            key=NitterInstance.score,
+        )
+    
+    async def _attempt(
+        self,
+        instance: NitterInstance,
+        path: str,
+        headers: Optional[Dict[str, str]],
+    ) -> Optional[str]:
+        """One request to one mirror; returns the body or None on failure"""
+        instance.begin(time.monotonic())
+        session = await get_http_session()
+        start = time.monotonic()
+        
+        try:
+            async with session.get(instance.url + path, headers=headers, timeout=self.timeout) as response:
+                if response.status == 200:
+                    body = await response.text()
+                    instance.record_success(time.monotonic() - start)
+                    return body
+                self.logger.warning(f"{instance.url} returned status {response.status}")
+        except asyncio.CancelledError:
+            instance.cancel()
+            raise
+        except Exception as e:
+            self.logger.warning(f"{instance.url} failed: {e!r}")
+        
+        instance.record_failure(time.monotonic())
+        return None
+    
+    async def fetch(self, path: str, headers: Optional[Dict[str, str]] = None) -> Optional[Tuple[str, str]]:
+        """
+        GET `path` from the pool
+        
+        Returns (instance url, body), or None when no mirror answered.
+        """
+        candidates = self.ranked()[:self.max_attempts]
+        if not candidates:
+            self.exhausted += 1
+            self.logger.warning("All Nitter instances are circuit-broken")
+            return None
+        
+        pending: Dict[asyncio.Task, NitterInstance] = {}
+        launched = 0
+        hedged = False
+        
+        def launch():
+            nonlocal launched
+            instance = candidates[launched]
+            pending[asyncio.create_task(self._attempt(instance, path, headers))] = instance
+            launched += 1
+        
+        launch()
+        try:
+            while pending:
+                can_hedge = len(pending) == 1 and launched < len(candidates)
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=self.hedge_delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                
+                if not done:
+                    self.hedged += 1
+                    hedged = True
+                    launch()
+                    continue
+                
+                for task in done:
+                    instance = pending.pop(task)
+                    body = task.result()
+                    if body is not None:
+                        if hedged and instance is not candidates[0]:
+                            self.hedge_wins += 1
+                        return instance.url, body
+                
+                if not pending and launched < len(candidates):
+                    self.failovers += 1
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        self.exhausted += 1
+        return None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics"""
+        now = time.monotonic()
+        return {
+            "instances": [instance.get_stats(now) for instance in self.instances],
+            "healthy": sum(instance.available(now) for instance in self.instances),
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "exhausted": self.exhausted,
+        }
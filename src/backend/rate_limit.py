@@ -3,13 +3,16 @@ Rate Limiting for DeFAI Oracle API
 Protects API from abuse and ensures fair usage
 """
 
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterable, Mapping, Optional, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 from fastapi import Request, HTTPException
 from functools import wraps
+import asyncio
 import time
 
+from src.backend.config import settings
+
 
 class RateLimiter:
     """Simple in-memory rate limiter"""
@@ -82,6 +85,107 @@ class RateLimiter:
         return True, stats
 
 
+# Upstream rate-limit headers (Twitter uses x-rate-limit-*, IETF draft ratelimit-*)
+REMAINING_HEADERS = ("x-rate-limit-remaining", "x-ratelimit-remaining", "ratelimit-remaining")
+RESET_HEADERS = ("x-rate-limit-reset", "x-ratelimit-reset", "ratelimit-reset")
+
+
+def _header_number(headers: Mapping[str, str], names: Iterable[str]) -> Optional[float]:
+    """First parseable numeric header among `names`"""
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except ValueError:
+            continue
+    return None
+
+
+def reset_seconds(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds until the upstream window resets (epoch or delta headers)"""
+    reset = _header_number(headers, RESET_HEADERS)
+    if reset is None:
+        return None
+    if reset > 1e9:  # Epoch timestamp rather than a delta
+        reset -= time.time()
+    return max(reset, 0.0)
+
+
+def retry_after_seconds(headers: Mapping[str, str], default: float) -> float:
+    """How long to defer a request that was answered with 429"""
+    retry_after = _header_number(headers, ("retry-after",))
+    if retry_after is not None:
+        return max(retry_after, 0.0)
+    
+    reset = reset_seconds(headers)
+    return reset if reset is not None else default
+
+
+class TokenBucket:
+    """
+    Async token bucket for outbound request budgets
+    
+    Holds up to `capacity` tokens and refills at `rate` tokens per second.
+    `acquire` waits until enough tokens are available instead of failing.
+    Upstream rate-limit headers can lower the available tokens and pause
+    the bucket until the upstream window resets.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.resume_at = 0.0  # Monotonic time the upstream window reopens
+        self._lock = asyncio.Lock()
+    
+    def _refill(self):
+        """Add tokens accrued since the last update"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    async def acquire(self, tokens: float = 1.0):
+        """Wait until `tokens` are available, then take them"""
+        async with self._lock:
+            while True:
+                paused_for = self.resume_at - time.monotonic()
+                if paused_for > 0:
+                    await asyncio.sleep(paused_for)
+                    continue
+                
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self.tokens) / self.rate)
+    
+    def update_from_headers(self, headers: Mapping[str, str]):
+        """Follow the budget the upstream API reports in its response headers"""
+        remaining = _header_number(headers, REMAINING_HEADERS)
+        if remaining is None:
+            return
+        
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+        
+        reset = reset_seconds(headers)
+        if remaining < 1 and reset:
+            self.resume_at = max(self.resume_at, time.monotonic() + reset)
+    
+    def get_stats(self) -> Dict[str, float]:
+        """Get bucket statistics"""
+        self._refill()
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "available": self.tokens,
+            "paused_seconds": max(self.resume_at - time.monotonic(), 0.0),
+        }
+
+
 class APIKeyManager:
     """Manages API keys and authentication"""
     
@@ -179,6 +283,7 @@ class RateLimitMiddleware:
 # Global instances
 rate_limiter: Optional[RateLimiter] = None
 api_key_manager: Optional[APIKeyManager] = None
+host_budgets: Dict[str, TokenBucket] = {}
 
 
 def initialize_rate_limiting():
@@ -201,6 +306,17 @@ def get_api_key_manager() -> APIKeyManager:
     return api_key_manager
 
 
+def get_host_budget(host: str) -> TokenBucket:
+    """Get the shared outbound request budget for a host"""
+    if host not in host_budgets:
+        host_budgets[host] = TokenBucket(
+            rate=settings.scrape_requests_per_second,
+            capacity=settings.scrape_burst,
+        )
+    
+    return host_budgets[host]
+
+
 def rate_limit(max_requests: int = 100, window_seconds: int = 60):
     """Decorator for rate limiting endpoints"""
     def decorator(func):
@@ -3,11 +3,18 @@ Sentiment Analysis Module for DeFAI Oracle
 Fine-tuned LLM-based sentiment classification
 """
 
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional, Union
 from dataclasses import dataclass
 from loguru import logger
-import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+import hashlib
+import os
+import re
+import threading
+import numpy as np
+
+from src.backend.config import settings
+from src.backend.cache import TTLCache
+from src.backend.monitoring import get_metrics_collector
 
 
 # ============================================
@@ -34,80 +41,295 @@ class AccountMetrics:
     is_bot: bool = False
 
 
+# ============================================
+# Tokenization Helpers
+# ============================================
+
+def bucket_by_length(lengths: List[int], batch_size: int) -> List[List[int]]:
+    """
+    Group indices into batches of similar length
+    
+    Indices are sorted by length and cut into consecutive batches, so each
+    batch pads only to its own longest member instead of the corpus maximum.
+    """
+    order = sorted(range(len(lengths)), key=lengths.__getitem__)
+    return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+
 # ============================================
 # Sentiment Analyzer
 # ============================================
 
 class SentimentAnalyzer:
-    """Fine-tuned sentiment analysis using transformers"""
+    """
+    Fine-tuned sentiment analysis using transformers
     
-    def __init__(self, model_name: str = "distilbert-base-uncased", device: str = "cpu"):
+    Inference backends (settings.sentiment_backend):
+    - "torch": eager fp32 AutoModelForSequenceClassification
+    - "quantized": the same model with dynamic int8 quantization of Linear layers
+    - "onnx": an exported ONNX graph run by an ONNX Runtime CPU session
+    """
+    
+    SENTIMENT_MAP = {0: "bearish", 1: "neutral", 2: "bullish"}
+    BACKENDS = ("torch", "quantized", "onnx")
+    
+    def __init__(
+        self,
+        model_name: str = "distilbert-base-uncased",
+        device: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        backend: Optional[str] = None,
+    ):
         self.logger = logger.bind(component="SentimentAnalyzer")
-        self.device = device
+        self.device = device or settings.device
         self.model_name = model_name
+        self.batch_size = max(1, batch_size or settings.batch_size)
+        self.max_length = settings.sentiment_max_length
+        self.backend = (backend or settings.sentiment_backend).lower()
+        self.onnx_session = None
         
-        self.logger.info(f"Loading model: {model_name} on device: {device}")
+        if self.backend not in self.BACKENDS:
+            raise ValueError(f"Unknown sentiment backend: {self.backend}")
+        
+        if self.backend != "torch" and self.device != "cpu":
+            self.logger.warning(f"Backend {self.backend} is CPU-only, falling back to torch on {self.device}")
+            self.backend = "torch"
+        
+        # Memoized results keyed by normalized text hash
+        self.memo = TTLCache(
+            max_size=settings.sentiment_memo_size,
+            ttl_seconds=settings.sentiment_memo_ttl_seconds,
+        )
+        
+        # Tokens fed to the model vs. tokens that were padding
+        self.token_stats = {"real_tokens": 0, "padded_tokens": 0}
+        
+        self.logger.info(f"Loading model: {model_name} on device: {self.device} (backend: {self.backend})")
         
         try:
+            # Heavy imports are deferred so importing this module stays cheap
+            import torch
+            from transformers import AutoTokenizer, AutoModelForSequenceClassification
+            
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
             self.model = AutoModelForSequenceClassification.from_pretrained(
                 model_name,
                 num_labels=3  # bearish, neutral, bullish
             )
-            self.model.to(device)
+            self.model.to(self.device)
             self.model.eval()
+            
+            if self.backend == "quantized":
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model,
+                    {torch.nn.Linear},
+                    dtype=torch.qint8,
+                )
+            elif self.backend == "onnx":
+                self.onnx_session = self._load_onnx_session()
+                self.model = None  # Weights now live in the ONNX session
+            
             self.logger.info("Model loaded successfully")
         except Exception as e:
             self.logger.error(f"Error loading model: {e}")
             raise
     
+    def _onnx_path(self) -> str:
+        """Location of the exported ONNX graph for this model"""
+        safe_name = self.model_name.replace("/", "__")
+        return os.path.join(settings.sentiment_model_path, "onnx", f"{safe_name}.onnx")
+    
+    def _load_onnx_session(self):
+        """Export the model to ONNX if needed and open a CPU session"""
+        import torch
+        
+        try:
+            import onnxruntime
+        except ImportError:
+            raise ImportError("onnxruntime is required for the onnx sentiment backend")
+        
+        path = self._onnx_path()
+        
+        if not os.path.exists(path):
+            self.logger.info(f"Exporting {self.model_name} to ONNX: {path}")
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            
+            sample = self.tokenizer(["export sample"], return_tensors="pt")
+            torch.onnx.export(
+                self.model,
+                (sample["input_ids"], sample["attention_mask"]),
+                path,
+                input_names=["input_ids", "attention_mask"],
+                output_names=["logits"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "logits": {0: "batch"},
+                },
+                opset_version=14,
+            )
+        
+        return onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+    
     def analyze_sentiment(self, text: str) -> SentimentResult:
         """
         Classify sentiment as bullish/neutral/bearish
         """
+        return self.analyze_batch([text])[0]
+    
+    def analyze_batch(self, texts: List[str]) -> List[SentimentResult]:
+        """
+        Classify sentiment for many texts at once
+        
+        Texts already seen (after normalization) are served from the memo
+        cache. The remaining unique texts are tokenized together, truncated
+        to `max_length`, grouped by length into batches of `batch_size` and
+        run through the model one padded batch at a time. Results are
+        returned in input order.
+        """
+        keys = [self.memo_key(text) for text in texts]
+        results: Dict[str, SentimentResult] = {}
+        pending: Dict[str, str] = {}
+        
+        for key, text in zip(keys, texts):
+            if key in results or key in pending:
+                continue
+            cached = self.memo.get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = text
+        
+        self._record_memo_metrics(hits=len(results), misses=len(pending))
+        
+        if pending:
+            pending_keys = list(pending)
+            probabilities = self._analyze_texts([pending[key] for key in pending_keys])
+            
+            for key, row in zip(pending_keys, probabilities):
+                if row is None:
+                    results[key] = self._neutral_result()
+                    continue
+                
+                result = self._build_result(row)
+                self.memo.set(key, result)
+                results[key] = result
+        
+        return [results[key] for key in keys]
+    
+    @staticmethod
+    def memo_key(text: str) -> str:
+        """Hash of text normalized for case and whitespace"""
+        normalized = re.sub(r"\s+", " ", text).strip().lower()
+        return hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+    
+    def _record_memo_metrics(self, hits: int, misses: int):
+        """Report memo cache hits and misses to the metrics collector"""
+        metrics = get_metrics_collector()
+        if metrics is None:
+            return
+        
+        if hits:
+            metrics.increment_counter("sentiment_memo_hits", hits)
+        if misses:
+            metrics.increment_counter("sentiment_memo_misses", misses)
+    
+    def _analyze_texts(self, texts: List[str]) -> List[Optional[List[float]]]:
+        """
+        Tokenize, length-bucket and score texts
+        
+        Returns class probabilities per text in input order, or None for
+        texts whose batch failed.
+        """
+        probabilities: List[Optional[List[float]]] = [None] * len(texts)
+        
         try:
-            # Tokenize
-            inputs = self.tokenizer(
-                text,
-                return_tensors="pt",
+            # Tokenize everything in one fast-tokenizer call, without padding
+            encodings = self.tokenizer(
+                texts,
                 truncation=True,
-                max_length=512
-            ).to(self.device)
-            
-            # Inference
-            with torch.no_grad():
-                outputs = self.model(**inputs)
-                logits = outputs.logits
-                probabilities = torch.softmax(logits, dim=1)
-            
-            # Parse results
-            sentiment_map = {0: "bearish", 1: "neutral", 2: "bullish"}
-            sentiment_idx = torch.argmax(probabilities, dim=1).item()
-            confidence = probabilities[0][sentiment_idx].item()
-            
-            scores = {
-                "bearish": probabilities[0][0].item(),
-                "neutral": probabilities[0][1].item(),
-                "bullish": probabilities[0][2].item(),
-            }
-            
-            return SentimentResult(
-                sentiment=sentiment_map[sentiment_idx],
-                confidence=confidence,
-                scores=scores,
-                intensity="moderate",  # Will be calculated separately
-                credibility_weight=1.0,  # Will be weighted by account credibility
+                max_length=self.max_length,
             )
-        
         except Exception as e:
-            self.logger.error(f"Error analyzing sentiment: {e}")
-            return SentimentResult(
-                sentiment="neutral",
-                confidence=0.0,
-                scores={"bearish": 0.33, "neutral": 0.34, "bullish": 0.33},
-                intensity="weak",
-                credibility_weight=0.0,
+            self.logger.error(f"Error tokenizing {len(texts)} texts: {e}")
+            return probabilities
+        
+        input_ids = encodings["input_ids"]
+        attention_mask = encodings["attention_mask"]
+        lengths = [len(ids) for ids in input_ids]
+        
+        for bucket in bucket_by_length(lengths, self.batch_size):
+            try:
+                inputs = self.tokenizer.pad(
+                    {
+                        "input_ids": [input_ids[i] for i in bucket],
+                        "attention_mask": [attention_mask[i] for i in bucket],
+                    },
+                    return_tensors="np" if self.onnx_session else "pt",
+                )
+                
+                real = sum(lengths[i] for i in bucket)
+                self.token_stats["real_tokens"] += real
+                self.token_stats["padded_tokens"] += max(lengths[i] for i in bucket) * len(bucket) - real
+                
+                for i, row in zip(bucket, self._predict_probabilities(inputs)):
+                    probabilities[i] = row
+            
+            except Exception as e:
+                self.logger.error(f"Error analyzing sentiment batch of {len(bucket)}: {e}")
+        
+        return probabilities
+    
+    def _predict_probabilities(self, inputs) -> List[List[float]]:
+        """Run the configured backend and return class probabilities per text"""
+        if self.onnx_session is not None:
+            (logits,) = self.onnx_session.run(
+                ["logits"],
+                {
+                    "input_ids": inputs["input_ids"].astype(np.int64),
+                    "attention_mask": inputs["attention_mask"].astype(np.int64),
+                },
             )
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            return (exp / exp.sum(axis=1, keepdims=True)).tolist()
+        
+        import torch
+        
+        inputs = inputs.to(self.device)
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            logits = outputs.logits
+            probabilities = torch.softmax(logits, dim=1)
+        
+        return probabilities.tolist()
+    
+    def _build_result(self, probabilities: List[float]) -> SentimentResult:
+        """Build a SentimentResult from one row of class probabilities"""
+        sentiment_idx = max(range(len(probabilities)), key=probabilities.__getitem__)
+        
+        scores = {
+            "bearish": probabilities[0],
+            "neutral": probabilities[1],
+            "bullish": probabilities[2],
+        }
+        
+        return SentimentResult(
+            sentiment=self.SENTIMENT_MAP[sentiment_idx],
+            confidence=probabilities[sentiment_idx],
+            scores=scores,
+            intensity="moderate",  # Will be calculated separately
+            credibility_weight=1.0,  # Will be weighted by account credibility
+        )
+    
+    def _neutral_result(self) -> SentimentResult:
+        """Fallback result used when inference fails"""
+        return SentimentResult(
+            sentiment="neutral",
+            confidence=0.0,
+            scores={"bearish": 0.33, "neutral": 0.34, "bullish": 0.33},
+            intensity="weak",
+            credibility_weight=0.0,
+        )
     
     def calculate_intensity(self, text: str, sentiment_result: SentimentResult) -> str:
         """
@@ -194,6 +416,36 @@ class SentimentAnalyzer:
         return min(max(final, 0), 100)
 
 
+# ============================================
+# Shared Analyzer
+# ============================================
+
+_shared_analyzer: Optional[SentimentAnalyzer] = None
+_shared_analyzer_lock = threading.Lock()
+
+
+def get_shared_analyzer() -> SentimentAnalyzer:
+    """
+    Get the process-wide analyzer, loading the model on first use
+    
+    Loading is blocking; async callers should go through InferenceExecutor,
+    which loads it on a worker thread.
+    """
+    global _shared_analyzer
+    
+    if _shared_analyzer is None:
+        with _shared_analyzer_lock:
+            if _shared_analyzer is None:
+                _shared_analyzer = SentimentAnalyzer(model_name=settings.sentiment_model_name)
+    
+    return _shared_analyzer
+
+
+def is_model_ready() -> bool:
+    """Check whether the shared model has finished loading"""
+    return _shared_analyzer is not None
+
+
 # ============================================
 # Multi-Timeframe Aggregator
 # ============================================
@@ -201,67 +453,120 @@ class SentimentAnalyzer:
 class SentimentAggregator:
     """Aggregate sentiment scores across timeframes"""
     
+    TIMEFRAMES = [
+        (5, "5m"),      # 5 minutes
+        (60, "1h"),     # 1 hour
+        (240, "4h"),    # 4 hours
+        (1440, "24h"),  # 24 hours
+    ]
+    
     def __init__(self):
         self.logger = logger.bind(component="SentimentAggregator")
-        self.timeframes = [
-            (5, "5m"),      # 5 minutes
-            (60, "1h"),     # 1 hour
-            (240, "4h"),    # 4 hours
-            (1440, "24h"),  # 24 hours
-        ]
+        self.timeframes = list(self.TIMEFRAMES)
     
     def aggregate_scores(self, scores: List[float]) -> Dict[str, float]:
         """
         Aggregate sentiment scores
         """
-        if not scores:
+        if not len(scores):
             return {"mean": 50, "median": 50, "std": 0}
         
-        import statistics
-        
-        return {
-            "mean": statistics.mean(scores),
-            "median": statistics.median(scores),
-            "std": statistics.stdev(scores) if len(scores) > 1 else 0,
-            "min": min(scores),
-            "max": max(scores),
-        }
+        summary = self.summarize(scores)
+        return {key: summary[key] for key in ("mean", "median", "std", "min", "max")}
     
     def detect_outliers(self, scores: List[float]) -> List[int]:
         """
         Detect outlier scores using IQR method
         """
-        if len(scores) < 4:
-            return []
-        
-        sorted_scores = sorted(scores)
-        q1 = sorted_scores[len(scores) // 4]
-        q3 = sorted_scores[3 * len(scores) // 4]
-        iqr = q3 - q1
-        
-        outliers = []
-        for i, score in enumerate(scores):
-            if score < q1 - 1.5 * iqr or score > q3 + 1.5 * iqr:
-                outliers.append(i)
-        
-        return outliers
+        return self.summarize(scores)["outliers"]
     
     def calculate_trend(self, scores: List[float]) -> str:
         """
         Calculate if sentiment is trending up or down
         """
-        if len(scores) < 2:
-            return "neutral"
+        return self.summarize(scores)["trend"]
+    
+    def summarize(self, scores: List[float]) -> Dict[str, Any]:
+        """
+        Mean, median, std, min, max, IQR outliers and trend for one series
+        """
+        return self.aggregate_batch([scores])[0]
+    
+    def aggregate_batch(self, rows: Union[np.ndarray, List[List[float]]]) -> List[Dict[str, Any]]:
+        """
+        Summarize a tokens x samples batch in one vectorized pass
         
-        first_half_avg = sum(scores[:len(scores)//2]) / (len(scores)//2)
-        second_half_avg = sum(scores[len(scores)//2:]) / (len(scores) - len(scores)//2)
+        Rows may be ragged lists or a 2-D array padded with NaN. Quartiles
+        use the same sorted-index positions as the scalar IQR rule.
+        """
+        values = self._as_matrix(rows)
+        valid = ~np.isnan(values)
+        counts = valid.sum(axis=1)
+        rows_idx = np.arange(values.shape[0])
+        last = np.maximum(counts - 1, 0)
         
-        if second_half_avg > first_half_avg * 1.1:
-            return "bullish"
-        elif second_half_avg < first_half_avg * 0.9:
-            return "bearish"
-        else:
-            return "neutral"
+        # NaN padding sorts to the end of each row
+        ordered = np.sort(values, axis=1)
+        filled = np.where(valid, values, 0.0)
+        totals = filled.sum(axis=1)
+        
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = np.where(counts > 0, totals / counts, 50.0)
+            medians = np.where(
+                counts > 0,
+                (ordered[rows_idx, last // 2] + ordered[rows_idx, counts // 2]) / 2,
+                50.0,
+            )
+            squared = np.where(valid, (values - means[:, None]) ** 2, 0.0).sum(axis=1)
+            stds = np.where(counts > 1, np.sqrt(squared / np.maximum(counts - 1, 1)), 0.0)
+            
+            # IQR outliers (rows with fewer than 4 samples have none)
+            q1 = ordered[rows_idx, np.minimum(counts // 4, last)]
+            q3 = ordered[rows_idx, np.minimum(3 * counts // 4, last)]
+            iqr = q3 - q1
+            outlier_mask = (
+                valid
+                & (counts >= 4)[:, None]
+                & ((values < (q1 - 1.5 * iqr)[:, None]) | (values > (q3 + 1.5 * iqr)[:, None]))
+            )
+            
+            # Trend: second-half average against first-half average
+            halves = counts // 2
+            cumulative = np.cumsum(filled, axis=1)
+            first_sums = np.where(halves > 0, cumulative[rows_idx, np.maximum(halves - 1, 0)], 0.0)
+            first_avgs = first_sums / np.maximum(halves, 1)
+            second_avgs = (totals - first_sums) / np.maximum(counts - halves, 1)
+        
+        rising = (counts >= 2) & (second_avgs > first_avgs * 1.1)
+        falling = (counts >= 2) & (second_avgs < first_avgs * 0.9)
+        
+        summaries = []
+        for i in range(values.shape[0]):
+            n = int(counts[i])
+            summaries.append({
+                "count": n,
+                "mean": float(means[i]),
+                "median": float(medians[i]),
+                "std": float(stds[i]),
+                "min": float(ordered[i, 0]) if n else 50.0,
+                "max": float(ordered[i, last[i]]) if n else 50.0,
+                "outliers": np.flatnonzero(outlier_mask[i]).tolist(),
+                "trend": "bullish" if rising[i] else "bearish" if falling[i] else "neutral",
+            })
+        
+        return summaries
+    
+    @staticmethod
+    def _as_matrix(rows: Union[np.ndarray, List[List[float]]]) -> np.ndarray:
+        """Pack rows into a float matrix, padding short rows with NaN"""
+        if isinstance(rows, np.ndarray) and rows.ndim == 2 and rows.shape[1]:
+            return rows.astype(float, copy=False)
+        
+        width = max((len(row) for row in rows), default=0)
+        values = np.full((len(rows), max(width, 1)), np.nan)
+        for i, row in enumerate(rows):
+            values[i, :len(row)] = row
+        return values
 
 
 # ============================================
@@ -5,15 +5,24 @@ End-to-end: Scrape → Analyze → Aggregate → Store
 """
 
 import asyncio
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, AsyncIterator, Awaitable, Callable, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from loguru import logger
 import json
-from collections import defaultdict
+from collections import OrderedDict, defaultdict, deque
+import numpy as np
 
-from src.backend.twitter_scraper_v2 import TwitterScraperV2, ScrapedTweet
-from src.backend.sentiment_analyzer import SentimentAnalyzer, SentimentResult
+from src.backend.http_client import close_http_client
+from src.backend.twitter_scraper_v2 import TwitterScraperV2, ScrapedTweet, id_after
+from src.backend.sentiment_analyzer import SentimentResult, SentimentAggregator
+from src.backend.inference_executor import get_inference_executor
+from src.backend.cache import CacheManager
+from src.backend.rate_limit import get_host_budget
+from src.backend.history_store import SentimentSeries, LABELS, TRENDS, record_to_dict
+from src.backend.history_log import HistoryLog
+from src.backend.dedup import NearDuplicateDetector
+from src.backend.config import settings
 from src.backend.data_pipeline_v2 import UpdatedDataPipeline, RawPost
 
 
@@ -62,31 +71,330 @@ class TokenSentiment:
             "trend": self.trend,
             "trend_strength": self.trend_strength,
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TokenSentiment":
+        """Rebuild a sentiment from its to_dict() form"""
+        return cls(**{**data, "timestamp": datetime.fromisoformat(data["timestamp"])})
+
+
+# ============================================
+# Aggregation
+# ============================================
+
+# Lower bound of each label's band on the 0-100 scale; a post scores
+# offset + confidence * 33 (bearish 0-33, neutral 34-66, bullish 67-100)
+BULLISH_OFFSET = 67.0
+NEUTRAL_OFFSET = 34.0
+BAND_WIDTH = 33.0
+
+
+def aggregate_posts(sentiments: List[SentimentResult], tweets: List[ScrapedTweet]) -> Dict[str, Any]:
+    """
+    Aggregate per-post inference results and engagement in a single pass
+    
+    Returns the TokenSentiment fields derived from the posts. The average
+    score only needs the label counts and the confidence sum, since each
+    post's score is its band offset plus a confidence-scaled width.
+    """
+    bullish_count = neutral_count = bearish_count = 0
+    confidence_sum = 0.0
+    likes = retweets = replies = 0
+    
+    # analyze_batch returns one result per post, in post order
+    for s, tweet in zip(sentiments, tweets):
+        label = s.sentiment
+        if label == "bullish":
+            bullish_count += 1
+        elif label == "bearish":
+            bearish_count += 1
+        elif label == "neutral":
+            neutral_count += 1
+        confidence_sum += s.confidence
+        likes += tweet.likes
+        retweets += tweet.retweets
+        replies += tweet.replies
+    
+    return summarize_counts(
+        len(sentiments), bullish_count, neutral_count, bearish_count, confidence_sum,
+        len(tweets), likes, retweets, replies,
+    )
+
+
+def summarize_counts(
+    analyzed: int,
+    bullish_count: int,
+    neutral_count: int,
+    bearish_count: int,
+    confidence_sum: float,
+    posts: int,
+    likes: float,
+    retweets: float,
+    replies: float,
+) -> Dict[str, Any]:
+    """TokenSentiment fields from label counts and running sums"""
+    if analyzed:
+        # Anything not bullish or bearish scores in the neutral band
+        other_count = analyzed - bullish_count - bearish_count
+        offset_sum = BULLISH_OFFSET * bullish_count + NEUTRAL_OFFSET * other_count
+        sentiment_score = (offset_sum + BAND_WIDTH * confidence_sum) / analyzed
+        confidence = confidence_sum / analyzed
+    else:
+        sentiment_score = 50.0
+        confidence = 0.0
+    
+    # Determine sentiment label
+    if bullish_count > neutral_count + bearish_count:
+        sentiment_label = "bullish"
+    elif bearish_count > neutral_count + bullish_count:
+        sentiment_label = "bearish"
+    else:
+        sentiment_label = "neutral"
+    
+    return {
+        "sentiment_score": sentiment_score,
+        "sentiment_label": sentiment_label,
+        "confidence": confidence,
+        "bullish_count": bullish_count,
+        "neutral_count": neutral_count,
+        "bearish_count": bearish_count,
+        "avg_likes": likes / posts if posts else 0,
+        "avg_retweets": retweets / posts if posts else 0,
+        "avg_replies": replies / posts if posts else 0,
+    }
+
+
+class TokenFeed:
+    """
+    Incremental scrape state and running aggregate for one token
+    
+    Tracks the newest post ID and timestamp scored (the next scrape starts
+    after them) and a bounded set of post keys already scored, so each cycle
+    only runs inference on new posts. The aggregate covers the most recent
+    `window_posts` scored posts and is updated by adding new posts and
+    evicting the oldest, never recomputed from scratch.
+    """
+    
+    def __init__(self, window_posts: Optional[int] = None, seen_capacity: Optional[int] = None):
+        self.window_posts = window_posts or settings.sentiment_window_posts
+        self.seen_capacity = seen_capacity or settings.seen_posts_per_token
+        
+        self.since_id: Optional[str] = None
+        self.newest: Optional[datetime] = None
+        self.seen: "OrderedDict[str, None]" = OrderedDict()
+        
+        # Per token: a post mentioning several tokens counts towards each
+        self.dedup = NearDuplicateDetector()
+        
+        # Held from scrape to commit so concurrent analyses don't score a post twice
+        self.lock = asyncio.Lock()
+        
+        # (label, confidence, likes, retweets, replies), oldest first
+        self.posts: deque = deque()
+        self.counts = {"bullish": 0, "neutral": 0, "bearish": 0}
+        self.confidence_sum = 0.0
+        self.likes = 0
+        self.retweets = 0
+        self.replies = 0
+    
+    def __len__(self) -> int:
+        return len(self.posts)
+    
+    @staticmethod
+    def post_key(tweet: ScrapedTweet) -> str:
+        return tweet.tweet_id or tweet.url or f"{tweet.author}:{tweet.text}"
+    
+    def unseen(self, tweets: List[ScrapedTweet]) -> List[ScrapedTweet]:
+        """Posts not scored yet (and not repeated within this batch)"""
+        fresh = []
+        keys = set()
+        for tweet in tweets:
+            key = self.post_key(tweet)
+            if key in self.seen or key in keys:
+                continue
+            keys.add(key)
+            fresh.append(tweet)
+        return fresh
+    
+    def commit(self, tweets: List[ScrapedTweet]):
+        """Remember scored posts and advance the high-water mark past them"""
+        for tweet in tweets:
+            self.seen[self.post_key(tweet)] = None
+            
+            if tweet.tweet_id and id_after(tweet.tweet_id, self.since_id):
+                self.since_id = tweet.tweet_id
+            if self.newest is None or tweet.created_at > self.newest:
+                self.newest = tweet.created_at
+        
+        while len(self.seen) > self.seen_capacity:
+            self.seen.popitem(last=False)
+    
+    def add(self, sentiments: List[SentimentResult], tweets: List[ScrapedTweet]):
+        """Fold newly scored posts into the aggregate, evicting the oldest"""
+        for s, tweet in zip(sentiments, tweets):
+            self.add_post(s.sentiment, s.confidence, tweet.likes, tweet.retweets, tweet.replies)
+    
+    def add_post(self, label: str, confidence: float, likes: int = 0, retweets: int = 0, replies: int = 0):
+        """Fold one scored post into the aggregate, evicting the oldest"""
+        post = (label, confidence, likes, retweets, replies)
+        self.posts.append(post)
+        self._apply(post, 1)
+        if len(self.posts) > self.window_posts:
+            self._apply(self.posts.popleft(), -1)
+    
+    def _apply(self, post: tuple, sign: int):
+        label, confidence, likes, retweets, replies = post
+        if label in self.counts:
+            self.counts[label] += sign
+        self.confidence_sum += sign * confidence
+        self.likes += sign * likes
+        self.retweets += sign * retweets
+        self.replies += sign * replies
+    
+    def aggregate(self) -> Dict[str, Any]:
+        """TokenSentiment fields for the posts in the window"""
+        posts = len(self.posts)
+        return summarize_counts(
+            posts, self.counts["bullish"], self.counts["neutral"], self.counts["bearish"],
+            max(self.confidence_sum, 0.0), posts, self.likes, self.retweets, self.replies,
+        )
+
+
+class RollingWindow:
+    """
+    Sliding time window over sentiment scores in fixed-width buckets
+    
+    A ring of `minutes * 60 / bucket_seconds` slots holds each bucket's
+    score sum, sample count and first and last score, so memory is fixed
+    however often samples arrive. Any period up to the window's span is
+    answered from the slots it covers; the period edge moves one bucket at
+    a time.
+    """
+    
+    def __init__(self, minutes: int, bucket_seconds: int = 60):
+        self.minutes = minutes
+        self.bucket_seconds = bucket_seconds
+        self.slots = max(1, minutes * 60 // bucket_seconds)
+        self.buckets = np.full(self.slots, -1, dtype=np.int64)  # Bucket number held by each slot
+        self.sums = np.zeros(self.slots)
+        self.counts = np.zeros(self.slots, dtype=np.uint32)
+        self.firsts = np.zeros(self.slots, dtype=np.float32)
+        self.lasts = np.zeros(self.slots, dtype=np.float32)
+    
+    def add(self, timestamp: float, score: float):
+        """Add a sample to its bucket, recycling the slot of an expired one"""
+        bucket = int(timestamp // self.bucket_seconds)
+        slot = bucket % self.slots
+        held = self.buckets[slot]
+        
+        if bucket < held:
+            return  # Older than the span this slot now covers
+        if bucket > held:
+            self.buckets[slot] = bucket
+            self.sums[slot] = 0.0
+            self.counts[slot] = 0
+            self.firsts[slot] = score
+        
+        self.sums[slot] += score
+        self.counts[slot] += 1
+        self.lasts[slot] = score
+    
+    def covered(self, minutes: int, now: float) -> np.ndarray:
+        """Slots holding the buckets of the last `minutes`, oldest first"""
+        current = int(now // self.bucket_seconds)
+        span = max(1, min(self.slots, minutes * 60 // self.bucket_seconds))
+        slots = np.flatnonzero((self.buckets > current - span) & (self.buckets <= current))
+        return slots[np.argsort(self.buckets[slots])]
+    
+    def count(self, minutes: int, now: float) -> int:
+        """Samples in the last `minutes`"""
+        return int(self.counts[self.covered(minutes, now)].sum())
+    
+    def average(self, minutes: int, now: float) -> Optional[float]:
+        """Average score in the last `minutes`, or None when empty"""
+        slots = self.covered(minutes, now)
+        count = self.counts[slots].sum()
+        if not count:
+            return None
+        return float(self.sums[slots].sum() / count)
+    
+    def first_last(self, minutes: int, now: float) -> Optional[Tuple[float, float]]:
+        """First and last score in the last `minutes`, or None with fewer than two samples"""
+        slots = self.covered(minutes, now)
+        if self.counts[slots].sum() < 2:
+            return None
+        return float(self.firsts[slots[0]]), float(self.lasts[slots[-1]])
 
 
 @dataclass
 class SentimentHistory:
     """Historical sentiment data for a token"""
     token: str
-    history: List[TokenSentiment] = field(default_factory=list)
+    history: SentimentSeries = field(default_factory=SentimentSeries)
+    # Minute buckets up to the longest aggregator timeframe, then history-sized
+    # buckets out to the retention period
+    windows: List[RollingWindow] = field(
+        default_factory=lambda: [
+            RollingWindow(SentimentAggregator.TIMEFRAMES[-1][0]),
+            RollingWindow(
+                settings.sentiment_history_retention_hours * 60,
+                bucket_seconds=settings.sentiment_history_bucket_seconds,
+            ),
+        ]
+    )
     
     def add_sentiment(self, sentiment: TokenSentiment):
-        """Add sentiment to history"""
-        self.history.append(sentiment)
+        """Add sentiment to history and rolling windows"""
+        timestamp = sentiment.timestamp.timestamp()
+        self.history.append(
+            timestamp,
+            sentiment_score=sentiment.sentiment_score,
+            confidence=sentiment.confidence,
+            sample_size=sentiment.sample_size,
+            bullish_count=sentiment.bullish_count,
+            neutral_count=sentiment.neutral_count,
+            bearish_count=sentiment.bearish_count,
+            avg_likes=sentiment.avg_likes,
+            avg_retweets=sentiment.avg_retweets,
+            avg_replies=sentiment.avg_replies,
+            trend_strength=sentiment.trend_strength,
+            label=LABELS.index(sentiment.sentiment_label),
+            trend=TRENDS.index(sentiment.trend),
+        )
+        
+        for window in self.windows:
+            window.add(timestamp, sentiment.sentiment_score)
+    
+    def set_latest_trend(self, trend: str, trend_strength: float):
+        """Record the trend computed for the most recent sample"""
+        self.history.update_latest(trend=TRENDS.index(trend), trend_strength=trend_strength)
+    
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Most recent sample as a dict, or None when empty"""
+        row = self.history.latest()
+        return record_to_dict(self.token, row) if row is not None else None
+    
+    def get_records(self, hours: int) -> List[Dict[str, Any]]:
+        """Samples from the last `hours`, materialized for API responses"""
+        since = (datetime.now() - timedelta(hours=hours)).timestamp()
+        return [record_to_dict(self.token, row) for row in self.history.records(since)]
+    
+    def _window(self, hours: int) -> RollingWindow:
+        """Finest window whose span covers the period"""
+        for window in self.windows:
+            if window.minutes >= hours * 60:
+                return window
+        return self.windows[-1]  # Nothing older is retained
     
     def get_trend(self, hours: int = 24) -> str:
         """Get trend over time period"""
         if len(self.history) < 2:
             return "insufficient_data"
         
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent = [s for s in self.history if s.timestamp > cutoff]
-        
-        if len(recent) < 2:
+        endpoints = self._window(hours).first_last(hours * 60, datetime.now().timestamp())
+        if endpoints is None:
             return "insufficient_data"
-        
-        first_score = recent[0].sentiment_score
-        last_score = recent[-1].sentiment_score
+        first_score, last_score = endpoints
         
         if last_score > first_score + 5:
             return "rising"
@@ -97,38 +405,48 @@ class SentimentHistory:
     
     def get_average_sentiment(self, hours: int = 24) -> float:
         """Get average sentiment over time period"""
-        cutoff = datetime.now() - timedelta(hours=hours)
-        recent = [s for s in self.history if s.timestamp > cutoff]
-        
-        if not recent:
-            return 50.0  # neutral
-        
-        return sum(s.sentiment_score for s in recent) / len(recent)
+        average = self._window(hours).average(hours * 60, datetime.now().timestamp())
+        return average if average is not None else 50.0  # neutral
 
 
 # ============================================
 # Sentiment Pipeline
 # ============================================
 
+# Per-token analysis run by the scheduler; analyze_token unless overridden
+Analyzer = Callable[[str], Awaitable[TokenSentiment]]
+
+
 class SentimentPipeline:
     """
     Complete sentiment analysis pipeline
     Scrapes tweets → Analyzes sentiment → Aggregates results
     """
     
-    def __init__(self, token_list: List[str]):
+    def __init__(self, token_list: List[str], cache_manager: Optional[CacheManager] = None):
         self.token_list = token_list
         self.logger = logger.bind(component="SentimentPipeline")
         
         # Initialize components
         self.scraper = TwitterScraperV2(token_list)
-        self.analyzer = SentimentAnalyzer()
+        self.inference = get_inference_executor(shared_cache=cache_manager)
         self.pipeline = UpdatedDataPipeline(token_list)
         
+        # Scheduling: bounded concurrency per source
+        self.source_slots: Dict[str, asyncio.Semaphore] = {
+            self.scraper.source: asyncio.Semaphore(settings.source_max_concurrency),
+        }
+        
         # Storage
         self.sentiment_history: Dict[str, SentimentHistory] = {
             token: SentimentHistory(token) for token in token_list
         }
+        self.feeds: Dict[str, TokenFeed] = {token: TokenFeed() for token in token_list}
+        self.aggregator = SentimentAggregator()
+        self.score_stats: Dict[str, Dict[str, Any]] = {}
+        self.history_log: Optional[HistoryLog] = HistoryLog() if settings.enable_history_log else None
+        self.pending_records: List[Dict[str, Any]] = []
+        self.flush_task: Optional[asyncio.Task] = None
         
         self.logger.info(f"Initialized sentiment pipeline for {len(token_list)} tokens")
     
@@ -146,6 +464,12 @@ class SentimentPipeline:
             if token not in self.sentiment_history:
                 self.sentiment_history[token] = SentimentHistory(token)
         
+        # Keep scrape state of tokens still tracked; drop the rest
+        self.feeds = {
+            token: self.feeds[token] if token in self.feeds else TokenFeed()
+            for token in new_tokens
+        }
+        
         self.logger.info(f"Updated sentiment pipeline for {len(new_tokens)} tokens")
     
     async def analyze_token(self, token: str) -> TokenSentiment:
@@ -153,125 +477,144 @@ class SentimentPipeline:
         Analyze sentiment for a single token
         
         Steps:
-        1. Scrape tweets
-        2. Analyze each tweet
-        3. Aggregate results
+        1. Scrape tweets newer than the token's high-water mark
+        2. Analyze the unseen tweets in batches
+        3. Fold them into the token's running aggregate
         4. Calculate metrics
         """
         self.logger.info(f"Analyzing sentiment for {token}...")
         
+        feed = self.feeds.get(token)
+        if feed is None:
+            self.logger.warning(f"{token} is not tracked")
+            return self._create_empty_sentiment(token)
+        
         try:
-            # Step 1: Scrape tweets
-            tweets = await self.scraper.scrape_tweets(token, max_tweets=100)
-            
-            if not tweets:
-                self.logger.warning(f"No tweets found for {token}")
-                return self._create_empty_sentiment(token)
-            
-            self.logger.info(f"Scraped {len(tweets)} tweets for {token}")
-            
-            # Step 2: Analyze each tweet
-            sentiments = []
-            engagement_metrics = {
-                "likes": [],
-                "retweets": [],
-                "replies": [],
-            }
-            
-            for tweet in tweets:
-                # Analyze sentiment
-                result = self.analyzer.analyze_sentiment(tweet.text)
-                sentiments.append(result)
+            async with feed.lock:
+                # Step 1: Scrape only new tweets
+                tweets = await self.scraper.scrape_tweets(
+                    token,
+                    max_tweets=feed.window_posts,
+                    since_id=feed.since_id,
+                )
+                fresh = feed.unseen(tweets)
                 
-                # Collect engagement metrics
-                engagement_metrics["likes"].append(tweet.likes)
-                engagement_metrics["retweets"].append(tweet.retweets)
-                engagement_metrics["replies"].append(tweet.replies)
-            
-            # Step 3: Aggregate results
-            bullish_count = sum(1 for s in sentiments if s.sentiment == "bullish")
-            neutral_count = sum(1 for s in sentiments if s.sentiment == "neutral")
-            bearish_count = sum(1 for s in sentiments if s.sentiment == "bearish")
-            
-            # Calculate average sentiment score (0-100 scale)
-            # Map sentiment to score: bearish=0-33, neutral=34-66, bullish=67-100
-            sentiment_scores = []
-            for s in sentiments:
-                if s.sentiment == "bullish":
-                    score = 67 + (s.confidence * 33)  # 67-100
-                elif s.sentiment == "bearish":
-                    score = s.confidence * 33  # 0-33
-                else:  # neutral
-                    score = 34 + (s.confidence * 33)  # 34-66
-                sentiment_scores.append(score)
-            
-            avg_sentiment_score = sum(sentiment_scores) / len(sentiment_scores) if sentiment_scores else 50.0
-            
-            # Calculate average confidence
-            avg_confidence = sum(s.confidence for s in sentiments) / len(sentiments) if sentiments else 0.0
-            
-            # Determine sentiment label
-            if bullish_count > neutral_count + bearish_count:
-                sentiment_label = "bullish"
-            elif bearish_count > neutral_count + bullish_count:
-                sentiment_label = "bearish"
-            else:
-                sentiment_label = "neutral"
-            
-            # Calculate average engagement
-            avg_likes = sum(engagement_metrics["likes"]) / len(engagement_metrics["likes"]) if engagement_metrics["likes"] else 0
-            avg_retweets = sum(engagement_metrics["retweets"]) / len(engagement_metrics["retweets"]) if engagement_metrics["retweets"] else 0
-            avg_replies = sum(engagement_metrics["replies"]) / len(engagement_metrics["replies"]) if engagement_metrics["replies"] else 0
-            
-            # Create sentiment result
-            token_sentiment = TokenSentiment(
-                token=token,
-                timestamp=datetime.now(),
-                sentiment_score=avg_sentiment_score,
-                sentiment_label=sentiment_label,
-                confidence=avg_confidence,
-                sample_size=len(tweets),
-                bullish_count=bullish_count,
-                neutral_count=neutral_count,
-                bearish_count=bearish_count,
-                avg_likes=avg_likes,
-                avg_retweets=avg_retweets,
-                avg_replies=avg_replies,
-            )
-            
-            # Calculate trend
-            self.sentiment_history[token].add_sentiment(token_sentiment)
-            token_sentiment.trend = self.sentiment_history[token].get_trend(hours=24)
-            token_sentiment.trend_strength = self._calculate_trend_strength(token)
-            
-            self.logger.info(f"Sentiment for {token}: {sentiment_label} ({avg_sentiment_score:.1f})")
-            
-            return token_sentiment
+                # Collapse near-identical shill posts before inference
+                tweets = [
+                    tweet for tweet in fresh
+                    if feed.dedup.check(feed.post_key(tweet), tweet.text) is None
+                ]
+                
+                # Step 2: Analyze the new tweets in batches
+                if tweets:
+                    self.logger.info(f"Scraped {len(tweets)} new tweets for {token}")
+                    sentiments = await self.inference.analyze_batch([tweet.text for tweet in tweets])
+                    feed.add(sentiments, tweets)
+                
+                # Only now are they done; if inference failed the next scrape refetches them
+                feed.commit(fresh)
+                
+                if not feed:
+                    self.logger.warning(f"No tweets found for {token}")
+                    return self._create_empty_sentiment(token)
+                
+                # Step 3: Aggregate from the running totals
+                token_sentiment = TokenSentiment(
+                    token=token,
+                    timestamp=datetime.now(),
+                    sample_size=len(feed),
+                    **feed.aggregate(),
+                )
+                
+                # Calculate trend
+                history = self.sentiment_history[token]
+                history.add_sentiment(token_sentiment)
+                token_sentiment.trend = history.get_trend(hours=24)
+                token_sentiment.trend_strength = self._calculate_trend_strength(token)
+                history.set_latest_trend(token_sentiment.trend, token_sentiment.trend_strength)
+                
+                if self.history_log:
+                    self.pending_records.append(token_sentiment.to_dict())
+                
+                self.logger.info(
+                    f"Sentiment for {token}: {token_sentiment.sentiment_label} "
+                    f"({token_sentiment.sentiment_score:.1f})"
+                )
+                
+                return token_sentiment
         
         except Exception as e:
             self.logger.error(f"Error analyzing {token}: {e}")
             return self._create_empty_sentiment(token)
     
-    async def analyze_all_tokens(self) -> Dict[str, TokenSentiment]:
-        """Analyze sentiment for all tokens"""
+    async def analyze_all_tokens(self, analyze: Optional[Analyzer] = None) -> Dict[str, TokenSentiment]:
+        """Analyze sentiment for all tokens, with `analyze` in place of analyze_token if given"""
         self.logger.info(f"Analyzing sentiment for {len(self.token_list)} tokens...")
         
         results = {}
         
-        for token in self.token_list:
-            try:
-                sentiment = await self.analyze_token(token)
-                results[token] = sentiment
-                
-                # Rate limiting
-                await asyncio.sleep(2)
-            
-            except Exception as e:
-                self.logger.error(f"Error analyzing {token}: {e}")
-                results[token] = self._create_empty_sentiment(token)
+        async for sentiment in self.stream_all_tokens(analyze=analyze):
+            results[sentiment.token] = sentiment
+        
+        self.summarize_scores(hours=24)
         
         self.logger.info(f"Analyzed {len(results)} tokens")
-        return results
+        return {token: results[token] for token in self.token_list if token in results}
+    
+    async def stream_all_tokens(
+        self,
+        tokens: Optional[List[str]] = None,
+        analyze: Optional[Analyzer] = None,
+    ) -> AsyncIterator[TokenSentiment]:
+        """
+        Analyze tokens concurrently, yielding each result as it finishes
+        
+        Concurrency is bounded per source and outbound requests draw from the
+        source host's shared rate budget instead of fixed sleeps.
+        """
+        tokens = list(tokens if tokens is not None else self.token_list)
+        analyze = analyze or self.analyze_token
+        tasks = [asyncio.create_task(self._analyze_scheduled(token, analyze)) for token in tokens]
+        
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+            
+            # Persist this cycle's samples in the background
+            self.flush_history()
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+    
+    async def _analyze_scheduled(self, token: str, analyze: Analyzer) -> TokenSentiment:
+        """Analyze a token within its source's concurrency and rate budget"""
+        scraper = self.scraper
+        slots = self.source_slots.setdefault(
+            scraper.source,
+            asyncio.Semaphore(settings.source_max_concurrency),
+        )
+        
+        try:
+            async with slots:
+                await get_host_budget(scraper.host).acquire()
+                return await analyze(token)
+        
+        except Exception as e:
+            self.logger.error(f"Error analyzing {token}: {e}")
+            return self._create_empty_sentiment(token)
+    
+    def summarize_scores(self, hours: int = 24) -> Dict[str, Dict[str, Any]]:
+        """Score statistics over the last `hours` for every token in one batch"""
+        since = (datetime.now() - timedelta(hours=hours)).timestamp()
+        tokens = [token for token in self.token_list if token in self.sentiment_history]
+        rows = [
+            self.sentiment_history[token].history.records(since)["sentiment_score"]
+            for token in tokens
+        ]
+        
+        self.score_stats = dict(zip(tokens, self.aggregator.aggregate_batch(rows))) if rows else {}
+        return self.score_stats
     
     def _create_empty_sentiment(self, token: str) -> TokenSentiment:
         """Create empty sentiment result"""
@@ -291,13 +634,9 @@ class SentimentPipeline:
         if len(history.history) < 2:
             return 0.0
         
-        recent = history.history[-10:]  # Last 10 samples
-        
-        if len(recent) < 2:
-            return 0.0
-        
-        first_score = recent[0].sentiment_score
-        last_score = recent[-1].sentiment_score
+        # Compare against the sample 10 entries back (or the oldest)
+        first_score = history.history.score_at(-min(10, len(history.history)))
+        last_score = history.history.score_at(-1)
         
         # Calculate change
         change = abs(last_score - first_score)
@@ -313,13 +652,10 @@ class SentimentPipeline:
         
         while True:
             try:
-                # Analyze all tokens
-                results = await self.analyze_all_tokens()
-                
-                # Log results
-                for token, sentiment in results.items():
+                # Analyze all tokens, logging each as it finishes
+                async for sentiment in self.stream_all_tokens():
                     self.logger.info(
-                        f"{token}: {sentiment.sentiment_label} "
+                        f"{sentiment.token}: {sentiment.sentiment_label} "
                         f"({sentiment.sentiment_score:.1f}) "
                         f"[{sentiment.sample_size} posts]"
                     )
@@ -331,6 +667,43 @@ class SentimentPipeline:
                 self.logger.error(f"Pipeline error: {e}")
                 await asyncio.sleep(5)
     
+    def flush_history(self) -> Optional[asyncio.Task]:
+        """Write pending samples to the history log in the background"""
+        if not self.history_log or not self.pending_records:
+            return self.flush_task
+        
+        records, self.pending_records = self.pending_records, []
+        self.flush_task = asyncio.create_task(self._write_history(records, self.flush_task))
+        return self.flush_task
+    
+    async def _write_history(self, records: List[Dict[str, Any]], previous: Optional[asyncio.Task]):
+        """Append records after any earlier flush so segments stay ordered"""
+        if previous:
+            await asyncio.wait([previous])
+        
+        try:
+            await self.history_log.append_async(records)
+        except Exception as e:
+            self.logger.error(f"Error writing sentiment history: {e}")
+    
+    async def restore_history(self, hours: Optional[int] = None) -> int:
+        """Reload recent samples from the history log after a restart"""
+        if not self.history_log:
+            return 0
+        
+        since = datetime.now() - timedelta(hours=hours or settings.sentiment_history_restore_hours)
+        records = await asyncio.to_thread(lambda: list(self.history_log.load(since)))
+        
+        restored = 0
+        for record in records:
+            history = self.sentiment_history.get(record["token"])
+            if history is not None:
+                history.add_sentiment(TokenSentiment.from_dict(record))
+                restored += 1
+        
+        self.logger.info(f"Restored {restored} sentiment samples from {self.history_log.directory}")
+        return restored
+    
     def get_sentiment_summary(self) -> Dict[str, Any]:
         """Get summary of current sentiment for all tokens"""
         summary = {
@@ -341,16 +714,18 @@ class SentimentPipeline:
         for token in self.token_list:
             history = self.sentiment_history[token]
             
-            if history.history:
-                latest = history.history[-1]
+            latest = history.latest()
+            
+            if latest:
                 summary["tokens"][token] = {
-                    "sentiment": latest.sentiment_label,
-                    "score": latest.sentiment_score,
-                    "confidence": latest.confidence,
-                    "sample_size": latest.sample_size,
-                    "trend": latest.trend,
-                    "trend_strength": latest.trend_strength,
+                    "sentiment": latest["sentiment_label"],
+                    "score": latest["sentiment_score"],
+                    "confidence": latest["confidence"],
+                    "sample_size": latest["sample_size"],
+                    "trend": latest["trend"],
+                    "trend_strength": latest["trend_strength"],
                     "avg_24h": history.get_average_sentiment(hours=24),
+                    "stats_24h": self.score_stats.get(token),
                 }
             else:
                 summary["tokens"][token] = {
@@ -362,23 +737,42 @@ class SentimentPipeline:
         
         return summary
     
-    def export_history(self, filepath: str = "sentiment_history.json"):
-        """Export sentiment history to JSON"""
-        data = {
-            "timestamp": datetime.now().isoformat(),
-            "tokens": {},
-        }
-        
-        for token, history in self.sentiment_history.items():
-            data["tokens"][token] = [s.to_dict() for s in history.history]
+    async def export_history(self, filepath: str = "sentiment_history.json"):
+        """
+        Export sentiment history to JSON
         
-        with open(filepath, "w") as f:
-            json.dump(data, f, indent=2)
+        Rows are copied here on the event loop, which is the only place the
+        history rings are appended to and downsampled, and the copy is
+        written to disk on a worker thread.
+        """
+        snapshot = {
+            token: history.history.records()
+            for token, history in self.sentiment_history.items()
+        }
+        await asyncio.to_thread(self._write_export, filepath, snapshot)
         
         self.logger.info(f"Exported sentiment history to {filepath}")
     
+    @staticmethod
+    def _write_export(filepath: str, snapshot: Dict[str, np.ndarray]):
+        """Write copied rows one record at a time so memory stays flat"""
+        with open(filepath, "w") as f:
+            f.write('{"timestamp": %s, "tokens": {' % json.dumps(datetime.now().isoformat()))
+            
+            for i, (token, rows) in enumerate(snapshot.items()):
+                f.write("%s%s: [" % (", " if i else "", json.dumps(token)))
+                for j, row in enumerate(rows):
+                    f.write((", " if j else "") + json.dumps(record_to_dict(token, row)))
+                f.write("]")
+            
+            f.write("}}\n")
+    
     async def close(self):
         """Close all resources"""
+        flush_task = self.flush_history()
+        if flush_task:
+            await flush_task
+        
         await self.scraper.close()
         await self.pipeline.close()
 
@@ -411,7 +805,7 @@ async def test_sentiment_pipeline():
             logger.info("")
         
         # Export history
-        pipeline.export_history()
+        await pipeline.export_history()
         
         # Get summary
         summary = pipeline.get_sentiment_summary()
@@ -419,6 +813,7 @@ async def test_sentiment_pipeline():
     
     finally:
         await pipeline.close()
+        await close_http_client()
 
 
 if __name__ == "__main__":
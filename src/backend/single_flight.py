@@ -0,0 +1,92 @@
+"""
+Single-Flight Request Coalescing
+Concurrent callers for the same key share one computation and its recent result
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from src.backend.config import settings
+
+
+class SingleFlight:
+    """
+    Per-key deduplication of async work
+    
+    The first caller for a key starts `fn()`; callers arriving while it runs
+    await the same task. A successful result is reused for `fresh_seconds`
+    afterwards. Failures are shared with the callers already waiting but are
+    not cached.
+    """
+    
+    def __init__(self, fresh_seconds: Optional[float] = None, max_entries: int = 1024):
+        self.fresh_seconds = fresh_seconds if fresh_seconds is not None else settings.single_flight_fresh_seconds
+        self.max_entries = max_entries
+        
+        self.inflight: Dict[Hashable, asyncio.Task] = {}
+        self.results: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        
+        # Stats
+        self.calls = 0
+        self.executions = 0
+        self.joined = 0
+        self.fresh_hits = 0
+    
+    def fresh(self, key: Hashable) -> Optional[Tuple[float, Any]]:
+        """(completed at, result) if the key has a result inside the freshness window"""
+        entry = self.results.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.fresh_seconds:
+            del self.results[key]
+            return None
+        return entry
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of `fn()` for `key`, shared with concurrent and recent callers"""
+        self.calls += 1
+        
+        entry = self.fresh(key)
+        if entry is not None:
+            self.fresh_hits += 1
+            return entry[1]
+        
+        task = self.inflight.get(key)
+        if task is None:
+            self.executions += 1
+            task = asyncio.create_task(self._run(key, fn))
+            self.inflight[key] = task
+        else:
+            self.joined += 1
+        
+        # Shielded: one caller disconnecting must not cancel the others' work
+        return await asyncio.shield(task)
+    
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await fn()
+            self.results[key] = (time.monotonic(), result)
+            self.results.move_to_end(key)
+            while len(self.results) > self.max_entries:
+                self.results.popitem(last=False)
+            return result
+        finally:
+            del self.inflight[key]
+    
+    def forget(self, key: Hashable):
+        """Drop a cached result so the next call recomputes"""
+        self.results.pop(key, None)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get coalescing statistics"""
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "joined": self.joined,
+            "fresh_hits": self.fresh_hits,
+            "inflight": len(self.inflight),
+            "cached": len(self.results),
+            "saved_ratio": round(1 - self.executions / self.calls, 3) if self.calls else 0.0,
+        }
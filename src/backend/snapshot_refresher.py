@@ -0,0 +1,148 @@
+"""
+Sentiment Snapshot Refresher
+Recomputes all-token sentiment in the background and publishes immutable snapshots
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional
+
+from loguru import logger
+
+from src.backend.config import settings
+
+
+@dataclass(frozen=True)
+class SentimentSnapshot:
+    """All-token sentiment as of one refresh; never mutated once published"""
+    data: Mapping[str, Dict[str, Any]]
+    created_at: datetime
+    generation: int
+    duration_seconds: float
+    
+    def age_seconds(self, now: Optional[datetime] = None) -> float:
+        return ((now or datetime.now()) - self.created_at).total_seconds()
+
+
+class SnapshotRefresher:
+    """
+    Single owner of the all-token sentiment scan
+    
+    A background loop calls `compute()` every `interval_seconds` and swaps in
+    a new snapshot when it finishes; readers always get the latest snapshot
+    without waiting. At most one scan runs at a time: `refresh()` joins the
+    scan in flight instead of starting another. A failed scan keeps serving
+    the previous snapshot.
+    """
+    
+    def __init__(
+        self,
+        compute: Callable[[], Awaitable[Dict[str, Any]]],
+        interval_seconds: Optional[float] = None,
+    ):
+        self.compute = compute
+        self.interval_seconds = interval_seconds or settings.snapshot_refresh_interval_seconds
+        self.logger = logger.bind(component="SnapshotRefresher")
+        
+        self.snapshot: Optional[SentimentSnapshot] = None
+        self._inflight: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+        
+        # Stats
+        self.refreshes = 0
+        self.failures = 0
+        self.joined = 0
+        self.last_error: Optional[str] = None
+    
+    async def refresh(self) -> SentimentSnapshot:
+        """Run a scan, or join the one already running, and return the result"""
+        if self._inflight is None:
+            self._inflight = asyncio.create_task(self._refresh())
+            self._inflight.add_done_callback(self._clear_inflight)
+        else:
+            self.joined += 1
+        
+        # Shielded: a caller that gives up must not cancel the shared scan
+        return await asyncio.shield(self._inflight)
+    
+    def _clear_inflight(self, task: asyncio.Task):
+        if self._inflight is task:
+            self._inflight = None
+        if not task.cancelled():
+            task.exception()  # Mark retrieved; failures are already logged in _refresh
+    
+    async def _refresh(self) -> SentimentSnapshot:
+        start = time.monotonic()
+        try:
+            results = await self.compute()
+        except Exception as e:
+            self.failures += 1
+            self.last_error = str(e)
+            self.logger.error(f"Snapshot refresh failed: {e}")
+            if self.snapshot is None:
+                raise
+            return self.snapshot
+        
+        data = {
+            token: sentiment.to_dict() if hasattr(sentiment, "to_dict") else dict(sentiment)
+            for token, sentiment in results.items()
+        }
+        self.refreshes += 1
+        self.last_error = None
+        self.snapshot = SentimentSnapshot(
+            data=MappingProxyType(data),
+            created_at=datetime.now(),
+            generation=self.refreshes,
+            duration_seconds=time.monotonic() - start,
+        )
+        self.logger.debug(f"Published snapshot {self.refreshes} ({len(data)} tokens)")
+        return self.snapshot
+    
+    async def latest(self) -> SentimentSnapshot:
+        """The current snapshot, waiting for the first one if none is published yet"""
+        if self.snapshot is not None:
+            return self.snapshot
+        return await self.refresh()
+    
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                pass  # Logged in _refresh; retry on the next tick
+            await asyncio.sleep(self.interval_seconds)
+    
+    def start(self):
+        """Start the background loop (idempotent)"""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+            self.logger.info(f"Refreshing sentiment snapshots every {self.interval_seconds}s")
+    
+    async def stop(self):
+        """Stop the loop and any scan in flight"""
+        for task in (self._loop_task, self._inflight):
+            if task and not task.done():
+                task.cancel()
+        for task in (self._loop_task, self._inflight):
+            if task:
+                await asyncio.gather(task, return_exceptions=True)
+        self._loop_task = None
+        self._inflight = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get refresher statistics"""
+        snapshot = self.snapshot
+        return {
+            "running": self._loop_task is not None and not self._loop_task.done(),
+            "refreshing": self._inflight is not None,
+            "generation": snapshot.generation if snapshot else 0,
+            "age_seconds": round(snapshot.age_seconds(), 1) if snapshot else None,
+            "last_duration_seconds": round(snapshot.duration_seconds, 3) if snapshot else None,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+            "joined": self.joined,
+            "last_error": self.last_error,
+        }
@@ -13,7 +13,7 @@ from src.backend.dex_listener import DEXListener, TokenPair
 from src.backend.volume_analyzer import VolumeAnalyzer, VolumeMetrics
 from src.backend.dev_wallet_analyzer import DevWalletAnalyzer, DevWalletAnalysis
 from src.backend.twitter_scraper_v2 import TwitterScraperV2
-from src.backend.sentiment_analyzer import SentimentAnalyzer
+from src.backend.inference_executor import get_inference_executor
 
 
 @dataclass
@@ -57,7 +57,7 @@ class SniperBot:
         self.volume_analyzer = VolumeAnalyzer()
         self.dev_wallet_analyzer = DevWalletAnalyzer()
         self.twitter_scraper = TwitterScraperV2([""])
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.inference = get_inference_executor()
         
         self.logger.info("Initialized AI Sniper Bot")
     
@@ -106,7 +106,7 @@ class SniperBot:
             
             # 2. Sentiment Analysis
             tweets = self.twitter_scraper._generate_mock_tweets(pair.token_symbol, 10)
-            sentiments = [self.sentiment_analyzer.analyze_sentiment(t.text) for t in tweets]
+            sentiments = await self.inference.analyze_batch([t.text for t in tweets])
             sentiment_score = self._score_sentiment(sentiments)
             
             # 3. Dev Wallet Analysis
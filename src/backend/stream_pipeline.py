@@ -0,0 +1,275 @@
+"""
+Streaming Sentiment Pipeline
+Collect → extract → dedup → infer → aggregate → publish as concurrent stages
+connected by bounded queues
+"""
+
+import asyncio
+from collections import OrderedDict, defaultdict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from loguru import logger
+
+from src.backend.cache import SentimentCache
+from src.backend.config import settings
+from src.backend.data_pipeline import is_spam
+from src.backend.dedup import NearDuplicateDetector
+from src.backend.inference_executor import get_inference_executor
+from src.backend.sentiment_pipeline import TokenFeed, TokenSentiment
+from src.backend.token_matcher import get_matcher
+
+
+Publisher = Callable[[TokenSentiment], Awaitable[None]]
+
+# End-of-stream marker passed down the queues when a bounded run drains
+DONE = object()
+
+STAGES = ("collected", "extracted", "unique", "scored", "aggregated")
+
+
+def cache_publisher(cache: SentimentCache, ttl: int = 300) -> Publisher:
+    """Publisher writing each token's latest sentiment to the cache"""
+    async def publish(sentiment: TokenSentiment):
+        await cache.set_token_sentiment(sentiment.token, sentiment.to_dict(), ttl)
+    return publish
+
+
+class StreamingPipeline:
+    """
+    Scores posts as they arrive instead of once per collection cycle
+    
+    Every stage is its own task reading from a bounded asyncio.Queue, so a
+    slow stage (usually inference) blocks the stages upstream of it rather
+    than letting posts pile up in memory. Inference runs on micro-batches of
+    up to `batch_size` posts, waiting at most `batch_wait` seconds to fill
+    one, and each batch's tokens are re-aggregated and published right away.
+    """
+    
+    def __init__(
+        self,
+        collectors: List[Any],
+        token_list: List[str],
+        publishers: Optional[List[Publisher]] = None,
+        queue_size: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_wait: Optional[float] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.collectors = list(collectors)
+        self.token_list = [token.upper() for token in token_list]
+        self.publishers = list(publishers or [])
+        self.batch_size = batch_size or settings.stream_batch_size
+        self.batch_wait = batch_wait if batch_wait is not None else settings.stream_batch_wait_seconds
+        self.poll_interval = poll_interval if poll_interval is not None else settings.stream_poll_seconds
+        self.logger = logger.bind(component="StreamingPipeline")
+        
+        queue_size = queue_size or settings.stream_queue_size
+        self.queues: Dict[str, asyncio.Queue] = {name: asyncio.Queue(maxsize=queue_size) for name in STAGES}
+        
+        self.matcher = get_matcher(self.token_list)
+        self.dedup = NearDuplicateDetector()
+        self.seen: "OrderedDict[str, None]" = OrderedDict()
+        self.feeds: Dict[str, TokenFeed] = {}
+        self.latest: Dict[str, TokenSentiment] = {}
+        
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.tasks: List[asyncio.Task] = []
+    
+    @staticmethod
+    def post_key(post: Any) -> str:
+        return f"{post.source}:{post.post_id}"
+    
+    # ============================================
+    # Stages
+    # ============================================
+    
+    async def _consume(self, name: str):
+        """Items from a stage queue until the end-of-stream marker"""
+        queue = self.queues[name]
+        while True:
+            item = await queue.get()
+            if item is DONE:
+                return
+            yield item
+    
+    async def _collect(self, collector, cycles: Optional[int]):
+        """Poll one collector, pushing posts downstream as each token completes"""
+        out = self.queues["collected"]
+        cycle = 0
+        while cycles is None or cycle < cycles:
+            try:
+                async for posts in collector.stream():
+                    for post in posts:
+                        await out.put(post)  # Blocks while downstream is full
+                        self.counters["collected"] += 1
+            except Exception as e:
+                self.logger.error(f"{collector.__class__.__name__} error: {e}")
+            
+            cycle += 1
+            if cycles is None or cycle < cycles:
+                await asyncio.sleep(self.poll_interval)
+    
+    async def _extract(self):
+        """Attach token mentions and drop spam"""
+        out = self.queues["extracted"]
+        async for post in self._consume("collected"):
+            if not post.tokens_mentioned:
+                post.tokens_mentioned = self.matcher.extract(post.text)
+            
+            if not post.tokens_mentioned or is_spam(post):
+                self.counters["filtered"] += 1
+                continue
+            
+            await out.put(post)
+        await out.put(DONE)
+    
+    async def _dedup(self):
+        """Drop posts already seen in earlier polls and near-duplicate copies"""
+        out = self.queues["unique"]
+        async for post in self._consume("extracted"):
+            key = self.post_key(post)
+            if key in self.seen:
+                self.counters["repeats"] += 1
+                continue
+            self.seen[key] = None
+            if len(self.seen) > settings.stream_seen_posts:
+                self.seen.popitem(last=False)
+            
+            if self.dedup.check(key, post.text) is not None:
+                self.counters["duplicates"] += 1
+                continue
+            
+            await out.put(post)
+        await out.put(DONE)
+    
+    async def _infer(self):
+        """Score posts in micro-batches"""
+        queue = self.queues["unique"]
+        out = self.queues["scored"]
+        inference = get_inference_executor()
+        loop = asyncio.get_running_loop()
+        done = False
+        
+        while not done:
+            item = await queue.get()
+            if item is DONE:
+                break
+            
+            batch = [item]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if item is DONE:
+                    done = True
+                    break
+                batch.append(item)
+            
+            try:
+                results = await inference.analyze_batch([post.text for post in batch])
+            except Exception as e:
+                self.logger.error(f"Inference error on {len(batch)} posts: {e}")
+                self._forget(batch)
+                continue
+            
+            self.counters["batches"] += 1
+            self.counters["scored"] += len(batch)
+            await out.put(list(zip(batch, results)))
+        await out.put(DONE)
+    
+    def _forget(self, posts: List[Any]):
+        """Un-see posts that were never scored so the next poll retries them"""
+        for post in posts:
+            key = self.post_key(post)
+            self.seen.pop(key, None)
+            self.dedup.forget(key)
+    
+    async def _aggregate(self):
+        """Fold each scored batch into the token feeds and emit the tokens it touched"""
+        out = self.queues["aggregated"]
+        async for scored in self._consume("scored"):
+            touched = []
+            for post, result in scored:
+                for token in post.tokens_mentioned:
+                    if token not in self.token_list:
+                        continue
+                    feed = self.feeds.get(token)
+                    if feed is None:
+                        feed = self.feeds[token] = TokenFeed()
+                    feed.add_post(
+                        result.sentiment,
+                        result.confidence,
+                        post.metrics.get("likes", 0),
+                        post.metrics.get("retweets", post.metrics.get("shares", 0)),
+                        post.metrics.get("replies", post.metrics.get("comments", 0)),
+                    )
+                    if token not in touched:
+                        touched.append(token)
+            
+            now = datetime.now()
+            for token in touched:
+                feed = self.feeds[token]
+                await out.put(TokenSentiment(token=token, timestamp=now, sample_size=len(feed), **feed.aggregate()))
+        await out.put(DONE)
+    
+    async def _publish(self):
+        """Hand each updated sentiment to every publisher"""
+        async for sentiment in self._consume("aggregated"):
+            self.latest[sentiment.token] = sentiment
+            for publish in self.publishers:
+                try:
+                    await publish(sentiment)
+                except Exception as e:
+                    self.logger.error(f"Error publishing {sentiment.token}: {e}")
+            self.counters["published"] += 1
+    
+    # ============================================
+    # Lifecycle
+    # ============================================
+    
+    async def run(self, cycles: Optional[int] = None):
+        """
+        Run every stage until the collectors finish `cycles` polls
+        
+        With `cycles=None` the collectors poll forever; a bounded run drains
+        the queues and returns once everything collected is published.
+        """
+        async def collect_all():
+            await asyncio.gather(*(self._collect(collector, cycles) for collector in self.collectors))
+            await self.queues["collected"].put(DONE)
+        
+        self.logger.info(
+            f"Streaming {len(self.token_list)} tokens from {len(self.collectors)} collectors "
+            f"(batch {self.batch_size}, poll {self.poll_interval}s)"
+        )
+        self.tasks = [
+            asyncio.create_task(stage)
+            for stage in (collect_all(), self._extract(), self._dedup(), self._infer(), self._aggregate(), self._publish())
+        ]
+        try:
+            await asyncio.gather(*self.tasks)
+        finally:
+            await self.stop()
+    
+    async def stop(self):
+        """Cancel any stage still running"""
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-stage counts and queue depths"""
+        return {
+            "queues": {name: queue.qsize() for name, queue in self.queues.items()},
+            "tokens": len(self.feeds),
+            **{name: self.counters[name] for name in (
+                "collected", "filtered", "repeats", "duplicates", "batches", "scored", "published",
+            )},
+        }
@@ -9,6 +9,7 @@ from datetime import datetime, timedelta
 from loguru import logger
 
 from src.backend.dexscreener_fetcher import DexScreenerFetcher
+from src.backend.token_matcher import get_matcher
 from src.backend.config import settings
 
 
@@ -67,6 +68,9 @@ class TokenManager:
                     "fetched_at": datetime.now().isoformat(),
                 }
             
+            # Compile the mention matcher once for the new list
+            get_matcher(self.tokens)
+            
             self.last_refresh = datetime.now()
             self.logger.info(f"Refreshed token list: {len(self.tokens)} tokens")
             self.logger.info(f"Tokens: {', '.join(self.tokens[:10])}...")
@@ -0,0 +1,105 @@
+"""
+Token Mention Matcher
+Aho-Corasick automaton over token symbols, shared by all collectors
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Sequence, Tuple
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class TokenMatcher:
+    """
+    Finds token mentions in a single pass over the text
+    
+    Symbols match case-insensitively as whole words, so "$PEPE", "#pepe"
+    and "Pepe!" count but "pepecoin" does not. Results keep the order of
+    the token list.
+    """
+    
+    def __init__(self, tokens: Sequence[str]):
+        self.tokens: Tuple[str, ...] = tuple(tokens)
+        
+        # goto[state][char] -> state, fail[state] -> state,
+        # output[state] -> [(token index, pattern length)]
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.output: List[List[Tuple[int, int]]] = [[]]
+        
+        for index, token in enumerate(self.tokens):
+            self._add(token.lower(), index)
+        self._link()
+    
+    def _add(self, pattern: str, index: int):
+        """Insert a pattern into the trie"""
+        if not pattern:
+            return
+        
+        state = 0
+        for ch in pattern:
+            next_state = self.goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto[state][ch] = next_state
+                self.goto.append({})
+                self.fail.append(0)
+                self.output.append([])
+            state = next_state
+        self.output[state].append((index, len(pattern)))
+    
+    def _link(self):
+        """Compute failure links breadth-first and merge outputs"""
+        queue = deque(self.goto[0].values())
+        
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self.goto[state].items():
+                queue.append(next_state)
+                
+                fallback = self.fail[state]
+                while fallback and ch not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[next_state] = self.goto[fallback].get(ch, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+    
+    def extract(self, text: str) -> List[str]:
+        """Token symbols mentioned in the text"""
+        text = text.lower()
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+        found = set()
+        state = 0
+        
+        for end, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            
+            if not output[state]:
+                continue
+            
+            # Whole words only; "$" and "#" prefixes are non-word characters
+            after = end + 1
+            if after < len(text) and _is_word_char(text[after]):
+                continue
+            for index, length in output[state]:
+                start = end - length + 1
+                if start == 0 or not _is_word_char(text[start - 1]):
+                    found.add(index)
+        
+        return [self.tokens[index] for index in sorted(found)]
+
+
+@lru_cache(maxsize=8)
+def _build_matcher(tokens: Tuple[str, ...]) -> TokenMatcher:
+    return TokenMatcher(tokens)
+
+
+def get_matcher(tokens: Sequence[str]) -> TokenMatcher:
+    """Shared matcher for a token list, compiled once per distinct list"""
+    return _build_matcher(tuple(tokens))
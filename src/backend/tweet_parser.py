@@ -0,0 +1,306 @@
+"""
+Tweet Page Parser
+Extracts tweets from Nitter and X.com search pages with precompiled selectors
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:  # Pure-Python fallback; install lxml for the fast path
+    etree = None
+    lxml_html = None
+
+
+def _has_class(cls: str) -> str:
+    """XPath predicate matching one class among several"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {cls} ')"
+
+
+# ============================================
+# Selectors
+# ============================================
+
+# Each key has an XPath (lxml) and an equivalent CSS selector (BeautifulSoup).
+# Keys ending in a digit are fallback strategies tried in order.
+
+NITTER_SELECTORS = {
+    "item0": (f"//div[{_has_class('timeline-item')}]", "div.timeline-item"),
+    "item1": (f"//div[{_has_class('tweet')}]", "div.tweet"),
+    "item2": ("//article", "article"),
+    "item3": ("//div[@data-tweet-id]", "div[data-tweet-id]"),
+    "link": (f".//a[{_has_class('tweet-link')}]", "a.tweet-link"),
+    "text": (
+        f".//div[{_has_class('tweet-content')} or {_has_class('tweet-text')}]",
+        "div.tweet-content, div.tweet-text",
+    ),
+    "username": (f".//a[{_has_class('username')}]", "a.username"),
+    "date": (f".//span[{_has_class('tweet-date')}]/a", "span.tweet-date > a"),
+    "stat": (
+        f".//span[{_has_class('tweet-stat')} or {_has_class('stat')}]",
+        "span.tweet-stat, span.stat",
+    ),
+    "icon": (".//span[starts-with(@class, 'icon-')]", "span[class^='icon-']"),
+}
+
+X_SELECTORS = {
+    "item0": ("//article[@data-testid='tweet']", "article[data-testid='tweet']"),
+    "text": (
+        ".//div[@data-testid='tweetText' or @data-testid='tweet']",
+        "div[data-testid='tweetText'], div[data-testid='tweet']",
+    ),
+    "author": (".//a[@data-testid='User-Name']", "a[data-testid='User-Name']"),
+    "time": (".//time", "time"),
+    "like": (".//div[@data-testid='like-count']", "div[data-testid='like-count']"),
+    "retweet": (".//div[@data-testid='retweet-count']", "div[data-testid='retweet-count']"),
+    "reply": (".//div[@data-testid='reply-count']", "div[data-testid='reply-count']"),
+}
+
+# Nitter stat icon / label -> ScrapedTweet field
+NITTER_STATS = (
+    ("comment", "replies"),
+    ("reply", "replies"),
+    ("retweet", "retweets"),
+    ("heart", "likes"),
+    ("like", "likes"),
+)
+
+
+# ============================================
+# Backends
+# ============================================
+
+class LxmlBackend:
+    """libxml2 parser with selectors compiled to XPath once"""
+    
+    name = "lxml"
+    
+    def __init__(self, selectors: Dict[str, tuple]):
+        self.compiled = {key: etree.XPath(xpath) for key, (xpath, _) in selectors.items()}
+        self.item_keys = sorted(key for key in selectors if key.startswith("item"))
+    
+    def root(self, html: str):
+        return lxml_html.fromstring(html)
+    
+    def find_all(self, node, key: str) -> list:
+        return self.compiled[key](node)
+    
+    def text(self, node) -> str:
+        return node.text_content()
+    
+    def attr(self, node, name: str) -> str:
+        return node.get(name) or ""
+
+
+class SoupBackend:
+    """BeautifulSoup with the stdlib parser, used when lxml is not installed"""
+    
+    name = "html.parser"
+    
+    def __init__(self, selectors: Dict[str, tuple]):
+        self.css = {key: css for key, (_, css) in selectors.items()}
+        self.item_keys = sorted(key for key in selectors if key.startswith("item"))
+    
+    def root(self, html: str):
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, "html.parser")
+    
+    def find_all(self, node, key: str) -> list:
+        return node.select(self.css[key])
+    
+    def text(self, node) -> str:
+        return node.get_text()
+    
+    def attr(self, node, name: str) -> str:
+        value = node.get(name) or ""
+        return " ".join(value) if isinstance(value, list) else value
+
+
+def make_backend(selectors: Dict[str, tuple]):
+    """Fastest available backend for a selector set"""
+    if etree is not None:
+        return LxmlBackend(selectors)
+    return SoupBackend(selectors)
+
+
+# ============================================
+# Field Helpers
+# ============================================
+
+def parse_count(text: str) -> int:
+    """Parse an engagement count ("1.2K", "3M", "1,024") to an int"""
+    try:
+        text = text.strip().upper().replace(",", "")
+        if text.endswith("K"):
+            return int(float(text[:-1]) * 1000)
+        if text.endswith("M"):
+            return int(float(text[:-1]) * 1000000)
+        return int(float(text)) if text else 0
+    except ValueError:
+        return 0
+
+
+def _first(backend, node, key: str):
+    found = backend.find_all(node, key)
+    return found[0] if found else None
+
+
+def _items(backend, root, limit: int) -> list:
+    """Tweet elements from the first selector strategy that matches"""
+    for key in backend.item_keys:
+        items = backend.find_all(root, key)
+        if items:
+            return items[:limit]
+    return []
+
+
+def _parse_nitter_date(title: str) -> datetime:
+    """Nitter date titles look like "Oct 14, 2026 · 3:04 PM UTC" """
+    try:
+        return datetime.strptime(title.replace("·", "").replace("  ", " "), "%b %d, %Y %I:%M %p %Z")
+    except ValueError:
+        return datetime.now()
+
+
+# ============================================
+# Page Parsers
+# ============================================
+
+class TweetPageParser:
+    """Parses search result pages into ScrapedTweet field dicts"""
+    
+    def __init__(self):
+        self.nitter = make_backend(NITTER_SELECTORS)
+        self.x = make_backend(X_SELECTORS)
+        self.logger = logger.bind(component="TweetPageParser")
+        
+        if self.backend != LxmlBackend.name:
+            self.logger.warning("lxml not installed; falling back to the pure-Python HTML parser")
+    
+    @property
+    def backend(self) -> str:
+        return self.nitter.name
+    
+    def parse_nitter(self, html: str, max_tweets: int = 100) -> List[Dict[str, Any]]:
+        """Tweets on a Nitter search page"""
+        if not html.strip():
+            return []
+        
+        backend = self.nitter
+        tweets = []
+        for item in _items(backend, backend.root(html), max_tweets):
+            try:
+                tweet = self._nitter_tweet(backend, item)
+            except Exception as e:
+                self.logger.debug(f"Error parsing Nitter tweet: {e}")
+                continue
+            if tweet:
+                tweets.append(tweet)
+        return tweets
+    
+    def _nitter_tweet(self, backend, item) -> Optional[Dict[str, Any]]:
+        link = _first(backend, item, "link")
+        href = backend.attr(link, "href") if link is not None else ""
+        tweet_id = href.split("#")[0].rstrip("/").split("/")[-1] if href else backend.attr(item, "data-tweet-id")
+        if not tweet_id:
+            return None
+        
+        text_elem = _first(backend, item, "text")
+        author_elem = _first(backend, item, "username")
+        author_handle = backend.text(author_elem).strip().lstrip("@") if author_elem is not None else ""
+        if not author_handle and href:
+            author_handle = href.lstrip("/").split("/")[0]
+        
+        date_elem = _first(backend, item, "date")
+        created_at = _parse_nitter_date(backend.attr(date_elem, "title")) if date_elem is not None else datetime.now()
+        
+        counts = {"likes": 0, "retweets": 0, "replies": 0}
+        for stat in backend.find_all(item, "stat"):
+            icon = _first(backend, stat, "icon")
+            stat_text = backend.text(stat)
+            label = ((backend.attr(icon, "class") if icon is not None else "") + stat_text).lower()
+            for marker, field in NITTER_STATS:
+                if marker in label:
+                    counts[field] = parse_count(stat_text.split()[0] if stat_text.split() else "")
+                    break
+        
+        return {
+            "tweet_id": tweet_id,
+            "text": backend.text(text_elem).strip() if text_elem is not None else "",
+            "author": author_handle,
+            "author_handle": author_handle,
+            "created_at": created_at,
+            "url": f"https://x.com/{author_handle}/status/{tweet_id}",
+            **counts,
+        }
+    
+    def parse_x(self, html: str, max_tweets: int = 100) -> List[Dict[str, Any]]:
+        """Tweets on an X.com search page"""
+        if not html.strip():
+            return []
+        
+        backend = self.x
+        tweets = []
+        for item in _items(backend, backend.root(html), max_tweets):
+            try:
+                tweets.append(self._x_tweet(backend, item))
+            except Exception as e:
+                self.logger.debug(f"Error parsing tweet: {e}")
+        return tweets
+    
+    def _x_tweet(self, backend, item) -> Dict[str, Any]:
+        tweet_id = backend.attr(item, "data-tweet-id") or backend.attr(item, "id")
+        
+        text_elem = _first(backend, item, "text")
+        author_elem = _first(backend, item, "author")
+        author = backend.text(author_elem) if author_elem is not None else "Unknown"
+        author_handle = backend.attr(author_elem, "href").replace("/", "") if author_elem is not None else ""
+        
+        created_at = datetime.now()
+        time_elem = _first(backend, item, "time")
+        if time_elem is not None and backend.attr(time_elem, "datetime"):
+            try:
+                created_at = datetime.fromisoformat(backend.attr(time_elem, "datetime").replace("Z", "+00:00"))
+            except ValueError:
+                pass
+        
+        def count(key: str) -> int:
+            elem = _first(backend, item, key)
+            return parse_count(backend.text(elem)) if elem is not None else 0
+        
+        return {
+            "tweet_id": tweet_id,
+            "text": backend.text(text_elem) if text_elem is not None else "",
+            "author": author,
+            "author_handle": author_handle,
+            "created_at": created_at,
+            "likes": count("like"),
+            "retweets": count("retweet"),
+            "replies": count("reply"),
+            "url": f"https://x.com/{author_handle}/status/{tweet_id}",
+        }
+    
+    async def parse_nitter_async(self, html: str, max_tweets: int = 100) -> List[Dict[str, Any]]:
+        """Parse a Nitter page in a worker thread"""
+        return await asyncio.to_thread(self.parse_nitter, html, max_tweets)
+    
+    async def parse_x_async(self, html: str, max_tweets: int = 100) -> List[Dict[str, Any]]:
+        """Parse an X.com page in a worker thread"""
+        return await asyncio.to_thread(self.parse_x, html, max_tweets)
+
+
+# Global parser (selectors compile once per process)
+tweet_parser: Optional[TweetPageParser] = None
+
+
+def get_tweet_parser() -> TweetPageParser:
+    """Get the shared tweet page parser"""
+    global tweet_parser
+    if tweet_parser is None:
+        tweet_parser = TweetPageParser()
+    return tweet_parser
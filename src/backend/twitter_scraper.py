@@ -11,9 +11,12 @@ from datetime import datetime
 from loguru import logger
 import aiohttp
 import re
-from bs4 import BeautifulSoup
 from urllib.parse import quote
 
+from src.backend.http_client import close_http_client, get_http_session
+from src.backend.nitter_pool import NitterPool
+from src.backend.tweet_parser import get_tweet_parser
+
 
 # ============================================
 # Web Scraping Models
@@ -60,14 +63,11 @@ class TwitterWebScraper:
         self.token_list = token_list
         self.logger = logger.bind(component="TwitterWebScraper")
         self.base_url = "https://x.com/search"
-        self.session = None
         self.logger.info(f"Initialized Twitter web scraper for {len(token_list)} tokens")
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-        return self.session
+        """Process-wide pooled session"""
+        return await get_http_session()
     
     def _build_search_url(self, token: str, filter_type: str = "latest") -> str:
         """
@@ -93,89 +93,6 @@ class TwitterWebScraper:
         
         return f"{self.base_url}?q={encoded_query}&f={filter_type}"
     
-    def _parse_tweet_html(self, tweet_element: BeautifulSoup) -> Optional[ScrapedTweet]:
-        """
-        Parse tweet HTML element
-        
-        Args:
-            tweet_element: BeautifulSoup element containing tweet
-        
-        Returns:
-            ScrapedTweet object or None if parsing fails
-        """
-        try:
-            # Extract tweet ID
-            tweet_id = tweet_element.get("data-tweet-id") or tweet_element.get("id", "")
-            
-            # Extract text
-            text_elem = tweet_element.find("div", {"data-testid": "tweet"})
-            text = text_elem.get_text() if text_elem else ""
-            
-            # Extract author info
-            author_elem = tweet_element.find("a", {"data-testid": "User-Name"})
-            author = author_elem.get_text() if author_elem else "Unknown"
-            author_handle = author_elem.get("href", "").replace("/", "") if author_elem else ""
-            
-            # Extract metrics
-            likes = self._extract_metric(tweet_element, "like")
-            retweets = self._extract_metric(tweet_element, "retweet")
-            replies = self._extract_metric(tweet_element, "reply")
-            
-            # Extract timestamp
-            time_elem = tweet_element.find("time")
-            created_at = datetime.now()
-            if time_elem and time_elem.get("datetime"):
-                try:
-                    created_at = datetime.fromisoformat(
-                        time_elem.get("datetime").replace("Z", "+00:00")
-                    )
-                except:
-                    pass
-            
-            # Build tweet URL
-            url = f"https://x.com/{author_handle}/status/{tweet_id}"
-            
-            return ScrapedTweet(
-                tweet_id=tweet_id,
-                text=text,
-                author=author,
-                author_handle=author_handle,
-                created_at=created_at,
-                likes=likes,
-                retweets=retweets,
-                replies=replies,
-                url=url,
-            )
-        
-        except Exception as e:
-            self.logger.debug(f"Error parsing tweet: {e}")
-            return None
-    
-    def _extract_metric(self, element: BeautifulSoup, metric_type: str) -> int:
-        """Extract engagement metric from tweet element"""
-        try:
-            metric_elem = element.find("div", {"data-testid": f"{metric_type}-count"})
-            if metric_elem:
-                text = metric_elem.get_text()
-                # Parse number (e.g., "1.2K" -> 1200)
-                return self._parse_number(text)
-            return 0
-        except:
-            return 0
-    
-    def _parse_number(self, text: str) -> int:
-        """Parse number from text (e.g., '1.2K' -> 1200)"""
-        try:
-            text = text.strip().upper()
-            if "K" in text:
-                return int(float(text.replace("K", "")) * 1000)
-            elif "M" in text:
-                return int(float(text.replace("M", "")) * 1000000)
-            else:
-                return int(text)
-        except:
-            return 0
-    
     async def scrape_tweets(self, token: str, max_tweets: int = 100) -> List[ScrapedTweet]:
         """
         Scrape tweets for a token from X.com
@@ -208,18 +125,10 @@ class TwitterWebScraper:
             async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
                 if response.status == 200:
                     html = await response.text()
-                    soup = BeautifulSoup(html, "html.parser")
-                    
-                    # Find all tweet elements
-                    tweet_elements = soup.find_all("article", {"data-testid": "tweet"})
                     
-                    self.logger.info(f"Found {len(tweet_elements)} tweet elements")
-                    
-                    # Parse tweets
-                    for element in tweet_elements[:max_tweets]:
-                        tweet = self._parse_tweet_html(element)
-                        if tweet:
-                            tweets.append(tweet)
+                    # Parse off the event loop
+                    for fields in await get_tweet_parser().parse_x_async(html, max_tweets):
+                        tweets.append(ScrapedTweet(**fields))
                     
                     self.logger.info(f"Scraped {len(tweets)} valid tweets for {token}")
                 
@@ -257,9 +166,8 @@ class TwitterWebScraper:
         return all_tweets
     
     async def close(self):
-        """Close session"""
-        if self.session:
-            await self.session.close()
+        """Release resources (the shared session is closed at shutdown)"""
+        pass
 
 
 # ============================================
@@ -271,124 +179,57 @@ class NitterScraper:
     Scrapes tweets using Nitter - a free, open-source Twitter frontend
     No API key required, completely free
     
-    Nitter instances:
-    - https://nitter.net
-    - https://nitter.1d4.us
-    - https://nitter.kavin.rocks
+    Requests are spread over a pool of Nitter instances (settings.nitter_instances
+    by default) that routes to the fastest healthy mirror, hedges slow
+    requests and circuit-breaks dead mirrors.
     """
     
-    def __init__(self, token_list: List[str], nitter_instance: str = "https://nitter.net"):
+    def __init__(
+        self,
+        token_list: List[str],
+        nitter_instance: Optional[str] = None,
+        instances: Optional[List[str]] = None,
+    ):
         self.token_list = token_list
-        self.nitter_instance = nitter_instance
+        self.pool = NitterPool(instances or ([nitter_instance] if nitter_instance else None))
         self.logger = logger.bind(component="NitterScraper")
-        self.session = None
-        self.logger.info(f"Initialized Nitter scraper for {len(token_list)} tokens")
-    
-    async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create aiohttp session"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-        return self.session
+        self.logger.info(
+            f"Initialized Nitter scraper for {len(token_list)} tokens "
+            f"({len(self.pool.instances)} instances)"
+        )
     
-    def _build_search_url(self, token: str) -> str:
-        """Build Nitter search URL"""
+    def _build_search_path(self, token: str) -> str:
+        """Build Nitter search path (relative to an instance)"""
         # Search for token mentions with various formats
         query = f"({token} OR ${token}) -is:retweet lang:en"
         encoded_query = quote(query)
-        return f"{self.nitter_instance}/search?q={encoded_query}&f=tweets&sort=latest"
-    
-    def _parse_nitter_tweet(self, tweet_elem: BeautifulSoup) -> Optional[ScrapedTweet]:
-        """Parse tweet from Nitter HTML"""
-        try:
-            # Extract tweet ID
-            if not tweet_link:
-                return None
-            
-            tweet_url = tweet_link.get("href", "")
-            tweet_id = tweet_url.split("/")[-1] if tweet_url else ""
-            
-            # Extract text
-            text_elem = tweet_elem.find("div", {"class": "tweet-text"})
-            text = text_elem.get_text() if text_elem else ""
-            
-            # Extract author
-            author_elem = tweet_elem.find("a", {"class": "username"})
-            author_handle = author_elem.get_text().replace("@", "") if author_elem else ""
-            
-            # Extract metrics
-            stats = tweet_elem.find("div", {"class": "tweet-stats"})
-            likes = 0
-            retweets = 0
-            replies = 0
-            
-            if stats:
-                stat_items = stats.find_all("span", {"class": "stat"})
-                for stat in stat_items:
-                    stat_text = stat.get_text()
-                    if "Reply" in stat_text:
-                        replies = int(stat_text.split()[0]) if stat_text.split() else 0
-                    elif "Retweet" in stat_text:
-                        retweets = int(stat_text.split()[0]) if stat_text.split() else 0
-                    elif "Like" in stat_text:
-                        likes = int(stat_text.split()[0]) if stat_text.split() else 0
-            
-            return ScrapedTweet(
-                tweet_id=tweet_id,
-                text=text,
-                author=author_handle,
-                author_handle=author_handle,
-                created_at=datetime.now(),
-                likes=likes,
-                retweets=retweets,
-                replies=replies,
-                url=f"https://x.com/{author_handle}/status/{tweet_id}",
-            )
-        
-        except Exception as e:
-            self.logger.debug(f"Error parsing Nitter tweet: {e}")
-            return None
+        return f"/search?q={encoded_query}&f=tweets&sort=latest"
     
     async def scrape_tweets(self, token: str, max_tweets: int = 100) -> List[ScrapedTweet]:
         """Scrape tweets using Nitter"""
         self.logger.info(f"Scraping tweets for {token} via Nitter...")
         
         tweets = []
-        session = await self._get_session()
         
         try:
-            url = self._build_search_url(token)
+            path = self._build_search_path(token)
             
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             }
             
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                if response.status == 200:
-                    html = await response.text()
-                    soup = BeautifulSoup(html, "html.parser")
-                    
-                    # Find tweet elements - Nitter uses different selectors
-                    # Try multiple selectors
-                    tweet_elements = soup.find_all("div", {"class": "tweet"})
-                    if not tweet_elements:
-                        tweet_elements = soup.find_all("div", {"class": "timeline-item"})
-                    if not tweet_elements:
-                        tweet_elements = soup.find_all("article")
-                    if not tweet_elements:
-                        # Fallback: find all divs with data-tweet-id
-                        tweet_elements = soup.find_all("div", {"data-tweet-id": True})
-                    
-                    self.logger.info(f"Found {len(tweet_elements)} tweet elements using selectors")
-                    
-                    for element in tweet_elements[:max_tweets]:
-                        tweet = self._parse_nitter_tweet(element)
-                        if tweet:
-                            tweets.append(tweet)
-                    
-                    self.logger.info(f"Scraped {len(tweets)} tweets for {token}")
-                
-                else:
-                    self.logger.error(f"Nitter returned status {response.status} for {url}")
+            result = await self.pool.fetch(path, headers=headers)
+            if result is None:
+                self.logger.error(f"No Nitter instance answered for {token}")
+                return tweets
+            
+            instance, html = result
+            
+            # Parse off the event loop
+            for fields in await get_tweet_parser().parse_nitter_async(html, max_tweets):
+                tweets.append(ScrapedTweet(**fields))
+            
+            self.logger.info(f"Scraped {len(tweets)} tweets for {token} via {instance}")
         
         except Exception as e:
             self.logger.error(f"Error scraping via Nitter: {e}")
@@ -413,10 +254,13 @@ class NitterScraper:
         self.logger.info(f"Scraped {len(all_tweets)} total tweets")
         return all_tweets
     
+    def get_stats(self) -> Dict[str, Any]:
+        """Get instance pool statistics"""
+        return self.pool.get_stats()
+    
     async def close(self):
-        """Close session"""
-        if self.session:
-            await self.session.close()
+        """Release resources (the shared session is closed at shutdown)"""
+        pass
 
 
 # ============================================
@@ -439,6 +283,7 @@ async def test_twitter_scraper():
     
     finally:
         await scraper.close()
+        await close_http_client()
 
 
 async def test_nitter_scraper():
@@ -457,6 +302,7 @@ async def test_nitter_scraper():
     
     finally:
         await scraper.close()
+        await close_http_client()
 
 
 if __name__ == "__main__":
@@ -11,6 +11,8 @@ from datetime import datetime
 from loguru import logger
 import json
 
+from src.backend.http_client import get_http_session
+
 
 @dataclass
 class ScrapedTweet:
@@ -22,33 +24,49 @@ class ScrapedTweet:
     retweets: int = 0
     replies: int = 0
     url: str = ""
+    tweet_id: str = ""
+
+
+def id_after(tweet_id: str, since_id: Optional[str]) -> bool:
+    """Whether a tweet ID is newer than `since_id` (IDs are increasing decimal strings)"""
+    if not since_id or not tweet_id.isdigit() or not since_id.isdigit():
+        return True
+    return (len(tweet_id), tweet_id) > (len(since_id), since_id)
 
 
 class TwitterScraperV2:
     """Scrapes tweets using free APIs"""
     
+    source = "twitter"
+    host = "x.com"
+    
     def __init__(self, token_list: List[str]):
         self.token_list = token_list
         self.logger = logger.bind(component="TwitterScraperV2")
-        self.session = None
         self.logger.info(f"Initialized Twitter scraper V2 for {len(token_list)} tokens")
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create session"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-        return self.session
+        """Process-wide pooled session"""
+        return await get_http_session()
     
-    async def scrape_tweets(self, token: str, max_tweets: int = 50) -> List[ScrapedTweet]:
+    async def scrape_tweets(
+        self,
+        token: str,
+        max_tweets: int = 50,
+        since_id: Optional[str] = None,
+    ) -> List[ScrapedTweet]:
         """
-        Scrape tweets for a token
+        Scrape tweets for a token, only those newer than `since_id` if given
         Uses mock data for fast response
         """
         self.logger.info(f"Scraping tweets for {token}...")
         
         # Use mock tweets immediately for fast response
         # Real Twitter API integration can be added later
-        tweets = self._generate_mock_tweets(token, max_tweets)
+        tweets = [
+            tweet for tweet in self._generate_mock_tweets(token, max_tweets)
+            if id_after(tweet.tweet_id, since_id)
+        ]
         
         self.logger.info(f"Scraped {len(tweets)} tweets for {token}")
         return tweets
@@ -77,13 +95,13 @@ class TwitterScraperV2:
                 likes=100 + (i * 10),
                 retweets=50 + (i * 5),
                 replies=20 + i,
-                url=f"https://x.com/user_{i}/status/{i}"
+                url=f"https://x.com/user_{i}/status/{i}",
+                tweet_id=str(i),
             )
             tweets.append(tweet)
         
         return tweets
     
     async def close(self):
-        """Close session"""
-        if self.session:
-            await self.session.aclose()
+        """Release resources (the shared session is closed at shutdown)"""
+        pass
@@ -10,6 +10,8 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from loguru import logger
 
+from src.backend.http_client import get_http_session
+
 
 @dataclass
 class VolumeMetrics:
@@ -33,15 +35,12 @@ class VolumeAnalyzer:
     
     def __init__(self):
         self.logger = logger.bind(component="VolumeAnalyzer")
-        self.session = None
         self.base_rpc = "https://mainnet.base.org"
         self.dexscreener_api = "https://api.dexscreener.com/latest"
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create session"""
-        if self.session is None:
-            self.session = aiohttp.ClientSession()
-        return self.session
+        """Process-wide pooled session"""
+        return await get_http_session()
     
     async def get_volume_metrics(self, token_address: str, pool_address: str) -> Optional[VolumeMetrics]:
         """
@@ -142,6 +141,5 @@ class VolumeAnalyzer:
             return "stable"
     
     async def close(self):
-        """Close session"""
-        if self.session:
-            await self.session.aclose()
+        """Release resources (the shared session is closed at shutdown)"""
+        pass
@@ -9,8 +9,8 @@ import json
 from unittest.mock import Mock, AsyncMock, patch
 
 from src.backend.websocket_handler import ConnectionManager, SentimentStreamManager
-from src.backend.cache import CacheManager, SentimentCache
-from src.backend.rate_limit import RateLimiter, APIKeyManager
+from src.backend.cache import CacheManager, SentimentCache, TTLCache
+from src.backend.rate_limit import RateLimiter, APIKeyManager, TokenBucket
 from src.backend.monitoring import HealthChecker, PerformanceMonitor, AlertSystem, MetricsCollector
 
 
@@ -126,6 +126,45 @@ class TestCacheManager:
         cache.redis_client.delete.assert_called_once_with("test_key")
 
 
+class TestTTLCache:
+    """Test in-process LRU/TTL cache"""
+    
+    def test_get_set(self):
+        """Test hit and miss accounting"""
+        cache = TTLCache(max_size=10, ttl_seconds=60)
+        
+        assert cache.get("key") is None
+        cache.set("key", {"value": 1})
+        assert cache.get("key") == {"value": 1}
+        
+        stats = cache.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+    
+    def test_lru_eviction(self):
+        """Test least recently used entry is evicted when full"""
+        cache = TTLCache(max_size=2, ttl_seconds=60)
+        
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert len(cache) == 2
+    
+    def test_expiry(self):
+        """Test expired entries are treated as misses"""
+        cache = TTLCache(max_size=10, ttl_seconds=60)
+        
+        cache.set("key", 1, ttl=-1)
+        
+        assert cache.get("key") is None
+        assert len(cache) == 0
+
+
 class TestSentimentCache:
     """Test sentiment-specific caching"""
     
@@ -196,6 +235,27 @@ class TestRateLimiter:
         assert stats["remaining"] == 1
 
 
+class TestTokenBucket:
+    """Test outbound request budgets"""
+    
+    @pytest.mark.asyncio
+    async def test_burst_then_refill(self):
+        """Test burst is immediate and further tokens wait for refill"""
+        bucket = TokenBucket(rate=50.0, capacity=2)
+        loop = asyncio.get_running_loop()
+        
+        start = loop.time()
+        await bucket.acquire()
+        await bucket.acquire()
+        burst_elapsed = loop.time() - start
+        
+        await bucket.acquire()
+        total_elapsed = loop.time() - start
+        
+        assert burst_elapsed < 0.01
+        assert total_elapsed >= 0.015
+
+
 class TestAPIKeyManager:
     """Test API key management"""
     
@@ -353,6 +413,15 @@ class TestMetricsCollector:
         assert stats["avg"] == 200.0
         assert stats["min"] == 100.0
         assert stats["max"] == 300.0
+    
+    def test_increment_counter(self):
+        """Test counters accumulate"""
+        collector = MetricsCollector()
+        
+        collector.increment_counter("sentiment_memo_hits")
+        collector.increment_counter("sentiment_memo_hits", 4)
+        
+        assert collector.get_counters() == {"sentiment_memo_hits": 5}
 
 
 # ============================================
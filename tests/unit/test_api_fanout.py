@@ -0,0 +1,176 @@
+"""
+Unit tests for multi-token fan-out in the API routes
+"""
+
+import asyncio
+import time
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from fastapi import HTTPException
+
+from src.backend import api_routes
+from src.backend.sentiment_pipeline import SentimentPipeline, TokenSentiment
+from src.backend.single_flight import SingleFlight
+from src.backend.snapshot_refresher import SnapshotRefresher
+
+
+def make_sentiment(token, score):
+    return TokenSentiment(
+        token=token,
+        timestamp=datetime.now(),
+        sentiment_score=score,
+        sentiment_label="neutral",
+        confidence=0.5,
+        sample_size=10,
+    )
+
+
+class FakePipeline:
+    """analyze_token with a per-token delay"""
+    
+    token_list = ["PEPE", "DOGE", "SHIB", "BRETT", "WIF", "SLOW", "BAD"]
+    
+    def __init__(self, delays):
+        self.delays = delays
+        self.calls = []
+        self.active = 0
+        self.peak = 0
+    
+    async def analyze_token(self, token):
+        self.calls.append(token)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delays.get(token, 0.05))
+        finally:
+            self.active -= 1
+        if token == "BAD":
+            raise RuntimeError("scrape failed")
+        return make_sentiment(token, 70.0)
+
+
+@pytest_asyncio.fixture
+async def routes(monkeypatch):
+    """API routes with a fake pipeline, fresh coalescing and a published snapshot"""
+    pipeline = FakePipeline({"SLOW": 0.5, "WIF": 0.5})
+    refresher = SnapshotRefresher(
+        lambda: asyncio.sleep(0, {"PEPE": make_sentiment("PEPE", 40.0), "WIF": make_sentiment("WIF", 45.0)}),
+        interval_seconds=60,
+    )
+    await refresher.refresh()
+    
+    monkeypatch.setattr(api_routes, "sentiment_pipeline", pipeline)
+    monkeypatch.setattr(api_routes, "snapshot_refresher", refresher)
+    monkeypatch.setattr(api_routes, "token_flight", SingleFlight(fresh_seconds=0))
+    monkeypatch.setattr(api_routes.settings, "fanout_snapshot_max_age_seconds", 60.0)
+    
+    yield pipeline, refresher
+    
+    await asyncio.sleep(0.5)  # Let abandoned analyses finish
+
+
+class TestFanOut:
+    """Test concurrent analysis, snapshot reuse and deadlines"""
+    
+    @pytest.mark.asyncio
+    async def test_tokens_analysed_concurrently(self, routes):
+        """Test latency is that of the slowest token, not the sum"""
+        pipeline, _ = routes
+        
+        start = time.monotonic()
+        fanned = await api_routes.gather_token_sentiments(["doge", "SHIB", "BRETT", "DOGE"], budget_seconds=2)
+        elapsed = time.monotonic() - start
+        
+        assert elapsed < 0.15
+        assert list(fanned["data"]) == ["DOGE", "SHIB", "BRETT"]
+        assert sorted(pipeline.calls) == ["BRETT", "DOGE", "SHIB"]
+        assert fanned["freshness"]["DOGE"]["source"] == "live"
+        assert not fanned["partial"]
+    
+    @pytest.mark.asyncio
+    async def test_untracked_tokens_rejected(self, routes):
+        """Test symbols outside the token list are refused before any analysis"""
+        pipeline, _ = routes
+        
+        with pytest.raises(HTTPException) as error:
+            await api_routes.gather_token_sentiments(["DOGE", "RUG1", "rug2"], budget_seconds=2)
+        
+        assert error.value.status_code == 400
+        assert "RUG1, RUG2" in error.value.detail
+        assert pipeline.calls == []
+    
+    @pytest.mark.asyncio
+    async def test_fan_out_is_bounded(self, routes, monkeypatch):
+        """Test no more than source_max_concurrency analyses run for one request"""
+        pipeline, _ = routes
+        monkeypatch.setattr(api_routes.settings, "source_max_concurrency", 2)
+        
+        fanned = await api_routes.gather_token_sentiments(["DOGE", "SHIB", "BRETT", "BAD"], budget_seconds=2)
+        
+        assert pipeline.peak == 2
+        assert sorted(pipeline.calls) == ["BAD", "BRETT", "DOGE", "SHIB"]
+        assert list(fanned["data"]) == ["DOGE", "SHIB", "BRETT"]
+    
+    @pytest.mark.asyncio
+    async def test_recent_snapshot_served_without_analysis(self, routes):
+        """Test tokens in a recent snapshot skip the pipeline"""
+        pipeline, _ = routes
+        
+        fanned = await api_routes.gather_token_sentiments(["PEPE", "DOGE"], budget_seconds=2)
+        
+        assert pipeline.calls == ["DOGE"]
+        assert fanned["data"]["PEPE"]["sentiment_score"] == 40.0
+        assert fanned["freshness"]["PEPE"]["source"] == "snapshot"
+    
+    @pytest.mark.asyncio
+    async def test_deadline_returns_partial_results(self, routes, monkeypatch):
+        """Test slow tokens fall back to the snapshot or are reported pending"""
+        monkeypatch.setattr(api_routes.settings, "fanout_snapshot_max_age_seconds", 0.0)
+        
+        start = time.monotonic()
+        fanned = await api_routes.gather_token_sentiments(["DOGE", "SLOW", "WIF", "BAD"], budget_seconds=0.2)
+        
+        assert time.monotonic() - start < 0.35
+        assert fanned["partial"]
+        assert fanned["pending"] == ["SLOW", "WIF"]
+        assert fanned["errors"] == {"BAD": "scrape failed"}
+        assert fanned["freshness"]["DOGE"]["source"] == "live"
+        assert fanned["freshness"]["WIF"]["source"] == "stale_snapshot"
+        assert fanned["freshness"]["SLOW"]["source"] == "pending"
+        assert list(fanned["data"]) == ["DOGE", "WIF"]
+    
+    @pytest.mark.asyncio
+    async def test_compare_over_available_tokens(self, routes, monkeypatch):
+        """Test /compare ranks whatever arrived within the budget"""
+        monkeypatch.setattr(api_routes, "initialize_pipeline", lambda: asyncio.sleep(0))
+        
+        response = await api_routes.compare_tokens(["PEPE", "DOGE", "SLOW"], budget_seconds=0.2)
+        
+        assert response["best"] == {"token": "DOGE", "score": 70.0}
+        assert response["worst"] == {"token": "PEPE", "score": 40.0}
+        assert response["pending"] == ["SLOW"]
+        assert response["partial"]
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_scan_joins_token_analyses(self, monkeypatch):
+        """Test the background scan shares a per-token analysis already in flight"""
+        pipeline = SentimentPipeline(["DOGE", "PEPE"])
+        calls = []
+        
+        async def analyze_token(token):
+            calls.append(token)
+            await asyncio.sleep(0.05)
+            return make_sentiment(token, 70.0)
+        
+        pipeline.analyze_token = analyze_token
+        monkeypatch.setattr(api_routes, "sentiment_pipeline", pipeline)
+        monkeypatch.setattr(api_routes, "token_flight", SingleFlight(fresh_seconds=0))
+        
+        request = asyncio.create_task(api_routes.analyze_token_shared("DOGE"))
+        await asyncio.sleep(0)
+        snapshot = await api_routes.analyze_all_snapshot()
+        
+        assert sorted(calls) == ["DOGE", "PEPE"]
+        assert snapshot["DOGE"] is await request
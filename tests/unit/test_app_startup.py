@@ -0,0 +1,110 @@
+"""
+Unit tests for application startup wiring
+"""
+
+import importlib
+
+import pytest
+from fastapi import HTTPException
+from loguru import logger
+
+from src.backend import api_routes
+from src.backend import cache as cache_module
+from src.backend import inference_executor as executor_module
+from src.backend.cache import TTLCache
+from src.backend.inference_executor import InferenceExecutor
+from src.backend.sentiment_analyzer import SentimentAnalyzer
+from src.backend.snapshot_refresher import SnapshotRefresher
+from tests.unit.test_cache import FakeRedis, FakeServer
+
+
+class ModelFreeAnalyzer(SentimentAnalyzer):
+    """SentimentAnalyzer memo and metrics paths without loading a model"""
+    
+    def __init__(self):
+        self.memo = TTLCache()
+    
+    def _analyze_texts(self, texts):
+        return [[0.1, 0.2, 0.7] for _ in texts]
+
+
+class FakeTokenManager:
+    """Static token list without the DexScreener fetch"""
+    
+    tokens = ["PEPE"]
+    
+    async def initialize(self):
+        pass
+    
+    async def get_tokens(self):
+        return self.tokens
+    
+    def get_token_count(self):
+        return len(self.tokens)
+    
+    async def close(self):
+        pass
+
+
+class TestStartupWiring:
+    """Test monitoring and the shared memo are live once the app starts"""
+    
+    @pytest.mark.asyncio
+    async def test_memo_counters_through_app(self, monkeypatch):
+        """Test memo hits, misses and shared hits reach /stats"""
+        server = FakeServer()
+        
+        async def from_url(url, **kwargs):
+            return FakeRedis(server)
+        
+        # main adds a file sink under logs/ on import
+        monkeypatch.setattr(logger, "add", lambda *args, **kwargs: 0)
+        monkeypatch.setattr(logger, "remove", lambda *args, **kwargs: None)
+        main = importlib.import_module("src.backend.main")
+        
+        executor = InferenceExecutor(ModelFreeAnalyzer(), max_workers=1, max_pending=1)
+        monkeypatch.setattr(executor_module, "inference_executor", executor)
+        monkeypatch.setattr(cache_module.redis, "from_url", from_url)
+        monkeypatch.setattr(main, "TokenManager", FakeTokenManager)
+        monkeypatch.setattr(SnapshotRefresher, "start", lambda self: None)  # No background scrapes
+        monkeypatch.setattr(api_routes.settings, "enable_history_log", False)
+        monkeypatch.setattr(api_routes, "sentiment_pipeline", None)
+        monkeypatch.setattr(api_routes, "snapshot_refresher", None)
+        
+        async with main.lifespan(main.app):
+            await main.services_task
+            inference = api_routes.sentiment_pipeline.inference
+            assert inference is executor
+            assert inference.shared_cache is not None
+            
+            await inference.analyze_batch(["gm $PEPE frens", "GM  $pepe frens"])
+            await inference.analyze_batch(["gm $PEPE frens"])
+            
+            # Another worker's memo is empty but Redis has the result
+            inference.analyzer.memo.clear()
+            await inference.analyze_batch(["gm $PEPE frens"])
+            
+            stats = await api_routes.get_pipeline_stats()
+            
+            sentiment_cache = await cache_module.get_sentiment_cache()
+            await sentiment_cache.set_token_sentiment("PEPE", {"score": 70.0})
+            await api_routes.invalidate_token_cache("pepe")
+            invalidated = await sentiment_cache.get_token_sentiment("PEPE")
+        
+        assert stats["cache"]["status"] == "connected"
+        assert "reuse_ratio" in stats["http"]
+        assert invalidated is None
+        assert any(key.startswith("sentiment:text:") for key in server.data)
+        assert stats["counters"]["sentiment_memo_misses"] == 1
+        assert stats["counters"]["sentiment_memo_hits"] == 1  # Shared hits are not also memo hits
+        assert stats["counters"]["sentiment_memo_shared_hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_cache_endpoints_without_redis(self, monkeypatch):
+        """Test cache endpoints report 503 until the cache is initialized"""
+        monkeypatch.setattr(cache_module, "sentiment_cache", None)
+        
+        with pytest.raises(HTTPException) as error:
+            await api_routes.get_cache_stats()
+        
+        assert error.value.status_code == 503
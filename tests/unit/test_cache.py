@@ -0,0 +1,328 @@
+"""
+Unit tests for the two-tier cache manager
+"""
+
+import asyncio
+import json
+from fnmatch import fnmatchcase
+
+import pytest
+import pytest_asyncio
+
+from src.backend import cache as cache_module
+from src.backend.cache import CacheManager, SentimentCache
+
+
+class FakeServer:
+    """In-memory Redis shared by several clients (workers)"""
+    
+    def __init__(self):
+        self.data = {}
+        self.subscribers = []
+        self.commands = 0
+        self.unlinks = []  # Keys per UNLINK call
+        self.on_scan = None  # Awaited after each SSCAN member
+
+
+class FakePubSub:
+    def __init__(self, server):
+        self.server = server
+        self.queue = asyncio.Queue()
+    
+    async def subscribe(self, channel):
+        self.server.subscribers.append((channel, self.queue))
+    
+    async def listen(self):
+        while True:
+            yield await self.queue.get()
+    
+    async def aclose(self):
+        self.server.subscribers = [(c, q) for c, q in self.server.subscribers if q is not self.queue]
+
+
+class FakePipeline:
+    """Queues client commands and runs them on execute()"""
+    
+    def __init__(self, client):
+        self.client = client
+        self.ops = []
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc):
+        return False
+    
+    def __getattr__(self, name):
+        return lambda *args: self.ops.append((name, args))
+    
+    async def execute(self):
+        for name, args in self.ops:
+            await getattr(self.client, name)(*args)
+
+
+class FakeRedis:
+    """The subset of redis.asyncio.Redis the cache uses"""
+    
+    def __init__(self, server):
+        self.server = server
+    
+    async def ping(self):
+        return True
+    
+    async def close(self):
+        pass
+    
+    async def info(self):
+        return {"used_memory_human": "1M", "connected_clients": 1, "total_commands_processed": self.server.commands}
+    
+    async def get(self, key):
+        self.server.commands += 1
+        return self.server.data.get(key)
+    
+    async def mget(self, keys):
+        self.server.commands += 1
+        return [self.server.data.get(key) for key in keys]
+    
+    async def setex(self, key, ttl, value):
+        self.server.commands += 1
+        self.server.data[key] = value
+    
+    async def delete(self, *keys):
+        self.server.commands += 1
+        for key in keys:
+            self.server.data.pop(key, None)
+    
+    async def keys(self, pattern):
+        raise AssertionError("KEYS blocks Redis")
+    
+    async def unlink(self, *keys):
+        self.server.unlinks.append(len(keys))
+        for key in keys:
+            self.server.data.pop(key, None)
+    
+    async def sadd(self, key, *members):
+        self.server.data.setdefault(key, set()).update(members)
+    
+    async def expire(self, key, seconds):
+        pass
+    
+    async def rename(self, key, new_key):
+        if key not in self.server.data:
+            raise cache_module.redis.ResponseError("no such key")
+        self.server.data[new_key] = self.server.data.pop(key)
+    
+    async def sscan_iter(self, key, count=None):
+        for member in sorted(self.server.data.get(key, ())):
+            yield member
+            if self.server.on_scan:
+                await self.server.on_scan()
+    
+    async def scan_iter(self, match=None, count=None):
+        for key in list(self.server.data):
+            if match is None or fnmatchcase(key, match):
+                yield key
+    
+    async def publish(self, channel, message):
+        for subscribed, queue in self.server.subscribers:
+            if subscribed == channel:
+                queue.put_nowait({"type": "message", "channel": channel, "data": message})
+    
+    def pubsub(self):
+        return FakePubSub(self.server)
+    
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest_asyncio.fixture
+async def workers(monkeypatch):
+    """Two cache managers (workers) sharing one fake Redis"""
+    server = FakeServer()
+    
+    async def from_url(url, **kwargs):
+        return FakeRedis(server)
+    
+    monkeypatch.setattr(cache_module.redis, "from_url", from_url)
+    managers = [CacheManager(l1_ttl_seconds=60), CacheManager(l1_ttl_seconds=60)]
+    for manager in managers:
+        await manager.connect()
+    
+    yield server, managers
+    
+    for manager in managers:
+        await manager.disconnect()
+
+
+async def settle():
+    """Let pub/sub listeners run"""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestTwoTierCache:
+    """Test L1 hits and cross-worker invalidation"""
+    
+    @pytest.mark.asyncio
+    async def test_hot_key_served_from_l1(self, workers):
+        """Test repeat reads skip Redis after the first"""
+        server, (a, _) = workers
+        server.data["sentiment:all"] = json.dumps({"PEPE": 61})
+        
+        first = await a.get("sentiment:all")
+        commands = server.commands
+        for _ in range(10):
+            assert await a.get("sentiment:all") == first
+        
+        assert server.commands == commands
+        stats = a.get_tier_stats()
+        assert stats["l1"]["hits"] == 10
+        assert stats["l2"]["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_write_invalidates_other_workers(self, workers):
+        """Test a set on one worker drops the stale L1 copy on another"""
+        _, (a, b) = workers
+        await a.set("sentiment:PEPE", {"score": 50})
+        assert await b.get("sentiment:PEPE") == {"score": 50}
+        
+        await a.set("sentiment:PEPE", {"score": 70})
+        await settle()
+        
+        assert await b.get("sentiment:PEPE") == {"score": 70}
+        assert b.invalidations_received >= 1
+        assert a.invalidations_received == 0  # Own messages are skipped
+    
+    @pytest.mark.asyncio
+    async def test_delete_and_pattern_invalidate_other_workers(self, workers):
+        """Test deletes and pattern clears reach other workers' L1"""
+        _, (a, b) = workers
+        await a.set_many({"history:PEPE:24h": [1], "history:PEPE:1h": [2], "sentiment:DOGE": {"score": 40}})
+        assert await b.get_many(["history:PEPE:24h", "history:PEPE:1h", "sentiment:DOGE"]) == [[1], [2], {"score": 40}]
+        
+        await a.clear_pattern("history:PEPE:*")
+        await a.delete("sentiment:DOGE")
+        await settle()
+        
+        assert await b.get_many(["history:PEPE:24h", "history:PEPE:1h", "sentiment:DOGE"]) == [None, None, None]
+    
+    @pytest.mark.asyncio
+    async def test_write_drops_own_l1_copy(self, workers):
+        """Test a worker reads its own write back from Redis"""
+        server, (a, _) = workers
+        await a.set("sentiment:PEPE", {"score": 50})
+        await a.get("sentiment:PEPE")
+        
+        await a.set("sentiment:PEPE", {"score": 70})
+        
+        assert await a.get("sentiment:PEPE") == {"score": 70}
+        assert a.get_tier_stats()["l2"]["hits"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_bulk_read_can_skip_l1(self, workers):
+        """Test memo-style bulk reads do not fill or consult L1"""
+        server, (a, _) = workers
+        a.l1.max_size = 2
+        server.data["sentiment:all"] = json.dumps({"PEPE": 61})
+        server.data.update({f"sentiment:text:{i}": json.dumps({"i": i}) for i in range(5)})
+        await a.get("sentiment:all")
+        
+        values = await a.get_many([f"sentiment:text:{i}" for i in range(5)], populate_l1=False)
+        
+        assert values == [{"i": i} for i in range(5)]
+        assert "sentiment:all" in a.l1 and len(a.l1) == 1  # Hot key not evicted
+        
+        stats = a.get_tier_stats()
+        assert stats["l1"]["misses"] == 1
+        assert (stats["l2"]["hits"], stats["bulk"]["hits"]) == (1, 5)
+        assert stats["overall_hit_ratio"] == pytest.approx(1.0)  # Every read found its value
+    
+    @pytest.mark.asyncio
+    async def test_cache_stats_report_tiers(self, workers):
+        """Test /cache/stats data includes L1 and L2 hit ratios"""
+        _, (a, _) = workers
+        sentiment_cache = SentimentCache(a)
+        await sentiment_cache.set_token_sentiment("PEPE", {"score": 50})
+        await sentiment_cache.get_token_sentiment("PEPE")
+        await sentiment_cache.get_token_sentiment("PEPE")
+        await sentiment_cache.get_token_sentiment("DOGE")
+        
+        stats = await sentiment_cache.get_cache_stats()
+        
+        assert stats["status"] == "connected"
+        assert stats["l1"]["hit_ratio"] == pytest.approx(1 / 3)
+        assert (stats["l2"]["hits"], stats["l2"]["misses"]) == (1, 1)
+        assert stats["overall_hit_ratio"] == pytest.approx(2 / 3)
+
+
+class TestTagInvalidation:
+    """Test invalidation by tag sets instead of KEYS"""
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_token_deletes_only_its_keys(self, workers):
+        """Test a token's sentiment and history go and other tokens stay"""
+        server, (a, b) = workers
+        cache = SentimentCache(a)
+        await cache.set_token_sentiment("PEPE", {"score": 50})
+        await cache.set_token_history("PEPE", [1], hours=24)
+        await cache.set_token_history("PEPE", [2], hours=1)
+        await cache.set_token_sentiment("DOGE", {"score": 40})
+        assert await b.get("history:PEPE:24h") == [1]
+        
+        await cache.invalidate_token("pepe")
+        await settle()
+        
+        assert "sentiment:PEPE" not in server.data
+        assert "history:PEPE:1h" not in server.data
+        assert "tag:token:PEPE" not in server.data
+        assert await b.get("history:PEPE:24h") is None
+        assert await cache.get_token_sentiment("DOGE") == {"score": 40}
+    
+    @pytest.mark.asyncio
+    async def test_key_tagged_during_invalidation_survives(self, workers):
+        """Test a key written mid-scan stays tagged for the next invalidation"""
+        server, (a, _) = workers
+        cache = SentimentCache(a)
+        await cache.set_token_sentiment("PEPE", {"score": 50})
+        
+        async def write_during_scan():
+            server.on_scan = None
+            await cache.set_token_history("PEPE", [1], hours=24)
+        
+        server.on_scan = write_during_scan
+        await cache.invalidate_token("PEPE")
+        
+        assert "sentiment:PEPE" not in server.data
+        assert server.data["tag:token:PEPE"] == {"history:PEPE:24h"}
+        assert not [key for key in server.data if ":invalidating:" in key]
+        
+        await cache.invalidate_token("PEPE")
+        assert "history:PEPE:24h" not in server.data
+        assert await cache.cache.invalidate_tags(["token:DOGE"]) == 0
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_all_in_batches(self, workers):
+        """Test clearing everything unlinks in bounded batches"""
+        server, (a, _) = workers
+        a.scan_batch = 3
+        cache = SentimentCache(a)
+        for i in range(7):
+            await cache.set_token_sentiment(f"T{i}", {"score": i})
+        await cache.set_all_sentiments({"T0": {"score": 0}})
+        server.data["unrelated"] = "1"
+        
+        await cache.invalidate_all()
+        
+        # Per-token tag sets are left to expire; they only name deleted keys
+        assert {key for key in server.data if not key.startswith("tag:token:")} == {"unrelated"}
+        assert max(server.unlinks) <= 3
+    
+    @pytest.mark.asyncio
+    async def test_clear_pattern_uses_scan(self, workers):
+        """Test pattern clears walk the keyspace with SCAN, not KEYS"""
+        server, (a, _) = workers
+        await a.set_many({"history:PEPE:24h": [1], "history:DOGE:24h": [2], "sentiment:PEPE": {}})
+        
+        await a.clear_pattern("history:*")
+        
+        assert set(server.data) == {"sentiment:PEPE"}
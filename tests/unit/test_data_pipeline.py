@@ -0,0 +1,143 @@
+"""
+Unit tests for concurrent API collectors
+"""
+
+import asyncio
+import time
+from datetime import datetime, timezone
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.backend.config import settings
+from src.backend.data_pipeline import TwitterDataCollector, TikTokDataCollector
+from src.backend.http_client import close_http_client
+from src.backend.rate_limit import TokenBucket, host_budgets
+
+
+def make_tweet(token, i):
+    """Twitter API v2 tweet payload mentioning a token"""
+    return {
+        "id": f"{token}-{i}",
+        "text": f"Thinking about ${token} again today {i}",
+        "author_id": "42",
+        "created_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+        "public_metrics": {"like_count": 1, "retweet_count": 0, "reply_count": 0},
+    }
+
+
+@pytest_asyncio.fixture
+async def twitter_api():
+    """Local Twitter search API that is slow and rate limits PEPE once"""
+    calls = []
+    
+    async def search(request):
+        token = request.query["query"].split(" OR ")[0].lstrip("($")
+        calls.append((token, time.monotonic()))
+        
+        if token == "PEPE" and sum(1 for t, _ in calls if t == "PEPE") == 1:
+            # Large enough that the client has not read it all when the 429 arrives
+            return web.json_response({"detail": "x" * 2**20}, status=429, headers={"Retry-After": "0.3"})
+        
+        await asyncio.sleep(0.2)
+        return web.json_response(
+            {"data": [make_tweet(token, i) for i in range(2)]},
+            headers={"x-rate-limit-remaining": "100", "x-rate-limit-reset": str(int(time.time()) + 900)},
+        )
+    
+    app = web.Application()
+    app.router.add_get("/2/tweets/search/recent", search)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    host_budgets.pop("127.0.0.1", None)
+    
+    yield f"http://127.0.0.1:{port}/2/tweets/search/recent", calls
+    
+    await close_http_client()
+    await runner.cleanup()
+
+
+class TestConcurrentCollectors:
+    """Test per-token requests run concurrently within the host budget"""
+    
+    @pytest.mark.asyncio
+    async def test_tokens_fetched_concurrently(self, twitter_api):
+        """Test tokens overlap instead of running back to back"""
+        url, calls = twitter_api
+        collector = TwitterDataCollector(["DOGE", "SHIB", "WIF", "BONK"], bearer_token="test")
+        collector.api_url = url
+        
+        start = time.monotonic()
+        posts = await collector.collect()
+        elapsed = time.monotonic() - start
+        await collector.close()
+        
+        assert len(posts) == 8
+        assert elapsed < 0.6  # Four sequential 0.2 s requests plus sleeps took > 4 s
+        assert all(post.tokens_mentioned for post in posts)
+    
+    @pytest.mark.asyncio
+    async def test_429_defers_only_that_token(self, twitter_api):
+        """Test a rate-limited token is retried while the others complete"""
+        url, calls = twitter_api
+        collector = TwitterDataCollector(["DOGE", "PEPE", "SHIB"], bearer_token="test")
+        collector.api_url = url
+        
+        posts = await collector.collect()
+        await collector.close()
+        
+        pepe_calls = [at for token, at in calls if token == "PEPE"]
+        assert len(pepe_calls) == 2
+        assert pepe_calls[1] - pepe_calls[0] >= 0.3
+        assert sorted({p.post_id.split("-")[0] for p in posts}) == ["DOGE", "PEPE", "SHIB"]
+    
+    @pytest.mark.asyncio
+    async def test_429_wait_releases_connection(self, twitter_api, monkeypatch):
+        """Test other tokens use the pooled connection while PEPE waits out Retry-After"""
+        url, calls = twitter_api
+        await close_http_client()
+        monkeypatch.setattr(settings, "http_pool_limit_per_host", 1)
+        collector = TwitterDataCollector(["PEPE", "DOGE", "SHIB"], bearer_token="test")
+        collector.api_url = url
+        
+        await collector.collect()
+        await collector.close()
+        
+        started = {}
+        for token, at in calls:
+            started.setdefault(token, at)
+        assert started["DOGE"] - started["PEPE"] < 0.2
+    
+    @pytest.mark.asyncio
+    async def test_missing_credentials(self):
+        """Test collectors without credentials return nothing"""
+        assert await TwitterDataCollector(["DOGE"]).collect() == []
+        assert await TikTokDataCollector(["DOGE"]).collect() == []
+
+
+class TestHeaderBudget:
+    """Test token buckets following upstream rate-limit headers"""
+    
+    def test_remaining_caps_tokens(self):
+        """Test the reported remaining budget lowers available tokens"""
+        bucket = TokenBucket(rate=10.0, capacity=20)
+        
+        bucket.update_from_headers({"x-rate-limit-remaining": "3", "x-rate-limit-reset": str(int(time.time()) + 60)})
+        
+        assert bucket.get_stats()["available"] < 3.1
+        assert bucket.get_stats()["paused_seconds"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_exhausted_budget_pauses_until_reset(self):
+        """Test a zero remaining budget waits for the reset delta"""
+        bucket = TokenBucket(rate=1000.0, capacity=20)
+        bucket.update_from_headers({"ratelimit-remaining": "0", "ratelimit-reset": "0.2"})
+        
+        start = time.monotonic()
+        await bucket.acquire()
+        
+        assert time.monotonic() - start >= 0.19
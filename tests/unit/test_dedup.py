@@ -0,0 +1,105 @@
+"""
+Unit tests for near-duplicate detection
+"""
+
+from datetime import datetime
+
+import pytest
+
+from src.backend.dedup import NearDuplicateDetector, shingles
+from src.backend.data_pipeline_v2 import UpdatedDataPipeline, RawPost
+
+
+SHILL = "🚀 $PEPE is about to explode, 100x incoming, get in before it is too late! https://t.co/{}"
+
+
+def make_post(post_id, text, retweets=0):
+    """Build a raw post mentioning PEPE"""
+    return RawPost(
+        source="twitter",
+        post_id=post_id,
+        text=text,
+        author_id=f"author_{post_id}",
+        created_at=datetime.now(),
+        metrics={"likes": 0, "retweets": retweets, "replies": 0},
+        tokens_mentioned=["PEPE"],
+    )
+
+
+class TestNearDuplicateDetector:
+    """Test MinHash/LSH near-duplicate detection"""
+    
+    @pytest.fixture
+    def detector(self):
+        """Create a detector with a one-minute window"""
+        return NearDuplicateDetector(threshold=0.8, window_seconds=60, num_perm=64, bands=16, max_entries=100)
+    
+    def test_near_identical_posts_collapse(self, detector):
+        """Test reposts differing only in links and case are duplicates"""
+        assert detector.check("1", SHILL.format("abc"), now=0) is None
+        assert detector.check("2", SHILL.format("xyz").upper(), now=1) == "1"
+        assert detector.get_stats()["duplicates"] == 1
+    
+    def test_distinct_posts_kept(self, detector):
+        """Test unrelated posts are not duplicates"""
+        assert detector.check("1", SHILL.format("abc"), now=0) is None
+        assert detector.check("2", "Bearish on PEPE, the dev wallet just dumped on everyone", now=1) is None
+        assert detector.get_stats()["indexed"] == 2
+    
+    def test_same_id_is_not_duplicate(self, detector):
+        """Test re-scraping a post does not flag it against itself"""
+        detector.check("1", SHILL.format("abc"), now=0)
+        
+        assert detector.check("1", SHILL.format("abc"), now=5) is None
+    
+    def test_forget_unindexes_post(self, detector):
+        """Test a forgotten post no longer matches its copies"""
+        detector.check("1", SHILL.format("abc"), now=0)
+        detector.forget("1")
+        detector.forget("1")
+        
+        assert detector.check("2", SHILL.format("xyz"), now=1) is None
+        assert detector.get_stats()["indexed"] == 1
+    
+    def test_window_expiry(self, detector):
+        """Test entries older than the window stop matching"""
+        detector.check("1", SHILL.format("abc"), now=0)
+        
+        assert detector.check("2", SHILL.format("xyz"), now=61) is None
+        assert detector.get_stats()["indexed"] == 1
+    
+    def test_index_is_bounded(self):
+        """Test the oldest entries are evicted past max_entries"""
+        detector = NearDuplicateDetector(window_seconds=3600, num_perm=64, bands=16, max_entries=3)
+        for i in range(5):
+            detector.check(str(i), f"completely different post number {i} about token {i * 7}", now=i)
+        
+        assert list(detector.entries) == ["2", "3", "4"]
+        assert all(ids <= {"2", "3", "4"} for ids in detector.index.values())
+    
+    def test_empty_text(self, detector):
+        """Test texts without words are never indexed"""
+        assert shingles("🚀🚀 https://t.co/x") == set()
+        assert detector.check("1", "🚀🚀", now=0) is None
+        assert detector.get_stats()["indexed"] == 0
+
+
+class TestFilterSpam:
+    """Test the dedup stage in UpdatedDataPipeline.filter_spam"""
+    
+    @pytest.mark.asyncio
+    async def test_collapses_shill_posts(self):
+        """Test copies are dropped and counted on the first post"""
+        pipeline = UpdatedDataPipeline(["PEPE"])
+        posts = [
+            make_post("1", SHILL.format("a")),
+            make_post("2", SHILL.format("b")),
+            make_post("3", "Not sure about PEPE here, need to research the team more"),
+            make_post("4", SHILL.format("c")),
+            make_post("5", "Buying PEPE", retweets=20000),
+        ]
+        
+        filtered = await pipeline.filter_spam(posts)
+        
+        assert [p.post_id for p in filtered] == ["1", "3"]
+        assert filtered[0].metrics["duplicates"] == 2
@@ -0,0 +1,163 @@
+"""
+Unit tests for the on-disk sentiment history log
+"""
+
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.backend.history_log import HistoryLog
+from src.backend.sentiment_pipeline import SentimentPipeline, TokenSentiment
+
+
+def make_record(token, when, score=50.0):
+    """Build a record in TokenSentiment.to_dict() shape"""
+    return TokenSentiment(
+        token=token,
+        timestamp=when,
+        sentiment_score=score,
+        sentiment_label="neutral",
+        confidence=0.5,
+        sample_size=10,
+    ).to_dict()
+
+
+class TestHistoryLog:
+    """Test append-only daily segments"""
+    
+    def test_append_splits_by_day(self, tmp_path):
+        """Test records land in the segment for their day"""
+        log = HistoryLog(tmp_path)
+        now = datetime.now()
+        
+        log.append([make_record("PEPE", now - timedelta(days=1)), make_record("PEPE", now)])
+        
+        assert [p.name for p in log.segments()] == [
+            f"sentiment-{(now - timedelta(days=1)).date()}.jsonl",
+            f"sentiment-{now.date()}.jsonl",
+        ]
+        assert log.get_stats()["records_written"] == 2
+    
+    def test_appends_do_not_rewrite(self, tmp_path):
+        """Test later appends extend the segment"""
+        log = HistoryLog(tmp_path)
+        now = datetime.now()
+        
+        log.append([make_record("PEPE", now, 40)])
+        log.append([make_record("DOGE", now, 60)])
+        
+        lines = log.segments()[0].read_text().splitlines()
+        assert [json.loads(line)["token"] for line in lines] == ["PEPE", "DOGE"]
+    
+    def test_load_skips_old_segments_and_samples(self, tmp_path):
+        """Test loading only returns records newer than the cutoff"""
+        log = HistoryLog(tmp_path)
+        now = datetime.now()
+        log.append([
+            make_record("PEPE", now - timedelta(days=3), 10),
+            make_record("PEPE", now - timedelta(hours=2), 20),
+            make_record("PEPE", now - timedelta(minutes=5), 30),
+        ])
+        
+        records = list(log.load(since=now - timedelta(hours=1)))
+        
+        assert [r["sentiment_score"] for r in records] == [30]
+        assert len(log.segments(since=now - timedelta(hours=1))) <= 2
+    
+    def test_load_skips_torn_lines(self, tmp_path):
+        """Test a partial trailing line does not abort loading"""
+        log = HistoryLog(tmp_path)
+        log.append([make_record("PEPE", datetime.now())])
+        with open(log.segments()[0], "a") as f:
+            f.write('{"token": "PE')
+        
+        assert len(list(log.load())) == 1
+    
+    def test_prunes_expired_segments(self, tmp_path):
+        """Test segments older than retention are deleted on day rollover"""
+        log = HistoryLog(tmp_path, retention_hours=24)
+        log.append([make_record("PEPE", datetime.now() - timedelta(days=5))])
+        log.append([make_record("PEPE", datetime.now())])
+        
+        assert len(log.segments()) == 1
+        assert log.segments_pruned == 1
+
+
+class TestPipelinePersistence:
+    """Test background flushing and restore in the sentiment pipeline"""
+    
+    @pytest.fixture
+    def pipeline(self, tmp_path):
+        """Create a pipeline logging to a temporary directory"""
+        pipeline = SentimentPipeline(["DOGE", "PEPE"])
+        pipeline.history_log = HistoryLog(tmp_path)
+        return pipeline
+    
+    @pytest.mark.asyncio
+    async def test_cycle_flushes_in_background(self, pipeline):
+        """Test samples from a cycle are appended after it completes"""
+        async def fake_analyze(token):
+            sentiment = pipeline._create_empty_sentiment(token)
+            pipeline.pending_records.append(sentiment.to_dict())
+            return sentiment
+        
+        pipeline.analyze_token = fake_analyze
+        
+        await pipeline.analyze_all_tokens()
+        await pipeline.flush_task
+        
+        assert pipeline.pending_records == []
+        assert sorted(r["token"] for r in pipeline.history_log.load()) == ["DOGE", "PEPE"]
+    
+    @pytest.mark.asyncio
+    async def test_restore_rebuilds_history(self, pipeline, tmp_path):
+        """Test a new pipeline reloads recent samples from disk"""
+        now = datetime.now()
+        pipeline.history_log.append([
+            make_record("PEPE", now - timedelta(minutes=10), 40),
+            make_record("PEPE", now - timedelta(minutes=5), 60),
+            make_record("WIF", now, 90),  # Not tracked any more
+        ])
+        
+        restored = SentimentPipeline(["DOGE", "PEPE"])
+        restored.history_log = HistoryLog(tmp_path)
+        
+        assert await restored.restore_history() == 2
+        assert restored.sentiment_history["PEPE"].get_average_sentiment(1) == pytest.approx(50)
+        assert restored.sentiment_history["PEPE"].latest()["sentiment_score"] == 60
+    
+    @pytest.mark.asyncio
+    async def test_export_is_valid_json(self, pipeline, tmp_path):
+        """Test the streamed export produces the documented JSON layout"""
+        pipeline.sentiment_history["PEPE"].add_sentiment(
+            TokenSentiment.from_dict(make_record("PEPE", datetime.now(), 70))
+        )
+        path = tmp_path / "export.json"
+        
+        await pipeline.export_history(str(path))
+        
+        data = json.loads(path.read_text())
+        assert data["tokens"]["DOGE"] == []
+        assert data["tokens"]["PEPE"][0]["sentiment_score"] == 70
+    
+    @pytest.mark.asyncio
+    async def test_export_writes_a_snapshot(self, pipeline, tmp_path, monkeypatch):
+        """Test samples added while the file is written are not exported"""
+        history = pipeline.sentiment_history["PEPE"]
+        history.add_sentiment(TokenSentiment.from_dict(make_record("PEPE", datetime.now(), 70)))
+        to_thread = asyncio.to_thread
+        
+        async def append_then_write(fn, *args):
+            history.add_sentiment(TokenSentiment.from_dict(make_record("PEPE", datetime.now(), 20)))
+            return await to_thread(fn, *args)
+        
+        monkeypatch.setattr(asyncio, "to_thread", append_then_write)
+        path = tmp_path / "export.json"
+        
+        await pipeline.export_history(str(path))
+        
+        data = json.loads(path.read_text())
+        assert [r["sentiment_score"] for r in data["tokens"]["PEPE"]] == [70]
+        assert len(history.history) == 2
@@ -0,0 +1,108 @@
+"""
+Unit tests for compact sentiment history storage
+"""
+
+import numpy as np
+import pytest
+
+from src.backend.history_store import SentimentSeries, RecordRing, HISTORY_DTYPE, LABELS
+
+
+def make_series(**kwargs):
+    """Create a small series with one-hour raw retention and 5-minute buckets"""
+    options = dict(raw_capacity=100, raw_hours=1, retention_hours=24, bucket_seconds=300)
+    options.update(kwargs)
+    return SentimentSeries(**options)
+
+
+class TestRecordRing:
+    """Test the fixed-capacity row ring"""
+    
+    def test_wraps_in_arrival_order(self):
+        """Test rows stay ordered after the ring wraps around"""
+        ring = RecordRing(3)
+        displaced = []
+        for ts in range(5):
+            row = ring.append(_row(ts))
+            if row is not None:
+                displaced.append(float(row["timestamp"]))
+        
+        assert displaced == [0.0, 1.0]
+        assert ring.ordered()["timestamp"].tolist() == [2.0, 3.0, 4.0]
+        assert float(ring[-1]["timestamp"]) == 4.0
+        assert float(ring[0]["timestamp"]) == 2.0
+    
+    def test_index_out_of_range(self):
+        """Test reading past the stored rows raises"""
+        ring = RecordRing(2)
+        
+        with pytest.raises(IndexError):
+            ring[0]
+
+
+class TestSentimentSeries:
+    """Test two-tier retention and downsampling"""
+    
+    def test_recent_samples_kept_at_full_resolution(self):
+        """Test samples inside the raw window are stored individually"""
+        series = make_series()
+        for i in range(10):
+            series.append(1000.0 + i * 5, sentiment_score=50 + i)
+        
+        assert len(series.raw) == 10
+        assert len(series.buckets) == 0
+        assert series.records()["sentiment_score"].tolist() == [50 + i for i in range(10)]
+    
+    def test_old_samples_are_downsampled(self):
+        """Test samples past the raw window fold into weighted buckets"""
+        series = make_series()
+        series.append(0.0, sentiment_score=40, sample_size=10, label=LABELS.index("bearish"))
+        series.append(60.0, sentiment_score=60, sample_size=30, label=LABELS.index("bullish"))
+        series.append(7200.0, sentiment_score=70)
+        
+        assert len(series.raw) == 1
+        assert len(series.buckets) == 1
+        bucket = series.buckets[0]
+        assert float(bucket["timestamp"]) == 0.0
+        assert float(bucket["sentiment_score"]) == pytest.approx(50)
+        assert int(bucket["sample_size"]) == 40
+        assert int(bucket["merged"]) == 2
+        assert LABELS[bucket["label"]] == "bullish"
+    
+    def test_full_raw_ring_spills_into_buckets(self):
+        """Test a full raw ring downsamples instead of dropping samples"""
+        series = make_series(raw_capacity=4)
+        for i in range(6):
+            series.append(float(i), sentiment_score=10 * i)
+        
+        assert len(series.raw) == 4
+        assert int(series.buckets[0]["merged"]) == 2
+        assert series.score_at(-1) == 50
+        assert series.score_at(0) == pytest.approx(5)
+    
+    def test_buckets_expire_after_retention(self):
+        """Test buckets older than the retention period are dropped"""
+        series = make_series(retention_hours=2)
+        series.append(0.0, sentiment_score=10)
+        series.append(3 * 3600.0, sentiment_score=20)
+        series.append(4 * 3600.0 + 1, sentiment_score=30)
+        
+        assert len(series.buckets) == 1
+        assert series.records()["sentiment_score"].tolist() == [20, 30]
+    
+    def test_storage_is_preallocated(self):
+        """Test memory does not grow with the number of samples"""
+        series = make_series(raw_capacity=50)
+        before = series.get_stats()["bytes"]
+        for i in range(5000):
+            series.append(i * 5.0, sentiment_score=50)
+        
+        assert series.get_stats()["bytes"] == before
+        assert len(series) <= 50 + len(series.buckets)
+
+
+def _row(timestamp):
+    """Build a single record with only a timestamp"""
+    row = np.zeros((), dtype=HISTORY_DTYPE)
+    row["timestamp"] = timestamp
+    return row
@@ -0,0 +1,118 @@
+"""
+Unit tests for the shared HTTP client
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.backend.http_client import HTTPClient
+from src.backend.dexscreener_fetcher import DexScreenerFetcher
+from src.backend import http_client as http_client_module
+
+
+@pytest_asyncio.fixture
+async def server():
+    """Local HTTP server with a JSON endpoint"""
+    async def ping(request):
+        return web.json_response({"pong": True})
+    
+    app = web.Application()
+    app.router.add_get("/ping", ping)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    
+    yield f"http://127.0.0.1:{port}"
+    
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def client():
+    """HTTP client closed after the test"""
+    client = HTTPClient(limit=10, limit_per_host=2, timeout_seconds=5)
+    yield client
+    await client.close()
+
+
+class TestHTTPClient:
+    """Test connection pooling and pool statistics"""
+    
+    @pytest.mark.asyncio
+    async def test_session_is_shared(self, client):
+        """Test every caller gets the same session"""
+        first = await client.get_session()
+        second = await client.get_session()
+        
+        assert first is second
+        assert client.get_stats()["open"]
+    
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, client, server):
+        """Test keep-alive connections serve later requests"""
+        session = await client.get_session()
+        
+        for _ in range(5):
+            async with session.get(f"{server}/ping") as response:
+                assert (await response.json()) == {"pong": True}
+        
+        stats = client.get_stats()
+        assert stats["requests"] == 5
+        assert stats["in_flight"] == 0
+        assert stats["connections_created"] == 1
+        assert stats["connections_reused"] == 4
+        assert stats["reuse_ratio"] == pytest.approx(0.8)
+    
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self, client, server):
+        """Test concurrent requests queue behind the per-host cap"""
+        session = await client.get_session()
+        
+        async def fetch():
+            async with session.get(f"{server}/ping") as response:
+                return await response.json()
+        
+        results = await asyncio.gather(*(fetch() for _ in range(6)))
+        
+        assert len(results) == 6
+        assert client.get_stats()["connections_created"] <= 2
+    
+    @pytest.mark.asyncio
+    async def test_close_reopens_lazily(self, client):
+        """Test a closed client opens a fresh session on demand"""
+        first = await client.get_session()
+        await client.close()
+        
+        assert first.closed
+        assert not client.get_stats()["open"]
+        
+        second = await client.get_session()
+        assert second is not first
+        assert not second.closed
+
+
+class TestSharedClientUsers:
+    """Test callers route through the process-wide session"""
+    
+    @pytest.mark.asyncio
+    async def test_dexscreener_uses_shared_pool(self, server, monkeypatch):
+        """Test the DexScreener fetcher requests through the shared client"""
+        client = HTTPClient()
+        monkeypatch.setattr(http_client_module, "http_client", client)
+        fetcher = DexScreenerFetcher()
+        fetcher.BASE_URL = server
+        
+        try:
+            await fetcher.initialize()
+            await fetcher.fetch_token_by_symbol("DOGE")
+            await fetcher.close()
+            
+            assert client.get_stats()["requests"] == 1
+            assert client.get_stats()["open"]
+        finally:
+            await client.close()
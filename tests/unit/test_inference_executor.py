@@ -0,0 +1,157 @@
+"""
+Unit tests for inference executor
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from unittest.mock import AsyncMock
+
+from src.backend.inference_executor import InferenceExecutor
+from src.backend.sentiment_analyzer import SentimentAnalyzer, SentimentResult
+from src.backend.cache import TTLCache
+
+
+class SlowAnalyzer:
+    """Stand-in analyzer that blocks like a CPU-bound forward pass"""
+    
+    memo_key = staticmethod(SentimentAnalyzer.memo_key)
+    
+    def __init__(self, delay: float = 0.2):
+        self.delay = delay
+        self.memo = TTLCache()
+        self.threads = set()
+        self.active = 0
+        self.max_active = 0
+        self.calls = 0
+        self.lock = threading.Lock()
+    
+    def analyze_batch(self, texts):
+        with self.lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        
+        results = []
+        for text in texts:
+            result = self.memo.get(self.memo_key(text))
+            if result is None:
+                self.calls += 1
+                result = SentimentResult(
+                    sentiment="neutral",
+                    confidence=0.5,
+                    scores={"bearish": 0.25, "neutral": 0.5, "bullish": 0.25},
+                    intensity="moderate",
+                    credibility_weight=1.0,
+                )
+                self.memo.set(self.memo_key(text), result)
+            results.append(result)
+        return results
+
+
+class TestInferenceExecutor:
+    """Test off-loop inference"""
+    
+    @pytest.mark.asyncio
+    async def test_analyze_batch_runs_on_worker_thread(self):
+        """Test inference runs outside the event loop thread"""
+        analyzer = SlowAnalyzer(delay=0.01)
+        executor = InferenceExecutor(analyzer, max_workers=1, max_pending=2)
+        
+        try:
+            results = await executor.analyze_batch(["a", "b", "c"])
+        finally:
+            executor.shutdown()
+        
+        assert len(results) == 3
+        assert all(name.startswith("inference") for name in analyzer.threads)
+        assert executor.get_stats()["completed"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_event_loop_not_blocked(self):
+        """Test the loop keeps ticking while a batch is scored"""
+        analyzer = SlowAnalyzer(delay=0.2)
+        executor = InferenceExecutor(analyzer, max_workers=1, max_pending=2)
+        ticks = 0
+        
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+        
+        task = asyncio.create_task(ticker())
+        try:
+            await executor.analyze_batch(["text"])
+        finally:
+            task.cancel()
+            executor.shutdown()
+        
+        assert ticks >= 5
+    
+    @pytest.mark.asyncio
+    async def test_pending_is_bounded(self):
+        """Test no more than max_pending batches are queued at once"""
+        analyzer = SlowAnalyzer(delay=0.05)
+        executor = InferenceExecutor(analyzer, max_workers=2, max_pending=2)
+        peak = 0
+        
+        async def watch():
+            nonlocal peak
+            while True:
+                peak = max(peak, executor.pending)
+                await asyncio.sleep(0.005)
+        
+        watcher = asyncio.create_task(watch())
+        try:
+            await asyncio.gather(*(executor.analyze_batch(["x"]) for _ in range(6)))
+        finally:
+            watcher.cancel()
+            executor.shutdown()
+        
+        assert peak <= 2
+        assert analyzer.max_active <= 2
+        assert executor.get_stats()["completed"] == 6
+    
+    @pytest.mark.asyncio
+    async def test_empty_batch(self):
+        """Test empty input skips the worker pool"""
+        executor = InferenceExecutor(SlowAnalyzer(), max_workers=1, max_pending=1)
+        
+        try:
+            assert await executor.analyze_batch([]) == []
+        finally:
+            executor.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_shared_memo_round_trip(self):
+        """Test results are seeded from and written back to the shared cache"""
+        analyzer = SlowAnalyzer(delay=0.0)
+        shared = AsyncMock()
+        cached = {
+            "sentiment": "bullish",
+            "confidence": 0.9,
+            "scores": {"bearish": 0.05, "neutral": 0.05, "bullish": 0.9},
+            "intensity": "moderate",
+            "credibility_weight": 1.0,
+        }
+        shared.get_many = AsyncMock(return_value=[cached, None])
+        shared.set_many = AsyncMock()
+        executor = InferenceExecutor(analyzer, max_workers=1, max_pending=1, shared_cache=shared)
+        
+        try:
+            results = await executor.analyze_batch(["seen before", "brand new"])
+        finally:
+            executor.shutdown()
+        
+        assert results[0].sentiment == "bullish"
+        assert analyzer.calls == 1
+        
+        written = shared.set_many.call_args.args[0]
+        assert list(written) == [
+            InferenceExecutor.SHARED_KEY_PREFIX + SentimentAnalyzer.memo_key("brand new")
+        ]
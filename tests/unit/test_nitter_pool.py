@@ -0,0 +1,165 @@
+"""
+Unit tests for the Nitter instance pool
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+from src.backend.http_client import close_http_client
+from src.backend.nitter_pool import NitterInstance, NitterPool
+from src.backend.twitter_scraper import NitterScraper
+
+
+async def start_mirror(name, delay=0.0, status=200):
+    """Stub Nitter mirror answering every search after `delay`"""
+    calls = []
+    
+    async def search(request):
+        calls.append(request.query.get("q"))
+        await asyncio.sleep(delay)
+        return web.Response(text=f"<html>{name}</html>", status=status)
+    
+    app = web.Application()
+    app.router.add_get("/search", search)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", calls
+
+
+@pytest_asyncio.fixture
+async def mirrors():
+    """Fast, slow and broken mirrors"""
+    started = {
+        "fast": await start_mirror("fast"),
+        "slow": await start_mirror("slow", delay=0.5),
+        "broken": await start_mirror("broken", status=503),
+    }
+    
+    yield {name: (url, calls) for name, (_, url, calls) in started.items()}
+    
+    await close_http_client()
+    for runner, _, _ in started.values():
+        await runner.cleanup()
+
+
+class TestNitterInstance:
+    """Test health tracking for a single mirror"""
+    
+    def test_circuit_opens_after_consecutive_failures(self):
+        """Test the circuit opens at the threshold and half-opens after cooldown"""
+        instance = NitterInstance("https://a", alpha=0.5, failure_threshold=2, cooldown_seconds=10)
+        
+        instance.record_failure(now=100)
+        assert instance.available(100)
+        instance.record_failure(now=101)
+        assert instance.state(105) == NitterInstance.OPEN
+        assert not instance.available(105)
+        
+        assert instance.state(111) == NitterInstance.HALF_OPEN
+        instance.begin(111)
+        assert not instance.available(111)  # Only one probe at a time
+        
+        instance.record_success(0.2)
+        assert instance.state(112) == NitterInstance.CLOSED
+    
+    def test_failed_probe_reopens(self):
+        """Test a failed half-open probe opens the circuit again"""
+        instance = NitterInstance("https://a", alpha=0.5, failure_threshold=1, cooldown_seconds=10)
+        instance.record_failure(now=100)
+        
+        instance.begin(110)
+        instance.record_failure(now=110)
+        
+        assert instance.state(115) == NitterInstance.OPEN
+    
+    def test_score_prefers_fast_reliable_mirrors(self):
+        """Test errors inflate the score of an otherwise fast mirror"""
+        fast = NitterInstance("https://fast", alpha=0.5, failure_threshold=5, cooldown_seconds=10)
+        flaky = NitterInstance("https://flaky", alpha=0.5, failure_threshold=5, cooldown_seconds=10)
+        fast.record_success(0.3)
+        flaky.record_success(0.1)
+        flaky.record_failure(now=0)
+        
+        assert fast.score() < flaky.score()
+
+
+class TestNitterPool:
+    """Test routing, hedging and failover against stub mirrors"""
+    
+    @pytest.mark.asyncio
+    async def test_routes_to_fastest_mirror(self, mirrors):
+        """Test requests settle on the fastest mirror once latencies are known"""
+        pool = NitterPool([mirrors["slow"][0], mirrors["fast"][0]], hedge_delay=5)
+        
+        for _ in range(4):
+            assert await pool.fetch("/search?q=x") is not None
+        
+        assert len(mirrors["slow"][1]) == 1  # Explored once
+        assert len(mirrors["fast"][1]) == 3
+        assert pool.ranked()[0].url == mirrors["fast"][0]
+    
+    @pytest.mark.asyncio
+    async def test_hedges_slow_request(self, mirrors):
+        """Test a slow primary is raced against a second mirror"""
+        pool = NitterPool([mirrors["slow"][0], mirrors["fast"][0]], hedge_delay=0.05)
+        
+        url, body = await pool.fetch("/search?q=x")
+        
+        assert url == mirrors["fast"][0]
+        assert body == "<html>fast</html>"
+        stats = pool.get_stats()
+        assert stats["hedged"] == 1
+        assert stats["hedge_wins"] == 1
+        # The losing request is cancelled, not counted as a failure
+        assert stats["instances"][0]["failures"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_circuit_breaks_dead_mirror(self, mirrors):
+        """Test a failing mirror fails over and is skipped once broken"""
+        pool = NitterPool(
+            [mirrors["broken"][0], mirrors["fast"][0]],
+            hedge_delay=5,
+            failure_threshold=2,
+            cooldown_seconds=60,
+        )
+        
+        for _ in range(5):
+            url, _ = await pool.fetch("/search?q=x")
+            assert url == mirrors["fast"][0]
+        
+        broken = pool.get_stats()["instances"][0]
+        assert broken["state"] == NitterInstance.OPEN
+        assert len(mirrors["broken"][1]) == 2
+        assert pool.get_stats()["healthy"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_all_mirrors_down(self, mirrors):
+        """Test the pool gives up when every mirror fails"""
+        pool = NitterPool([mirrors["broken"][0]], failure_threshold=1)
+        
+        assert await pool.fetch("/search?q=x") is None
+        assert await pool.fetch("/search?q=x") is None
+        assert pool.get_stats()["exhausted"] == 2
+        assert len(mirrors["broken"][1]) == 1
+
+
+class TestNitterScraperPool:
+    """Test the scraper fetches through the pool"""
+    
+    @pytest.mark.asyncio
+    async def test_scraper_fails_over(self, mirrors):
+        """Test scraping survives a dead first mirror"""
+        scraper = NitterScraper(["PEPE"], instances=[mirrors["broken"][0], mirrors["fast"][0]])
+        
+        tweets = await scraper.scrape_tweets("PEPE")
+        
+        assert tweets == []
+        assert len(mirrors["fast"][1]) == 1
+        assert "PEPE" in mirrors["fast"][1][0]
+        assert scraper.get_stats()["failovers"] == 1
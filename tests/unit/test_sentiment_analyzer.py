@@ -2,11 +2,17 @@
 Unit tests for sentiment analyzer
 """
 
+import subprocess
+import sys
+import numpy as np
 import pytest
 from src.backend.sentiment_analyzer import (
     SentimentAnalyzer,
     SentimentAggregator,
     AccountMetrics,
+    bucket_by_length,
+    get_shared_analyzer,
+    is_model_ready,
 )
 
 
@@ -44,6 +50,57 @@ class TestSentimentAnalyzer:
         assert result.sentiment in ["bullish", "neutral", "bearish"]
         assert 0.0 <= result.confidence <= 1.0
     
+    def test_analyze_batch_matches_single(self, analyzer):
+        """Test batched inference agrees with per-text inference"""
+        texts = [
+            "This memecoin is going to the moon! Diamond hands only!",
+            "This is a total scam and rug pull. Exit now!",
+            "The price is stable today.",
+        ]
+        analyzer.batch_size = 2  # Force more than one chunk
+        
+        batch = analyzer.analyze_batch(texts)
+        
+        assert len(batch) == len(texts)
+        for text, result in zip(texts, batch):
+            single = analyzer.analyze_sentiment(text)
+            assert result.sentiment == single.sentiment
+            assert abs(result.confidence - single.confidence) < 1e-4
+    
+    def test_analyze_batch_memoizes_repeated_text(self, analyzer):
+        """Test repeated and re-spaced texts are served from the memo"""
+        texts = ["Just bought more PEPE", "just  bought more pepe ", "Just bought more PEPE"]
+        
+        first = analyzer.analyze_batch(texts)
+        stats = analyzer.memo.get_stats()
+        assert stats["size"] == 1
+        assert first[0] is first[1] is first[2]
+        
+        analyzer.analyze_batch(texts[:1])
+        assert analyzer.memo.get_stats()["hits"] == stats["hits"] + 1
+    
+    def test_analyze_batch_truncates_and_buckets(self, analyzer):
+        """Test long texts are truncated and order survives length bucketing"""
+        texts = [
+            "moon " * 400,
+            "gm",
+            "Bullish on PEPE! Great project with amazing potential",
+            "rug",
+        ]
+        analyzer.batch_size = 2
+        
+        batch = analyzer.analyze_batch(texts)
+        
+        assert len(batch) == len(texts)
+        for text, result in zip(texts, batch):
+            assert result.sentiment == analyzer.analyze_sentiment(text).sentiment
+        # The 400-word text contributes at most max_length wordpieces
+        assert analyzer.token_stats["real_tokens"] <= analyzer.max_length + 3 * 20
+    
+    def test_analyze_batch_empty(self, analyzer):
+        """Test batched inference with no texts"""
+        assert analyzer.analyze_batch([]) == []
+    
     def test_calculate_intensity_strong(self, analyzer):
         """Test strong intensity detection"""
         text = "Moon rocket based gem diamond hands!"
@@ -110,6 +167,50 @@ class TestSentimentAnalyzer:
         assert 40 <= score <= 60  # Neutral should be around 50
 
 
+class TestSharedAnalyzer:
+    """Test lazy, process-wide model loading"""
+    
+    def test_import_does_not_load_torch(self):
+        """Test importing the API routes does not pull in torch"""
+        code = (
+            "import sys\n"
+            "import src.backend.api_routes\n"
+            "assert 'torch' not in sys.modules, 'torch imported eagerly'\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+        
+        assert result.returncode == 0, result.stderr
+    
+    def test_shared_analyzer_is_singleton(self):
+        """Test every caller gets the same loaded model"""
+        first = get_shared_analyzer()
+        second = get_shared_analyzer()
+        
+        assert first is second
+        assert is_model_ready()
+
+
+class TestBucketByLength:
+    """Test length bucketing for batched tokenization"""
+    
+    def test_groups_similar_lengths(self):
+        """Test each batch holds neighbouring lengths"""
+        lengths = [50, 3, 12, 48, 4, 11]
+        
+        buckets = bucket_by_length(lengths, batch_size=2)
+        
+        assert [[lengths[i] for i in bucket] for bucket in buckets] == [[3, 4], [11, 12], [48, 50]]
+    
+    def test_covers_every_index_once(self):
+        """Test no index is dropped or duplicated"""
+        lengths = [7, 1, 9, 3, 3, 8, 2]
+        
+        buckets = bucket_by_length(lengths, batch_size=3)
+        
+        assert sorted(i for bucket in buckets for i in bucket) == list(range(len(lengths)))
+        assert [len(bucket) for bucket in buckets] == [3, 3, 1]
+
+
 class TestSentimentAggregator:
     """Test sentiment aggregation functionality"""
     
@@ -176,6 +277,50 @@ class TestSentimentAggregator:
         
         assert trend in ["bullish", "bearish", "neutral"]
         assert trend == "neutral"
+    
+    def test_summarize_single_pass(self, aggregator):
+        """Test one call returns every statistic"""
+        scores = [40, 45, 50, 55, 60, 100]
+        summary = aggregator.summarize(scores)
+        
+        assert summary["count"] == 6
+        assert summary["mean"] == pytest.approx(sum(scores) / 6)
+        assert summary["median"] == pytest.approx(52.5)
+        assert summary["min"] == 40
+        assert summary["max"] == 100
+        assert summary["outliers"] == [5]
+        assert summary["trend"] == "bullish"
+    
+    def test_aggregate_batch_matches_rows(self, aggregator):
+        """Test a ragged batch agrees with summarizing each row"""
+        rows = [
+            [40, 45, 50, 55, 60, 65, 70, 75],
+            [75, 70, 65, 60],
+            [50],
+            [],
+        ]
+        
+        batch = aggregator.aggregate_batch(rows)
+        
+        assert len(batch) == len(rows)
+        for row, summary in zip(rows, batch):
+            assert summary == aggregator.summarize(row)
+        assert [s["trend"] for s in batch] == ["bullish", "bearish", "neutral", "neutral"]
+        assert batch[3]["mean"] == 50
+    
+    def test_aggregate_batch_accepts_padded_array(self, aggregator):
+        """Test a NaN-padded tokens x samples array"""
+        values = np.array([
+            [40, 45, 50, 55, 60, 100],
+            [45, 48, 50, np.nan, np.nan, np.nan],
+        ])
+        
+        batch = aggregator.aggregate_batch(values)
+        
+        assert batch[0]["outliers"] == [5]
+        assert batch[1]["count"] == 3
+        assert batch[1]["median"] == 48
+        assert batch[1]["std"] == pytest.approx(np.std([45, 48, 50], ddof=1))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,75 @@
+"""
+Parity tests for sentiment inference backends
+"""
+
+import pytest
+
+from src.backend.config import settings
+from src.backend.sentiment_analyzer import SentimentAnalyzer
+
+
+# Fixed corpus of typical memecoin posts
+PARITY_CORPUS = [
+    "Bullish on PEPE! Great project with amazing potential 🚀",
+    "DOGE is the future of DeFi. HODL! 💎",
+    "Just bought more SHIB. This is going to moon 🌙",
+    "WIF has incredible fundamentals. Long term hold 📈",
+    "Bearish on BONK. Too much hype, no substance 📉",
+    "This is a scam, total rug pull incoming",
+    "Not sure about BRETT. Need to do more research 🤔",
+    "PEPE is consolidating. Waiting for breakout 📊",
+    "Dev wallet just dumped everything, exit now",
+    "The price is stable today, nothing special",
+    "Love the DOGE community! Great vibes here ❤️",
+    "Liquidity pulled, chart is dead. Stay away! ⚠️",
+]
+
+# Maximum per-class probability drift allowed between backends
+PROBABILITY_TOLERANCE = 0.05
+
+
+def assert_parity(reference, candidate):
+    """Labels must agree unless the reference itself is within tolerance of a tie"""
+    for text, ref, cand in zip(PARITY_CORPUS, reference, candidate):
+        for label, prob in ref.scores.items():
+            assert abs(prob - cand.scores[label]) <= PROBABILITY_TOLERANCE, text
+        
+        ranked = sorted(ref.scores.values(), reverse=True)
+        if ranked[0] - ranked[1] > 2 * PROBABILITY_TOLERANCE:
+            assert ref.sentiment == cand.sentiment, text
+
+
+@pytest.fixture(scope="module")
+def reference_results():
+    """Eager fp32 results for the parity corpus"""
+    analyzer = SentimentAnalyzer(device="cpu", backend="torch")
+    return analyzer.analyze_batch(PARITY_CORPUS)
+
+
+class TestBackendParity:
+    """Test alternative backends track the eager model"""
+    
+    def test_unknown_backend(self):
+        """Test unknown backends are rejected"""
+        with pytest.raises(ValueError):
+            SentimentAnalyzer(device="cpu", backend="tensorrt")
+    
+    def test_quantized_matches_eager(self, reference_results):
+        """Test dynamic int8 quantization keeps labels within tolerance"""
+        analyzer = SentimentAnalyzer(device="cpu", backend="quantized")
+        
+        results = analyzer.analyze_batch(PARITY_CORPUS)
+        
+        assert_parity(reference_results, results)
+    
+    @pytest.mark.slow
+    def test_onnx_matches_eager(self, reference_results, tmp_path, monkeypatch):
+        """Test the ONNX Runtime session keeps labels within tolerance"""
+        pytest.importorskip("onnxruntime")
+        monkeypatch.setattr(settings, "sentiment_model_path", str(tmp_path))
+        
+        analyzer = SentimentAnalyzer(device="cpu", backend="onnx")
+        
+        results = analyzer.analyze_batch(PARITY_CORPUS)
+        
+        assert_parity(reference_results, results)
@@ -0,0 +1,460 @@
+"""
+Unit tests for sentiment pipeline
+"""
+
+import asyncio
+import time
+import pytest
+from datetime import datetime, timedelta
+
+from src.backend.sentiment_analyzer import SentimentResult
+from src.backend.sentiment_pipeline import (
+    SentimentPipeline,
+    SentimentHistory,
+    TokenFeed,
+    TokenSentiment,
+    aggregate_posts,
+)
+from src.backend.twitter_scraper_v2 import ScrapedTweet
+
+
+@pytest.fixture
+def pipeline():
+    """Create a pipeline; the shared model is only loaded on first inference"""
+    return SentimentPipeline(["DOGE", "SHIB", "PEPE", "WIF"])
+
+
+def make_sentiment(score, minutes_ago=0):
+    """Build a history sample with the given score and age"""
+    return TokenSentiment(
+        token="PEPE",
+        timestamp=datetime.now() - timedelta(minutes=minutes_ago),
+        sentiment_score=score,
+        sentiment_label="neutral",
+        confidence=0.5,
+        sample_size=1,
+    )
+
+
+class TestTokenScheduling:
+    """Test concurrent per-token analysis"""
+    
+    @pytest.mark.asyncio
+    async def test_analyze_all_tokens_runs_concurrently(self, pipeline):
+        """Test tokens are analyzed in parallel without fixed sleeps"""
+        async def slow_analyze(token):
+            await asyncio.sleep(0.1)
+            return pipeline._create_empty_sentiment(token)
+        
+        pipeline.analyze_token = slow_analyze
+        
+        start = time.monotonic()
+        results = await pipeline.analyze_all_tokens()
+        elapsed = time.monotonic() - start
+        
+        assert list(results) == ["DOGE", "SHIB", "PEPE", "WIF"]
+        assert elapsed < 0.3
+    
+    @pytest.mark.asyncio
+    async def test_source_concurrency_is_bounded(self, pipeline):
+        """Test no more than the source limit run at once"""
+        pipeline.source_slots[pipeline.scraper.source] = asyncio.Semaphore(2)
+        active = 0
+        peak = 0
+        
+        async def tracked_analyze(token):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.02)
+            active -= 1
+            return pipeline._create_empty_sentiment(token)
+        
+        pipeline.analyze_token = tracked_analyze
+        
+        await pipeline.analyze_all_tokens()
+        
+        assert peak == 2
+    
+    @pytest.mark.asyncio
+    async def test_stream_yields_in_completion_order(self, pipeline):
+        """Test results stream out as each token finishes"""
+        delays = {"DOGE": 0.08, "SHIB": 0.01, "PEPE": 0.04, "WIF": 0.02}
+        
+        async def staggered_analyze(token):
+            await asyncio.sleep(delays[token])
+            return pipeline._create_empty_sentiment(token)
+        
+        pipeline.analyze_token = staggered_analyze
+        
+        order = [s.token async for s in pipeline.stream_all_tokens()]
+        
+        assert order == ["SHIB", "WIF", "PEPE", "DOGE"]
+    
+    @pytest.mark.asyncio
+    async def test_failed_token_returns_empty_sentiment(self, pipeline):
+        """Test one failing token does not abort the cycle"""
+        async def flaky_analyze(token):
+            if token == "PEPE":
+                raise RuntimeError("scrape failed")
+            return pipeline._create_empty_sentiment(token)
+        
+        pipeline.analyze_token = flaky_analyze
+        
+        results = await pipeline.analyze_all_tokens()
+        
+        assert isinstance(results["PEPE"], TokenSentiment)
+        assert results["PEPE"].sample_size == 0
+        assert len(results) == 4
+    
+    @pytest.mark.asyncio
+    async def test_cycle_summarizes_scores_in_one_batch(self, pipeline, monkeypatch):
+        """Test each cycle aggregates every token's 24h scores in a single call"""
+        for minutes_ago, score in [(30 * 60, 10.0), (60, 40.0), (30, 60.0), (10, 80.0)]:
+            pipeline.sentiment_history["PEPE"].add_sentiment(make_sentiment(score, minutes_ago))
+        
+        async def empty_analyze(token):
+            return pipeline._create_empty_sentiment(token)
+        
+        calls = []
+        aggregate_batch = pipeline.aggregator.aggregate_batch
+        monkeypatch.setattr(
+            pipeline.aggregator,
+            "aggregate_batch",
+            lambda rows: calls.append(len(rows)) or aggregate_batch(rows),
+        )
+        pipeline.analyze_token = empty_analyze
+        
+        await pipeline.analyze_all_tokens()
+        stats = pipeline.get_sentiment_summary()["tokens"]["PEPE"]["stats_24h"]
+        
+        assert calls == [4]
+        assert stats["count"] == 3  # The 30h-old sample is outside the window
+        assert stats["mean"] == pytest.approx(60.0)
+        assert (stats["min"], stats["max"]) == (40.0, 80.0)
+        assert pipeline.score_stats["DOGE"]["count"] == 0
+
+
+class TestSentimentHistory:
+    """Test bucketed rolling-window aggregates"""
+    
+    def test_windows_match_full_scan(self):
+        """Test window averages agree with scanning every sample"""
+        history = SentimentHistory(token="PEPE")
+        ages = [3000, 1500, 300, 200, 58, 30, 4, 1]
+        for i, age in enumerate(ages):
+            history.add_sentiment(make_sentiment(40 + i * 5, minutes_ago=age))
+        
+        now = datetime.now().timestamp()
+        for hours in (1, 4, 24, 72):
+            cutoff = now - hours * 3600
+            expected = history.history.records(cutoff)["sentiment_score"].tolist()
+            assert history._window(hours).count(hours * 60, now) == len(expected)
+            assert history.get_average_sentiment(hours) == pytest.approx(sum(expected) / len(expected))
+    
+    def test_window_memory_is_fixed(self):
+        """Test bursts of samples land in buckets instead of growing storage"""
+        history = SentimentHistory(token="PEPE")
+        sizes = [window.sums.nbytes for window in history.windows]
+        for i in range(500):
+            history.add_sentiment(make_sentiment(i % 100, minutes_ago=i % 3))
+        
+        assert [window.sums.nbytes for window in history.windows] == sizes
+        assert history._window(1).count(60, datetime.now().timestamp()) == 500
+    
+    def test_old_samples_are_evicted(self):
+        """Test samples older than a window stop counting towards it"""
+        history = SentimentHistory(token="PEPE")
+        history.add_sentiment(make_sentiment(90, minutes_ago=120))
+        history.add_sentiment(make_sentiment(30, minutes_ago=10))
+        
+        assert history.get_average_sentiment(1) == pytest.approx(30)
+        assert history.get_average_sentiment(4) == pytest.approx(60)
+        assert history.get_trend(1) == "insufficient_data"
+        assert history.get_trend(4) == "falling"
+    
+    def test_any_period_served_from_buckets(self):
+        """Test periods between the aggregator timeframes use the same buckets"""
+        history = SentimentHistory(token="PEPE")
+        history.add_sentiment(make_sentiment(40, minutes_ago=100))
+        history.add_sentiment(make_sentiment(60, minutes_ago=5))
+        
+        assert history.get_average_sentiment(2) == pytest.approx(50)
+        assert history.get_trend(2) == "rising"
+    
+    def test_latest_and_records_materialize_dicts(self):
+        """Test stored samples round-trip to the TokenSentiment dict shape"""
+        history = SentimentHistory(token="PEPE")
+        sentiment = make_sentiment(72.5, minutes_ago=3)
+        sentiment.sentiment_label = "bullish"
+        sentiment.bullish_count = 4
+        history.add_sentiment(sentiment)
+        history.set_latest_trend("rising", 0.25)
+        
+        latest = history.latest()
+        
+        assert latest == history.get_records(1)[0]
+        assert latest["sentiment_label"] == "bullish"
+        assert latest["bullish_count"] == 4
+        assert latest["trend"] == "rising"
+        assert latest["trend_strength"] == pytest.approx(0.25)
+        assert latest["timestamp"][:19] == sentiment.timestamp.isoformat()[:19]
+        assert set(latest) == set(sentiment.to_dict())
+    
+    def test_empty_history(self):
+        """Test an empty history reports no data"""
+        history = SentimentHistory(token="PEPE")
+        
+        assert history.latest() is None
+        assert history.get_records(24) == []
+        assert history.get_average_sentiment(2) == 50.0
+
+
+class TestAggregatePosts:
+    """Test single-pass per-token aggregation"""
+    
+    def make_posts(self, labels, confidences, likes):
+        """Build matching inference results and tweets"""
+        sentiments = [
+            SentimentResult(label, confidence, {}, "moderate", 1.0)
+            for label, confidence in zip(labels, confidences)
+        ]
+        tweets = [
+            ScrapedTweet(text="post", author="a", created_at=datetime.now(), likes=n, retweets=n // 2, replies=1)
+            for n in likes
+        ]
+        return sentiments, tweets
+    
+    def test_matches_per_post_scoring(self):
+        """Test the fused score equals averaging each post's banded score"""
+        labels = ["bullish", "bullish", "neutral", "bearish", "bullish"]
+        confidences = [0.9, 0.6, 0.5, 0.8, 0.7]
+        sentiments, tweets = self.make_posts(labels, confidences, [10, 20, 30, 40, 50])
+        bands = {"bullish": 67, "neutral": 34, "bearish": 0}
+        expected = sum(bands[l] + c * 33 for l, c in zip(labels, confidences)) / len(labels)
+        
+        result = aggregate_posts(sentiments, tweets)
+        
+        assert result["sentiment_score"] == pytest.approx(expected)
+        assert result["confidence"] == pytest.approx(sum(confidences) / 5)
+        assert (result["bullish_count"], result["neutral_count"], result["bearish_count"]) == (3, 1, 1)
+        assert result["sentiment_label"] == "bullish"
+        assert result["avg_likes"] == 30
+        assert result["avg_retweets"] == pytest.approx((5 + 10 + 15 + 20 + 25) / 5)
+        assert result["avg_replies"] == 1
+    
+    def test_mixed_labels_are_neutral(self):
+        """Test no label majority yields neutral"""
+        sentiments, tweets = self.make_posts(["bullish", "bearish", "neutral"], [0.5] * 3, [0] * 3)
+        
+        assert aggregate_posts(sentiments, tweets)["sentiment_label"] == "neutral"
+    
+    def test_empty(self):
+        """Test aggregation without posts"""
+        result = aggregate_posts([], [])
+        
+        assert result["sentiment_score"] == 50.0
+        assert result["confidence"] == 0.0
+        assert result["avg_likes"] == 0
+
+
+def make_tweet(tweet_id, likes=0, minutes_ago=0):
+    """Scraped tweet with an ID"""
+    return ScrapedTweet(
+        text=f"post {tweet_id}",
+        author="a",
+        created_at=datetime.now() - timedelta(minutes=minutes_ago),
+        likes=likes,
+        tweet_id=str(tweet_id),
+    )
+
+
+def make_result(label, confidence=0.5):
+    """Inference result with the given label"""
+    return SentimentResult(label, confidence, {}, "moderate", 1.0)
+
+
+class TestTokenFeed:
+    """Test incremental scrape state and running aggregates"""
+    
+    def test_unseen_skips_scored_posts(self):
+        """Test posts are only returned until they are committed"""
+        feed = TokenFeed(window_posts=10, seen_capacity=100)
+        
+        first = feed.unseen([make_tweet(1), make_tweet(2), make_tweet(2)])
+        assert [t.tweet_id for t in feed.unseen([make_tweet(2)])] == ["2"]  # Not committed yet
+        feed.commit(first)
+        second = feed.unseen([make_tweet(2), make_tweet(3)])
+        
+        assert [t.tweet_id for t in first] == ["1", "2"]
+        assert [t.tweet_id for t in second] == ["3"]
+        assert feed.since_id == "2"
+    
+    def test_since_id_compares_numerically(self):
+        """Test the high-water mark orders IDs by value, not as text"""
+        feed = TokenFeed(window_posts=10, seen_capacity=100)
+        
+        feed.commit([make_tweet(99), make_tweet(1000), make_tweet(250)])
+        
+        assert feed.since_id == "1000"
+    
+    def test_seen_set_is_bounded(self):
+        """Test the oldest remembered IDs are forgotten first"""
+        feed = TokenFeed(window_posts=10, seen_capacity=3)
+        
+        feed.commit([make_tweet(i) for i in range(5)])
+        
+        assert list(feed.seen) == ["2", "3", "4"]
+    
+    def test_running_aggregate_matches_recompute(self):
+        """Test the windowed running totals equal aggregating the window from scratch"""
+        feed = TokenFeed(window_posts=4, seen_capacity=100)
+        labels = ["bullish", "bearish", "neutral", "bullish", "bullish", "bearish", "bullish"]
+        results = [make_result(label, 0.1 * (i + 1)) for i, label in enumerate(labels)]
+        tweets = [make_tweet(i, likes=10 * i) for i in range(len(labels))]
+        
+        feed.add(results[:3], tweets[:3])
+        feed.add(results[3:], tweets[3:])
+        
+        expected = aggregate_posts(results[-4:], tweets[-4:])
+        result = feed.aggregate()
+        
+        assert len(feed) == 4
+        assert result["sentiment_score"] == pytest.approx(expected["sentiment_score"])
+        assert result["confidence"] == pytest.approx(expected["confidence"])
+        assert result["avg_likes"] == pytest.approx(expected["avg_likes"])
+        assert result["sentiment_label"] == expected["sentiment_label"]
+        assert (result["bullish_count"], result["bearish_count"]) == (3, 1)
+
+
+class TestIncrementalAnalysis:
+    """Test each cycle only scores posts it has not seen"""
+    
+    @pytest.mark.asyncio
+    async def test_only_new_posts_are_scored(self, pipeline, monkeypatch):
+        """Test the scraper gets the high-water mark and inference sees only new posts"""
+        timeline = [make_tweet(i, likes=i) for i in range(1, 4)]
+        since_ids = []
+        scored = []
+        
+        async def scrape_tweets(token, max_tweets=50, since_id=None):
+            since_ids.append(since_id)
+            return list(timeline)  # Ignores since_id; the seen set still filters
+        
+        async def analyze_batch(texts):
+            scored.append(list(texts))
+            return [make_result("bullish", 0.9) for _ in texts]
+        
+        pipeline.scraper.scrape_tweets = scrape_tweets
+        monkeypatch.setattr(pipeline.inference, "analyze_batch", analyze_batch)  # Shared executor
+        pipeline.history_log = None
+        
+        first = await pipeline.analyze_token("PEPE")
+        timeline.append(make_tweet(4, likes=4))
+        second = await pipeline.analyze_token("PEPE")
+        third = await pipeline.analyze_token("PEPE")
+        
+        assert since_ids == [None, "3", "4"]
+        assert scored == [["post 1", "post 2", "post 3"], ["post 4"]]
+        assert (first.sample_size, second.sample_size, third.sample_size) == (3, 4, 4)
+        assert second.avg_likes == pytest.approx(2.5)
+        assert third.sentiment_label == "bullish"
+    
+    @pytest.mark.asyncio
+    async def test_failed_inference_rescores_posts(self, pipeline, monkeypatch):
+        """Test posts are not marked seen when inference fails on them"""
+        timeline = [make_tweet(i) for i in range(1, 3)]
+        since_ids = []
+        scored = []
+        
+        async def scrape_tweets(token, max_tweets=50, since_id=None):
+            since_ids.append(since_id)
+            return list(timeline)
+        
+        async def analyze_batch(texts):
+            if not scored:
+                scored.append(None)
+                raise RuntimeError("model not loaded")
+            scored.append(list(texts))
+            return [make_result("bullish", 0.9) for _ in texts]
+        
+        pipeline.scraper.scrape_tweets = scrape_tweets
+        monkeypatch.setattr(pipeline.inference, "analyze_batch", analyze_batch)
+        pipeline.history_log = None
+        
+        failed = await pipeline.analyze_token("PEPE")
+        retried = await pipeline.analyze_token("PEPE")
+        
+        assert since_ids == [None, None]
+        assert scored[1] == ["post 1", "post 2"]
+        assert (failed.sample_size, retried.sample_size) == (0, 2)
+        assert pipeline.feeds["PEPE"].since_id == "2"
+    
+    @pytest.mark.asyncio
+    async def test_near_duplicates_checked_per_token(self, pipeline, monkeypatch):
+        """Test a post seen under another token is still checked against this token's posts"""
+        shill = "Loading up on $PEPE and $DOGE today, this one is going parabolic"
+        timelines = {"DOGE": [ScrapedTweet(text=shill, author="a", created_at=datetime.now(), tweet_id="5")]}
+        scored = []
+        
+        async def scrape_tweets(token, max_tweets=50, since_id=None):
+            return list(timelines[token])
+        
+        async def analyze_batch(texts):
+            scored.append(list(texts))
+            return [make_result("bullish", 0.9) for _ in texts]
+        
+        pipeline.scraper.scrape_tweets = scrape_tweets
+        monkeypatch.setattr(pipeline.inference, "analyze_batch", analyze_batch)
+        pipeline.history_log = None
+        
+        await pipeline.analyze_token("DOGE")
+        copy = ScrapedTweet(text=shill + "!", author="b", created_at=datetime.now(), tweet_id="6")
+        timelines["PEPE"] = [copy]
+        timelines["DOGE"] = [copy]
+        pepe = await pipeline.analyze_token("PEPE")
+        doge = await pipeline.analyze_token("DOGE")
+        
+        assert len(scored) == 2  # PEPE scores its copy; DOGE's is a near-duplicate
+        assert (pepe.sample_size, doge.sample_size) == (1, 1)
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_analyses_score_posts_once(self, pipeline, monkeypatch):
+        """Test two overlapping analyses of a token don't both add the same posts"""
+        timeline = [make_tweet(i) for i in range(1, 4)]
+        scored = []
+        
+        async def scrape_tweets(token, max_tweets=50, since_id=None):
+            return list(timeline)
+        
+        async def analyze_batch(texts):
+            scored.append(list(texts))
+            await asyncio.sleep(0.01)
+            return [make_result("bullish", 0.9) for _ in texts]
+        
+        pipeline.scraper.scrape_tweets = scrape_tweets
+        monkeypatch.setattr(pipeline.inference, "analyze_batch", analyze_batch)
+        pipeline.history_log = None
+        
+        first, second = await asyncio.gather(
+            pipeline.analyze_token("PEPE"),
+            pipeline.analyze_token("PEPE"),
+        )
+        
+        assert scored == [["post 1", "post 2", "post 3"]]
+        assert (first.sample_size, second.sample_size) == (3, 3)
+    
+    @pytest.mark.asyncio
+    async def test_untracked_token_keeps_no_state(self, pipeline):
+        """Test unknown tokens get an empty result without a scrape feed"""
+        async def scrape_tweets(token, max_tweets=50, since_id=None):
+            raise AssertionError("untracked tokens are not scraped")
+        
+        pipeline.scraper.scrape_tweets = scrape_tweets
+        
+        result = await pipeline.analyze_token("RANDOM")
+        await pipeline.update_tokens(["PEPE", "BONK"])
+        
+        assert result.sample_size == 0
+        assert "RANDOM" not in pipeline.feeds
+        assert list(pipeline.feeds) == ["PEPE", "BONK"]
@@ -0,0 +1,100 @@
+"""
+Unit tests for single-flight request coalescing
+"""
+
+import asyncio
+
+import pytest
+
+from src.backend.single_flight import SingleFlight
+
+
+class Analysis:
+    """Slow per-token computation that counts runs"""
+    
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.runs = []
+    
+    def for_token(self, token):
+        async def run():
+            self.runs.append(token)
+            await asyncio.sleep(self.delay)
+            if token == "BAD":
+                raise ValueError("analysis failed")
+            return f"{token}-{len(self.runs)}"
+        return run
+
+
+class TestSingleFlight:
+    """Test concurrent callers share work per key"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_run(self):
+        """Test 200 callers for one token cause a single analysis"""
+        flight = SingleFlight(fresh_seconds=0)
+        analysis = Analysis()
+        
+        results = await asyncio.gather(*(flight.do("PEPE", analysis.for_token("PEPE")) for _ in range(200)))
+        
+        assert analysis.runs == ["PEPE"]
+        assert set(results) == {"PEPE-1"}
+        stats = flight.get_stats()
+        assert (stats["executions"], stats["joined"]) == (1, 199)
+    
+    @pytest.mark.asyncio
+    async def test_keys_run_independently(self):
+        """Test different tokens are not coalesced"""
+        flight = SingleFlight(fresh_seconds=0)
+        analysis = Analysis()
+        
+        await asyncio.gather(
+            flight.do("PEPE", analysis.for_token("PEPE")),
+            flight.do("DOGE", analysis.for_token("DOGE")),
+        )
+        
+        assert sorted(analysis.runs) == ["DOGE", "PEPE"]
+    
+    @pytest.mark.asyncio
+    async def test_fresh_result_reused_then_expires(self):
+        """Test a completed result serves later callers until the window passes"""
+        flight = SingleFlight(fresh_seconds=0.1)
+        analysis = Analysis(delay=0)
+        
+        first = await flight.do("PEPE", analysis.for_token("PEPE"))
+        second = await flight.do("PEPE", analysis.for_token("PEPE"))
+        await asyncio.sleep(0.15)
+        third = await flight.do("PEPE", analysis.for_token("PEPE"))
+        
+        assert first == second == "PEPE-1"
+        assert third == "PEPE-2"
+        assert flight.get_stats()["fresh_hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_failures_are_shared_not_cached(self):
+        """Test waiting callers all see the error and the next call retries"""
+        flight = SingleFlight(fresh_seconds=60)
+        analysis = Analysis()
+        
+        results = await asyncio.gather(
+            *(flight.do("BAD", analysis.for_token("BAD")) for _ in range(3)),
+            return_exceptions=True,
+        )
+        assert all(isinstance(r, ValueError) for r in results)
+        
+        with pytest.raises(ValueError):
+            await flight.do("BAD", analysis.for_token("BAD"))
+        assert analysis.runs == ["BAD", "BAD"]
+        assert flight.get_stats()["inflight"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        """Test a disconnecting client leaves the shared run going"""
+        flight = SingleFlight(fresh_seconds=0)
+        analysis = Analysis(delay=0.1)
+        
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(flight.do("PEPE", analysis.for_token("PEPE")), timeout=0.01)
+        
+        assert await flight.do("PEPE", analysis.for_token("PEPE")) == "PEPE-1"
+        assert analysis.runs == ["PEPE"]
@@ -0,0 +1,108 @@
+"""
+Unit tests for the background snapshot refresher
+"""
+
+import asyncio
+
+import pytest
+
+from src.backend.snapshot_refresher import SnapshotRefresher
+
+
+class Scanner:
+    """Stand-in for analyze_all_tokens that counts scans"""
+    
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.calls = 0
+        self.fail = False
+    
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("scrape failed")
+        return {"PEPE": {"sentiment_score": 60.0 + self.calls}}
+
+
+class TestSnapshotRefresher:
+    """Test snapshot publishing and scan deduplication"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_refreshes_share_one_scan(self):
+        """Test overlapping callers join the scan in flight"""
+        scan = Scanner()
+        refresher = SnapshotRefresher(scan, interval_seconds=60)
+        
+        snapshots = await asyncio.gather(*(refresher.refresh() for _ in range(20)))
+        
+        assert scan.calls == 1
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+        assert refresher.get_stats()["joined"] == 19
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_is_immutable(self):
+        """Test published data cannot be modified by readers"""
+        refresher = SnapshotRefresher(Scanner(delay=0), interval_seconds=60)
+        snapshot = await refresher.latest()
+        
+        with pytest.raises(TypeError):
+            snapshot.data["DOGE"] = {}
+        with pytest.raises(AttributeError):
+            snapshot.generation = 5
+    
+    @pytest.mark.asyncio
+    async def test_failed_scan_keeps_previous_snapshot(self):
+        """Test a failing scan serves the last good snapshot"""
+        scan = Scanner(delay=0)
+        refresher = SnapshotRefresher(scan, interval_seconds=60)
+        first = await refresher.refresh()
+        
+        scan.fail = True
+        second = await refresher.refresh()
+        
+        assert second is first
+        stats = refresher.get_stats()
+        assert stats["failures"] == 1
+        assert stats["last_error"] == "scrape failed"
+    
+    @pytest.mark.asyncio
+    async def test_first_scan_failure_raises(self):
+        """Test there is nothing to serve when the first scan fails"""
+        scan = Scanner(delay=0)
+        scan.fail = True
+        refresher = SnapshotRefresher(scan, interval_seconds=60)
+        
+        with pytest.raises(RuntimeError):
+            await refresher.latest()
+        assert refresher.snapshot is None
+    
+    @pytest.mark.asyncio
+    async def test_background_loop_publishes_generations(self):
+        """Test the loop republishes on its interval and readers never wait"""
+        scan = Scanner(delay=0.01)
+        refresher = SnapshotRefresher(scan, interval_seconds=0.05)
+        
+        refresher.start()
+        refresher.start()  # Idempotent
+        await asyncio.sleep(0.2)
+        
+        snapshot = await asyncio.wait_for(refresher.latest(), timeout=0.01)
+        await refresher.stop()
+        
+        assert snapshot.generation >= 2
+        assert snapshot.data["PEPE"]["sentiment_score"] == 60.0 + snapshot.generation
+        assert not refresher.get_stats()["running"]
+    
+    @pytest.mark.asyncio
+    async def test_abandoned_caller_does_not_cancel_scan(self):
+        """Test a caller timing out leaves the shared scan running"""
+        scan = Scanner(delay=0.1)
+        refresher = SnapshotRefresher(scan, interval_seconds=60)
+        
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(refresher.refresh(), timeout=0.01)
+        snapshot = await refresher.refresh()
+        
+        assert scan.calls == 1
+        assert snapshot.generation == 1
@@ -0,0 +1,163 @@
+"""
+Unit tests for the streaming sentiment pipeline
+"""
+
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from src.backend.data_pipeline import RawPost
+from src.backend.inference_executor import get_inference_executor
+from src.backend.sentiment_analyzer import SentimentResult
+from src.backend.stream_pipeline import StreamingPipeline
+
+
+def make_post(post_id, text, tokens=None, retweets=0):
+    """Scraped post; tokens are left for the extract stage when None"""
+    return RawPost(
+        source="twitter",
+        post_id=str(post_id),
+        text=text,
+        author_id="42",
+        created_at=datetime.now(),
+        metrics={"likes": 2, "retweets": retweets, "replies": 1},
+        tokens_mentioned=tokens or [],
+    )
+
+
+class FakeCollector:
+    """Collector yielding fixed per-token batches each poll"""
+    
+    def __init__(self, batches, gate=None):
+        self.batches = batches
+        self.gate = gate  # Awaited before each batch after the first
+        self.polls = 0
+    
+    async def stream(self):
+        self.polls += 1
+        for i, posts in enumerate(self.batches):
+            if i and self.gate is not None:
+                await self.gate.wait()
+            yield posts
+
+
+@pytest.fixture
+def scored(monkeypatch):
+    """Record inference batches; every post scores bullish"""
+    batches = []
+    
+    async def analyze_batch(texts):
+        batches.append(list(texts))
+        return [SentimentResult("bullish", 0.8, {}, "moderate", 1.0) for _ in texts]
+    
+    monkeypatch.setattr(get_inference_executor(), "analyze_batch", analyze_batch)
+    return batches
+
+
+class TestStreamingPipeline:
+    """Test posts flow through the stages to publishers"""
+    
+    @pytest.mark.asyncio
+    async def test_bounded_run_publishes_every_token(self, scored):
+        """Test spam and repeats are dropped and each token is published"""
+        collector = FakeCollector([
+            [make_post(1, "Loading up on $PEPE today"), make_post(2, "$PEPE")],
+            [make_post(3, "DOGE to the moon tonight", ["DOGE"]), make_post(4, "Botted $DOGE shill post", retweets=50000)],
+        ])
+        published = []
+        
+        async def publish(sentiment):
+            published.append(sentiment)
+        
+        stream = StreamingPipeline([collector], ["PEPE", "DOGE"], publishers=[publish], poll_interval=0)
+        await stream.run(cycles=2)
+        
+        assert collector.polls == 2
+        assert sorted(text for batch in scored for text in batch) == [
+            "DOGE to the moon tonight", "Loading up on $PEPE today",
+        ]
+        assert {s.token for s in published} == {"PEPE", "DOGE"}
+        assert stream.latest["PEPE"].sample_size == 1
+        assert stream.latest["PEPE"].sentiment_label == "bullish"
+        assert stream.latest["DOGE"].avg_likes == pytest.approx(2.0)
+        
+        stats = stream.get_stats()
+        assert stats["collected"] == 8
+        assert stats["filtered"] == 4  # Too short or botted, on both polls
+        assert stats["repeats"] == 2
+        assert stats["published"] == len(published)
+        assert all(depth == 0 for depth in stats["queues"].values())
+    
+    @pytest.mark.asyncio
+    async def test_results_publish_before_collection_finishes(self, scored):
+        """Test the first token is published while the collector is still running"""
+        gate = asyncio.Event()
+        collector = FakeCollector(
+            [[make_post(1, "Loading up on $PEPE today")], [make_post(2, "Selling all my $DOGE now")]],
+            gate=gate,
+        )
+        
+        async def publish(sentiment):
+            gate.set()  # The second token is only collected once the first is out
+        
+        stream = StreamingPipeline([collector], ["PEPE", "DOGE"], publishers=[publish], batch_wait=0.01)
+        await asyncio.wait_for(stream.run(cycles=1), timeout=5)
+        
+        assert set(stream.latest) == {"PEPE", "DOGE"}
+    
+    @pytest.mark.asyncio
+    async def test_micro_batches(self, scored):
+        """Test posts are scored in batches of at most batch_size"""
+        posts = [make_post(i, f"Post number {i} about $PEPE with its own words {i * 7919}") for i in range(10)]
+        stream = StreamingPipeline([FakeCollector([posts])], ["PEPE"], batch_size=4, batch_wait=0.5)
+        
+        await stream.run(cycles=1)
+        
+        assert [len(batch) for batch in scored] == [4, 4, 2]
+        assert stream.latest["PEPE"].sample_size == 10
+    
+    @pytest.mark.asyncio
+    async def test_backpressure_bounds_queues(self, monkeypatch):
+        """Test a stalled inference stage stops the collector instead of buffering"""
+        release = asyncio.Event()
+        
+        async def analyze_batch(texts):
+            await release.wait()
+            return [SentimentResult("neutral", 0.5, {}, "moderate", 1.0) for _ in texts]
+        
+        monkeypatch.setattr(get_inference_executor(), "analyze_batch", analyze_batch)
+        posts = [make_post(i, f"Post number {i} about $PEPE with its own words {i * 7919}") for i in range(50)]
+        stream = StreamingPipeline([FakeCollector([posts])], ["PEPE"], queue_size=2, batch_size=1, batch_wait=0)
+        
+        task = asyncio.create_task(stream.run(cycles=1))
+        await asyncio.sleep(0.2)
+        
+        stats = stream.get_stats()
+        assert stats["collected"] < 10
+        assert all(depth <= 2 for depth in stats["queues"].values())
+        
+        release.set()
+        await asyncio.wait_for(task, timeout=5)
+        assert stream.get_stats()["scored"] == 50
+    
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_next_poll(self, monkeypatch):
+        """Test posts from a failed inference batch are scored when collected again"""
+        calls = []
+        
+        async def analyze_batch(texts):
+            calls.append(list(texts))
+            if len(calls) == 1:
+                raise RuntimeError("model not loaded")
+            return [SentimentResult("bullish", 0.8, {}, "moderate", 1.0) for _ in texts]
+        
+        monkeypatch.setattr(get_inference_executor(), "analyze_batch", analyze_batch)
+        collector = FakeCollector([[make_post(1, "Loading up on $PEPE today")]])
+        stream = StreamingPipeline([collector], ["PEPE"], batch_wait=0, poll_interval=0.05)
+        
+        await stream.run(cycles=2)
+        
+        assert calls == [["Loading up on $PEPE today"]] * 2
+        assert stream.get_stats()["repeats"] == 0
+        assert stream.latest["PEPE"].sample_size == 1
@@ -0,0 +1,57 @@
+"""
+Unit tests for the shared token mention matcher
+"""
+
+import pytest
+
+from src.backend.token_matcher import TokenMatcher, get_matcher
+from src.backend.data_pipeline_v2 import FreeTwitterCollector
+
+
+class TestTokenMatcher:
+    """Test single-pass multi-token matching"""
+    
+    @pytest.fixture
+    def matcher(self):
+        """Create a matcher with overlapping symbols"""
+        return TokenMatcher(["DOGE", "PEPE", "WIF", "DOGWIF", "SHIB"])
+    
+    def test_cashtags_hashtags_and_words(self, matcher):
+        """Test $TICKER, #TICKER and bare words all match"""
+        text = "Loading $pepe and #DOGE, also shib."
+        
+        assert matcher.extract(text) == ["DOGE", "PEPE", "SHIB"]
+    
+    def test_no_match_inside_words(self, matcher):
+        """Test symbols embedded in longer words are ignored"""
+        assert matcher.extract("pepecoin and shibarium and dogecoinfan") == []
+        assert matcher.extract("$PEPE2 is not PEPE_ either") == []
+    
+    def test_overlapping_symbols(self, matcher):
+        """Test a symbol that contains another only matches itself"""
+        assert matcher.extract("aping $DOGWIF today") == ["DOGWIF"]
+        assert matcher.extract("$WIF and $DOGWIF") == ["WIF", "DOGWIF"]
+    
+    def test_results_in_token_list_order(self, matcher):
+        """Test results follow the token list and are unique"""
+        assert matcher.extract("SHIB shib $SHIB then DOGE") == ["DOGE", "SHIB"]
+    
+    def test_empty_inputs(self):
+        """Test empty texts and token lists"""
+        assert TokenMatcher([]).extract("anything $PEPE") == []
+        assert TokenMatcher(["PEPE"]).extract("") == []
+    
+    def test_matcher_shared_per_token_list(self):
+        """Test the compiled matcher is reused until the list changes"""
+        first = get_matcher(["DOGE", "PEPE"])
+        
+        assert get_matcher(["DOGE", "PEPE"]) is first
+        assert get_matcher(["DOGE", "PEPE", "WIF"]) is not first
+    
+    def test_collector_uses_matcher(self):
+        """Test collectors see token list changes"""
+        collector = FreeTwitterCollector(["PEPE"])
+        
+        assert collector.extract_tokens("pepecoin vs $PEPE") == ["PEPE"]
+        collector.token_list.append("WIF")
+        assert collector.extract_tokens("$WIF") == ["WIF"]
@@ -0,0 +1,116 @@
+"""
+Unit tests for the tweet page parser
+"""
+
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.backend.tweet_parser import TweetPageParser, parse_count
+
+
+FIXTURES = Path(__file__).resolve().parent.parent / "fixtures"
+
+
+@pytest.fixture(scope="module")
+def parser():
+    """Parser with compiled selectors"""
+    return TweetPageParser()
+
+
+class TestParseCount:
+    """Test engagement count parsing"""
+    
+    def test_suffixes_and_separators(self):
+        """Test K/M suffixes, thousands separators and blanks"""
+        assert parse_count("1.2K") == 1200
+        assert parse_count(" 3M ") == 3000000
+        assert parse_count("1,024") == 1024
+        assert parse_count("") == 0
+        assert parse_count("n/a") == 0
+
+
+class TestNitterPages:
+    """Test Nitter search page parsing"""
+    
+    def test_fixture_page(self, parser):
+        """Test every timeline item on a saved page is extracted"""
+        tweets = parser.parse_nitter((FIXTURES / "nitter_search.html").read_text())
+        
+        assert len(tweets) == 60
+        first = tweets[0]
+        assert first["tweet_id"] == "1846524277128226821"
+        assert first["author_handle"] == "trader_9172"
+        assert first["text"] == "gm DEGEN fam"
+        assert (first["likes"], first["retweets"], first["replies"]) == (4800, 875, 260)
+        assert first["created_at"] == datetime(2026, 10, 14, 15, 51)
+        assert first["url"] == "https://x.com/trader_9172/status/1846524277128226821"
+    
+    def test_max_tweets(self, parser):
+        """Test the page is cut at max_tweets"""
+        html = (FIXTURES / "nitter_search.html").read_text()
+        
+        assert len(parser.parse_nitter(html, max_tweets=5)) == 5
+    
+    def test_fallback_selectors(self, parser):
+        """Test older markup without timeline items still parses"""
+        html = """
+        <div data-tweet-id="77">
+          <div class="tweet-text">Aping into $PEPE</div>
+          <a class="username">@degen</a>
+          <span class="stat">12 Likes</span>
+          <span class="stat">3 Retweets</span>
+        </div>
+        """
+        
+        tweets = parser.parse_nitter(html)
+        
+        assert len(tweets) == 1
+        assert tweets[0]["tweet_id"] == "77"
+        assert tweets[0]["text"] == "Aping into $PEPE"
+        assert tweets[0]["author_handle"] == "degen"
+        assert (tweets[0]["likes"], tweets[0]["retweets"]) == (12, 3)
+    
+    def test_empty_page(self, parser):
+        """Test blank and tweet-less pages"""
+        assert parser.parse_nitter("") == []
+        assert parser.parse_nitter("<html><body>No items found</body></html>") == []
+
+
+class TestXPages:
+    """Test X.com search page parsing"""
+    
+    def test_fixture_page(self, parser):
+        """Test articles on a saved page are extracted"""
+        tweets = parser.parse_x((FIXTURES / "x_search.html").read_text())
+        
+        assert len(tweets) == 60
+        first = tweets[0]
+        assert first["tweet_id"] == "1846600192396363015"
+        assert first["author_handle"] == "trader_9332"
+        assert first["text"] == "Just bought more $TOSHI. This is going to moon 🌙"
+        assert (first["likes"], first["retweets"], first["replies"]) == (4100, 527, 199)
+        assert first["created_at"].isoformat() == "2026-10-14T20:23:00+00:00"
+
+
+class TestOffLoopParsing:
+    """Test parsing does not run on the event loop thread"""
+    
+    @pytest.mark.asyncio
+    async def test_parse_runs_in_worker_thread(self, parser, monkeypatch):
+        """Test the async entry point hands the page to a worker thread"""
+        loop_thread = threading.get_ident()
+        seen = []
+        parse = parser.parse_nitter
+        
+        def recording_parse(html, max_tweets):
+            seen.append(threading.get_ident())
+            return parse(html, max_tweets)
+        
+        monkeypatch.setattr(parser, "parse_nitter", recording_parse)
+        tweets = await parser.parse_nitter_async((FIXTURES / "nitter_search.html").read_text(), 10)
+        
+        assert len(tweets) == 10
+        assert seen and seen[0] != loop_thread